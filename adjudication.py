@@ -0,0 +1,96 @@
+"""
+Draw adjudication for games that would otherwise never end.
+
+After every move the Adjudicator records the position by the hash of its
+to_state() and checks three rules, each disabled when set to None:
+
+    repetition   the same position, with the same player to move, has now
+                 occurred repetitions times
+    quiet_moves  quiet_moves moves in a row have neither removed a piece from
+                 the board nor brought one in from a supply
+    move_limit   max_moves moves have been played
+
+Captures and supply pieces are used up for good, so with a quiet-move limit
+every game ends. A triggered rule makes the game a draw unless the hook,
+called as hook(board, reason), names a winner ("w_player" or "b_player"),
+e.g. by material.
+"""
+import copy
+
+REPETITION = "repetition"
+QUIET = "quiet_moves"
+MOVE_LIMIT = "move_limit"
+
+
+class Adjudicator:
+    """Position and move counters of one game, with the rules that end it"""
+    def __init__(self, repetitions: int = 3, quiet_moves: int = 200, max_moves: int = None, hook=None):
+        if repetitions is not None and repetitions < 2:
+            raise ValueError(f"Invalid repetition count {repetitions}. Must be at least 2.")
+        if quiet_moves is not None and quiet_moves < 1:
+            raise ValueError(f"Invalid quiet move limit {quiet_moves}. Must be at least 1.")
+        if max_moves is not None and max_moves < 1:
+            raise ValueError(f"Invalid move limit {max_moves}. Must be at least 1.")
+        self.repetitions = repetitions
+        self.quiet_moves = quiet_moves
+        self.max_moves = max_moves
+        self.hook = hook
+        self.reset()
+
+    def reset(self):
+        """Forget the game so far, e.g. when a new game starts"""
+        self.moves = 0
+        self.quiet = 0
+        # Occurrences of each position key
+        self.positions = {}
+        self._material = None
+
+    @staticmethod
+    def position_key(board: 'Board') -> int:
+        """The key a position is counted under; hashes are enough to tell positions
+        apart and take far less memory than the states"""
+        return hash(board.to_state())
+
+    @staticmethod
+    def _material_of(board: 'Board') -> tuple:
+        return (board.countPieces(board.w_player), board.countPieces(board.b_player),
+                len(board.w_player._supply), len(board.b_player._supply))
+
+    def record(self, board: 'Board'):
+        """Count the position reached by a move, returning the rule it triggers or None"""
+        self.moves += 1
+        material = self._material_of(board)
+        if self._material is None or material == self._material:
+            self.quiet += 1
+        else:
+            self.quiet = 0
+        self._material = material
+
+        key = self.position_key(board)
+        count = self.positions.get(key, 0) + 1
+        self.positions[key] = count
+
+        if self.repetitions is not None and count >= self.repetitions:
+            return REPETITION
+        if self.quiet_moves is not None and self.quiet >= self.quiet_moves:
+            return QUIET
+        if self.max_moves is not None and self.moves >= self.max_moves:
+            return MOVE_LIMIT
+        return None
+
+    def start(self, board: 'Board'):
+        """Record the starting position, which counts towards repetitions"""
+        self.reset()
+        self._material = self._material_of(board)
+        self.positions[self.position_key(board)] = 1
+
+    def without_positions(self) -> 'Adjudicator':
+        """A copy of the rules and counters without the position counts, which grow
+        with the game; undo history rebuilds them from the keys of the moves"""
+        clone = copy.copy(self)
+        clone.positions = {}
+        return clone
+
+    def adjudicate(self, board: 'Board', reason: str):
+        """The winner's colour decided by the hook, or None for a draw"""
+        return self.hook(board, reason) if self.hook is not None else None
@@ -0,0 +1,179 @@
+"""
+Game statistics for sizing caches and search budgets.
+
+Plays AI games (or replays seeded game specs) and streams one row per turn
+to CSV or JSON lines, then prints distributions of legal move counts, push
+chain lengths, supply activation turns, game lengths and think time per
+player type. Only counters are kept in memory, so any number of games can
+be analysed.
+
+    python analytics.py --games 100 --white heuristic --black random --out turns.csv
+    python analytics.py --specs games.jsonl --out turns.jsonl
+
+A spec file holds one JSON object per line: {"white": ..., "black": ..., "seed": ...}.
+"""
+import argparse
+import csv
+import json
+import sys
+from collections import Counter
+
+from simulate import play_game, DEFAULT_MAX_TURNS
+
+COLUMNS = ("game", "seed", "turn", "player", "type", "legal_moves", "era_only",
+           "pushes", "chain", "pushed_off", "supply_activated", "seconds")
+
+
+class RowWriter:
+    """Streams turn rows to a CSV or JSON lines file"""
+    def __init__(self, stream, fmt: str):
+        if fmt not in ("csv", "jsonl"):
+            raise ValueError(f"Invalid format '{fmt}'. Must be 'csv' or 'jsonl'.")
+        self._stream = stream
+        self._csv = csv.writer(stream) if fmt == "csv" else None
+        if self._csv:
+            self._csv.writerow(COLUMNS)
+
+    def write(self, row: dict):
+        if self._csv:
+            self._csv.writerow([row[column] for column in COLUMNS])
+        else:
+            self._stream.write(json.dumps(row) + "\n")
+
+
+class GameStats:
+    """Constant-memory histograms accumulated over every turn and game"""
+    def __init__(self):
+        self.legal_moves = Counter()      # legal moves -> turns
+        self.chains = Counter()           # push chain length -> pushes
+        self.pushed_off = 0
+        self.supply_turns = Counter()     # turn number -> supply activations
+        self.era_only = 0
+        self.game_lengths = Counter()     # moves played -> games
+        self.results = Counter()          # final GameState value -> games
+        self.time = {}                    # player type -> [turns, total seconds, max seconds]
+        self.turns = 0
+
+    def add_turn(self, row: dict, chains: list):
+        self.turns += 1
+        self.legal_moves[row["legal_moves"]] += 1
+        self.chains.update(chains)
+        self.pushed_off += row["pushed_off"]
+        if row["supply_activated"]:
+            self.supply_turns[row["turn"]] += row["supply_activated"]
+        self.era_only += row["era_only"]
+        timing = self.time.setdefault(row["type"], [0, 0.0, 0.0])
+        timing[0] += 1
+        timing[1] += row["seconds"]
+        timing[2] = max(timing[2], row["seconds"])
+
+    def add_game(self, game):
+        self.game_lengths[game.turn_number - 1] += 1
+        self.results[game.state.value] += 1
+
+    def summary(self) -> list:
+        """Human-readable report lines"""
+        games = sum(self.game_lengths.values())
+        lines = [f"games: {games}, turns: {self.turns}",
+                 f"results: {dict(sorted(self.results.items()))}",
+                 "legal moves per turn: " + _describe(self.legal_moves),
+                 f"era-switch-only moves: {self.era_only}",
+                 f"pushes: {sum(self.chains.values())}, pushed off: {self.pushed_off}",
+                 "push chain length: " + _describe(self.chains),
+                 "supply activation turn: " + _describe(self.supply_turns),
+                 "game length: " + _describe(self.game_lengths)]
+        for player_type, (turns, total, worst) in sorted(self.time.items()):
+            lines.append(f"time per turn ({player_type}): mean {total / turns * 1000:.2f} ms, "
+                         f"max {worst * 1000:.2f} ms over {turns} turns")
+        return lines
+
+
+def _describe(histogram: Counter) -> str:
+    """Mean, median, percentiles and max of a value -> count histogram"""
+    total = sum(histogram.values())
+    if not total:
+        return "n/a"
+    values = sorted(histogram)
+    mean = sum(value * count for value, count in histogram.items()) / total
+
+    def percentile(fraction):
+        seen = 0
+        for value in values:
+            seen += histogram[value]
+            if seen >= fraction * total:
+                return value
+        return values[-1]
+
+    return (f"mean {mean:.2f}, min {values[0]}, p50 {percentile(0.5)}, "
+            f"p90 {percentile(0.9)}, p99 {percentile(0.99)}, max {values[-1]}")
+
+
+def analyse(specs, writer: RowWriter, stats: GameStats, max_turns: int = DEFAULT_MAX_TURNS):
+    """Play every (white type, black type, seed) spec, streaming rows and accumulating stats"""
+    for index, (white_type, black_type, seed) in enumerate(specs):
+        types = {"w_player": white_type, "b_player": black_type}
+
+        def observer(game, player, move, legal_moves, seconds, events):
+            chains = [data["chain"] for event, data in events if event == "push"]
+            row = {
+                "game": index,
+                "seed": game.seed,
+                "turn": game.turn_number - 1,
+                "player": "white" if player._color == "w_player" else "black",
+                "type": types[player._color],
+                "legal_moves": legal_moves,
+                "era_only": int(move.piece is None),
+                "pushes": len(chains),
+                "chain": max(chains, default=0),
+                "pushed_off": sum(1 for event, data in events
+                                  if event == "push" and data["removed"] is not None),
+                "supply_activated": sum(1 for event, _ in events if event == "supply_activated"),
+                "seconds": round(seconds, 6),
+            }
+            writer.write(row)
+            stats.add_turn(row, chains)
+
+        stats.add_game(play_game(white_type, black_type, seed=seed, max_turns=max_turns,
+                                 observer=observer))
+
+
+def _read_specs(path: str):
+    with open(path) as specs:
+        for line in specs:
+            if line.strip():
+                spec = json.loads(line)
+                yield spec.get("white", "random"), spec.get("black", "random"), spec.get("seed")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Turn and game statistics for AI games")
+    parser.add_argument("--games", type=int, default=10, help="number of games to play")
+    parser.add_argument("--white", default="random", help="white player type")
+    parser.add_argument("--black", default="random", help="black player type")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("--specs", help="JSON lines file of games to replay instead of --games")
+    parser.add_argument("--max-turns", type=int, default=DEFAULT_MAX_TURNS)
+    parser.add_argument("--out", help="per-turn rows file (.csv or .jsonl), stdout if omitted")
+    parser.add_argument("--format", choices=("csv", "jsonl"),
+                        help="row format, inferred from --out when omitted")
+    args = parser.parse_args(argv)
+
+    if args.specs:
+        specs = _read_specs(args.specs)
+    else:
+        specs = ((args.white, args.black, args.seed + index) for index in range(args.games))
+    fmt = args.format or ("jsonl" if args.out and args.out.endswith((".jsonl", ".json")) else "csv")
+
+    stream = open(args.out, "w", newline="") if args.out else sys.stdout
+    stats = GameStats()
+    try:
+        analyse(specs, RowWriter(stream, fmt), stats, args.max_turns)
+    finally:
+        if args.out:
+            stream.close()
+    for line in stats.summary():
+        print(line, file=sys.stderr if not args.out else sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
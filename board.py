@@ -1,5 +1,6 @@
 from movehistory import Move
 from position import Position
+import notation
 class Piece:
     def __init__(self, id, owner, position):
         self.id = id
@@ -13,12 +14,34 @@ class Board:
         self.b_player = None
         self.current_player = None
         self.score = False
+        # Callables notified of engine events as listener(event, data), e.g. pushes
+        self.listeners = []
+        # Per owner: pieces on the board and eras holding at least one of them,
+        # kept up to date by the eras as pieces are placed and removed
+        self._totals = {"w_player": 0, "b_player": 0}
+        self._eras_occupied = {"w_player": 0, "b_player": 0}
+        # Set once the board has been cloned, see clone()
+        self._copy_on_write = False
+        self._shared_supplies = set()
+        # Set on a board that lent its eras to a clone: its next move takes private copies of everything
+        self._own_on_move = False
 
         self.past = Era("past", self)
         self.present = Era("present", self)
         self.future = Era("future", self)
         
     
+    def __getstate__(self):
+        # Copies and pickles of the board (search, undo history, workers) are not observed
+        state = self.__dict__.copy()
+        state["listeners"] = []
+        return state
+
+    def _notify(self, event: str, **data):
+        """Report an engine event to the listeners"""
+        for listener in self.listeners:
+            listener(event, data)
+
     def _setupBoard(self):
         """Initialize the board with starting pieces"""
         # Black pieces setup (top left of each era)
@@ -35,6 +58,9 @@ class Board:
     
     def makeMove(self, move) -> bool:
         """Execute a move on the board"""
+        if self._copy_on_write:
+            move = self._prepare_move(move)
+        
         # First validate the move
         if not self._is_valid_move(move):
             return False
@@ -48,7 +74,75 @@ class Board:
         for piece in player.current_era.getPieces(player):
             valid_moves.extend(self.get_moves_for_piece(piece))
         return valid_moves
-    
+
+    def successors(self, include_switches: bool = True, states: bool = True) -> list:
+        """
+        Every complete move for the player to move, paired with the to_state() of
+        the position it leads to. Each legal piece move comes once per era the
+        player can hand focus to, in getValidMoves order. Era-switch-only moves
+        come first; with include_switches False they are listed only when no
+        piece can move. With states False the moves are not played and come
+        with None, which is cheaper when the positions are not needed. The board
+        itself is not changed.
+        """
+        player = self.current_player
+        next_player = "b_player" if player._color == "w_player" else "w_player"
+        eras = [era for era in (self.past, self.present, self.future) if era is not player.current_era]
+        moves = self.getValidMoves(player)
+
+        successors = []
+        if include_switches or not moves:
+            state = self.to_state() if states else None
+            for era in eras:
+                successors.append((Move(None, [], era, next_player),
+                                   self._successor_state(state, player._color, era, next_player) if states else None))
+        if not states:
+            successors.extend((Move(move.piece, move.directions, era, next_player), None)
+                              for move in moves for era in eras)
+            return successors
+        if not moves:
+            return successors
+
+        # Moves are tried on a private copy and undone; moves starting the same
+        # way share the position after their first step
+        seconds = {}
+        for move in moves:
+            seconds.setdefault((move.piece, move.directions[0]), []).extend(move.directions[1:])
+        work = self.clone(private=True)
+        start = work._save_state()
+        # to_state() after each (piece, first[, second]) path
+        seen = {}
+        for (piece, first), following in seconds.items():
+            step = work._prepare_move(Move(piece, [first], None, next_player))
+            position = step._step(work, step.piece.position, first)
+            if position is not None:
+                seen[(piece, first)] = work.to_state()
+                after_first = work._save_state() if following else None
+                for second in following:
+                    if step._step(work, position, second) is not None:
+                        seen[(piece, first, second)] = work.to_state()
+                    work._restore_state(after_first)
+            work._restore_state(start)
+
+        for move in moves:
+            state = seen.get((move.piece, *move.directions))
+            if state is None:
+                continue  # The move fails when played, as Move.execute would report
+            for era in eras:
+                successors.append((Move(move.piece, move.directions, era, next_player),
+                                   self._successor_state(state, player._color, era, next_player)))
+        return successors
+
+    @staticmethod
+    def _successor_state(state: tuple, color: str, era: 'Era', next_player: str) -> tuple:
+        """A to_state() tuple with the mover's focus set to era and next_player to move"""
+        cells, w_supply, b_supply, deactivated, w_era, b_era, _ = state
+        if color == "w_player":
+            w_era = era.name
+        else:
+            b_era = era.name
+        return cells, w_supply, b_supply, deactivated, w_era, b_era, next_player
+
     # Helper function to calculate new position after a move
     def _get_new_position(self, x, y, direction, era=None):
         """Calculate new position after a move, returning None if invalid"""
@@ -330,18 +424,274 @@ class Board:
         # Implement destination validation logic
         return True
     
+    def to_state(self) -> tuple:
+        """
+        Compact, hashable description of the position: the 48 cells (past, present,
+        future, row by row, '.' for empty), both supplies, the deactivated pieces,
+        both focus eras and the colour to move.
+        """
+        cells = "".join(space.piece.id if space.piece else "."
+                        for era in (self.past, self.present, self.future)
+                        for row in era.grid for space in row)
+        deactivated = "".join(sorted(piece.id for player in (self.w_player, self.b_player)
+                                     for piece in player._deactivated_pieces))
+        return (cells,
+                "".join(piece.id for piece in self.w_player._supply),
+                "".join(piece.id for piece in self.b_player._supply),
+                deactivated,
+                self.w_player.current_era.name,
+                self.b_player.current_era.name,
+                self.current_player._color)
+
+    @classmethod
+    def from_state(cls, state: tuple, white_type: str = "human", black_type: str = "human",
+                   io=None) -> 'Board':
+        """Build a board, with new players of the given types, from a to_state() tuple"""
+        from player import PlayerFactory  # Imported here, player depends on this module
+
+        cells, w_supply, b_supply, deactivated, w_era, b_era, to_move = state
+        board = cls()
+        board.w_player = PlayerFactory.create_player(white_type, "w_player", board, io)
+        board.b_player = PlayerFactory.create_player(black_type, "b_player", board, io)
+        board.current_player = board.w_player if to_move == "w_player" else board.b_player
+        
+        for player, supply_ids, era_name in ((board.w_player, w_supply, w_era),
+                                             (board.b_player, b_supply, b_era)):
+            pieces = {piece.id: piece for piece in player._pieces + player._supply}
+            supply_piece_ids = {piece.id for piece in player._supply}
+            player._supply = [pieces[piece_id] for piece_id in supply_ids]
+            player._deactivated_pieces = [pieces[piece_id] for piece_id in deactivated if piece_id in pieces]
+            player._pieces = []
+            player._activated_pieces = []
+            for index, piece_id in enumerate(cells):
+                if piece_id in pieces:
+                    era = (board.past, board.present, board.future)[index // 16]
+                    era.grid[(index % 16) // 4][index % 4].setPiece(pieces[piece_id])
+                    player._pieces.append(pieces[piece_id])
+                    if piece_id in supply_piece_ids:
+                        player._activated_pieces.append(pieces[piece_id])
+            player.current_era = board._getEraByName(era_name)
+        return board
+
+    def to_fen(self) -> str:
+        """Text notation of the position (see notation.py)"""
+        return notation.state_to_fen(self.to_state())
+
+    @classmethod
+    def from_fen(cls, fen: str, white_type: str = "human", black_type: str = "human", io=None) -> 'Board':
+        """Build a board, with new players of the given types, from to_fen() text"""
+        return cls.from_state(notation.fen_to_state(fen), white_type, black_type, io)
+
+    def to_bytes(self) -> bytes:
+        """Packed notation of the position (see notation.py)"""
+        return notation.state_to_bytes(self.to_state())
+
+    @classmethod
+    def from_bytes(cls, data: bytes, white_type: str = "human", black_type: str = "human", io=None) -> 'Board':
+        """Build a board, with new players of the given types, from to_bytes() data"""
+        return cls.from_state(notation.bytes_to_state(data), white_type, black_type, io)
+
+    def _find_piece(self, piece_id: str) -> 'Piece':
+        """Find a piece on the board by its id"""
+        for era in [self.past, self.present, self.future]:
+            for piece in era.getPieces(None):
+                if piece.id == piece_id:
+                    return piece
+        return None
+
+    def clone(self, private: bool = False) -> 'Board':
+        """
+        Cheap copy of the position for search and what-if analysis.
+
+        The copy shares the eras and the supply pieces with this board and gets
+        shallow copies of the players with their own piece lists. Shared eras and
+        supplies are frozen: whichever board changes one first swaps in a private
+        copy (see _prepare_move), so each move copies only the eras it touches.
+        This board, which lent its eras, copies all of them on its next move and
+        then makes plain moves again, as does any board owning everything.
+
+        With private the copy takes its own eras and supplies at once, so a board
+        that shared nothing before is left making plain moves, e.g. the game's
+        board when a search or successors() starts from it.
+        """
+        was_shared = self._copy_on_write
+        clone = object.__new__(Board)
+        clone.__dict__.update(self.__dict__)
+        clone.listeners = []
+        clone._totals = dict(self._totals)
+        clone._eras_occupied = dict(self._eras_occupied)
+        for era in (self.past, self.present, self.future):
+            era._shared = True
+        self._copy_on_write = clone._copy_on_write = True
+        if not private:
+            self._own_on_move = True
+        clone._own_on_move = False
+        self._shared_supplies = {"w_player", "b_player"}
+        clone._shared_supplies = {"w_player", "b_player"}
+
+        players = {}
+        for player in (self.w_player, self.b_player):
+            twin = object.__new__(type(player))
+            twin.__dict__.update(player.__dict__)
+            twin._pieces = list(player._pieces)
+            twin._supply = list(player._supply)
+            twin._activated_pieces = list(player._activated_pieces)
+            twin._deactivated_pieces = list(player._deactivated_pieces)
+            players[id(player)] = twin
+        clone.w_player = players[id(self.w_player)]
+        clone.b_player = players[id(self.b_player)]
+        clone.current_player = players[id(self.current_player)]
+        if private:
+            clone._own_everything()
+            if not was_shared:
+                # Nothing refers to this board's eras and supplies but itself again
+                for era in (self.past, self.present, self.future):
+                    era._shared = False
+                self._shared_supplies = set()
+                self._copy_on_write = self._own_on_move = False
+        return clone
+
+    def _own_era(self, era: 'Era') -> 'Era':
+        """Replace a shared era with a private copy, returning the era this board may change"""
+        if not era._shared:
+            return era
+        owned = Era(era.name, self)
+        owned._occupancy = dict(era._occupancy)
+        owned._central = dict(era._central)
+        copies = {}
+        for row, owned_row in zip(era.grid, owned.grid):
+            for space, owned_space in zip(row, owned_row):
+                if space.piece is not None:
+                    # Assigned directly, the copied counters already include the piece
+                    twin = Piece(space.piece.id, space.piece.owner, None)
+                    twin.position = owned_space.position
+                    owned_space.piece = twin
+                    copies[space.piece] = twin
+        setattr(self, era.name, owned)
+
+        for player in (self.w_player, self.b_player):
+            player._pieces = [copies.get(piece, piece) for piece in player._pieces]
+            player._activated_pieces = [copies.get(piece, piece) for piece in player._activated_pieces]
+            if player.current_era is era:
+                player.current_era = owned
+        return owned
+
+    def _own_supply(self, player):
+        """Replace a shared supply with private pieces"""
+        if player._color in self._shared_supplies:
+            player._supply = [Piece(piece.id, piece.owner, None) for piece in player._supply]
+            self._shared_supplies.discard(player._color)
+
+    def _prepare_move(self, move: 'Move') -> 'Move':
+        """
+        Make private copies of the eras and supply a move can change, and return
+        the move rebuilt on this board's objects (it may refer to a shared era).
+        """
+        if self._own_on_move:
+            self._own_everything()
+        piece = move.piece
+        if piece is not None:
+            position = piece.position
+            era = self._own_era(self._getEraByName(position._era.name))
+            owned_piece = era.grid[position._y][position._x].piece
+            if owned_piece is not None and owned_piece.id == piece.id:
+                piece = owned_piece
+            for direction in move.directions:
+                if direction in ('f', 'b'):
+                    era = self._get_new_era(era, direction)
+                    if era is None:
+                        break
+                    era = self._own_era(era)
+            if 'b' in move.directions:
+                self._own_supply(self.current_player)
+        next_era = self._getEraByName(move.next_era.name) if move.next_era else None
+        self._end_copy_on_write()
+        return Move(piece, move.directions, next_era, move.next_player)
+
+    def _own_everything(self):
+        for era in (self.past, self.present, self.future):
+            self._own_era(era)
+        for player in (self.w_player, self.b_player):
+            self._own_supply(player)
+        self._end_copy_on_write()
+
+    def _end_copy_on_write(self):
+        """Return to plain moves once this board shares no era or supply"""
+        if not self._shared_supplies and not (self.past._shared or self.present._shared or self.future._shared):
+            self._copy_on_write = self._own_on_move = False
+
+    def _save_state(self):
+        """Capture everything a move can change, so a simulated move can be undone"""
+        if self._copy_on_write:
+            # Later moves must not swap in copies, the saved pieces would go stale
+            self._own_everything()
+        pieces = [space.piece for era in (self.past, self.present, self.future)
+                  for row in era.grid for space in row]
+        players = [(player, list(player._pieces), list(player._supply),
+                    list(player._activated_pieces), list(player._deactivated_pieces),
+                    player.current_era)
+                   for player in (self.w_player, self.b_player)]
+        return pieces, players, self.current_player
+
+    def _restore_state(self, state):
+        """Undo every change made since the matching _save_state call"""
+        pieces, players, current_player = state
+        index = 0
+        for era in (self.past, self.present, self.future):
+            for row in era.grid:
+                for space in row:
+                    piece = pieces[index]
+                    index += 1
+                    if space.piece is not piece:
+                        if piece is None:
+                            space.clearPiece()
+                        else:
+                            space.setPiece(piece)
+                    elif piece is not None:
+                        piece.position = space.position
+        
+        for player, owned, supply, activated, deactivated, current_era in players:
+            player._pieces[:] = owned
+            player._supply[:] = supply
+            player._activated_pieces[:] = activated
+            player._deactivated_pieces[:] = deactivated
+            player.current_era = current_era
+        self.current_player = current_player
+
+    def countPieces(self, player) -> int:
+        """Count a player's pieces across all eras"""
+        return self._totals[player._color]
+
+    def countEras(self, player) -> int:
+        """Count the eras containing at least one of a player's pieces"""
+        return self._eras_occupied[player._color]
+
+    def outcome(self):
+        """
+        Return the colour of the winner ("w_player" or "b_player"), or None while
+        the game goes on. A player left with one piece or none has lost; white is
+        checked first.
+        """
+        if self._totals["w_player"] <= 1:
+            return "b_player"
+        if self._totals["b_player"] <= 1:
+            return "w_player"
+        return None
+
     def isGameOver(self) -> bool:
         """Check if the game is over"""
-        # Check if current player has pieces in only one era
-        current_player = self.current_player
-        eras_with_pieces = 0
-        
-        for era in [self.past, self.present, self.future]:
-            if len(era.getPieces(current_player)) > 0:
-                eras_with_pieces += 1
-                
-        # Game is over if current player has pieces in only one era
-        return eras_with_pieces <= 1
+        return self.outcome() is not None
+
+
+def _build_neighbours() -> dict:
+    """(x, y) -> on-board neighbours in N, S, W, E order, shared by every era"""
+    directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]  # N, S, W, E
+    return {(x, y): tuple((x + dx, y + dy) for dx, dy in directions
+                          if 0 <= x + dx < 4 and 0 <= y + dy < 4)
+            for y in range(4) for x in range(4)}
+
+
+_NEIGHBOURS = _build_neighbours()
 
 
 class Space:
@@ -349,6 +699,8 @@ class Space:
         self.position = Position(x, y, era)
         self.adjacent_spaces = []
         self.piece = None
+        self._era = era
+        self._central = 0 < x < 3 and 0 < y < 3
     
     def getAdjacent(self):
         return self.adjacent_spaces
@@ -361,19 +713,29 @@ class Space:
     
     def setPiece(self, piece):
         # print("in setPiece. piece: ", piece)
+        if self.piece:
+            self._era._removeOccupant(self.piece, self._central)
         self.piece = piece
         if piece:
             piece.position = self.position
+            self._era._addOccupant(piece, self._central)
     
     def clearPiece(self):
         piece = self.piece
         self.piece = None
+        if piece:
+            self._era._removeOccupant(piece, self._central)
         return piece
 
 class Era:
     def __init__(self, name, board):
         self.name = name
         self.board = board
+        # True once a cloned board shares this era; it is then never changed again
+        self._shared = False
+        # Piece counts per owner, kept up to date by Space.setPiece/clearPiece
+        self._occupancy = {"w_player": 0, "b_player": 0}
+        self._central = {"w_player": 0, "b_player": 0}
         self.grid = [[Space(x, y, self) for x in range(4)]
                     for y in range(4)]
         self._setupAdjacency()
@@ -381,16 +743,9 @@ class Era:
     
     def _setupAdjacency(self):
         """Set up adjacent spaces for each space in the grid"""
-        directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]  # N, S, W, E
-        
-        for y in range(4):
-            for x in range(4):
-                current_space = self.grid[y][x]
-                
-                for dx, dy in directions:
-                    new_x, new_y = x + dx, y + dy
-                    if 0 <= new_x < 4 and 0 <= new_y < 4:
-                        current_space.adjacent_spaces.append(self.grid[new_y][new_x])
+        grid = self.grid
+        for (x, y), neighbours in _NEIGHBOURS.items():
+            grid[y][x].adjacent_spaces = [grid[new_y][new_x] for new_x, new_y in neighbours]
     
     def _setupInitialPieces(self):
         """Set up initial piece positions based on era type"""
@@ -403,6 +758,34 @@ class Era:
             return self.grid[y][x]
         return None
     
+    def countPieces(self, player=None) -> int:
+        """Count pieces in this era, optionally filtered by player, without scanning the grid"""
+        if player is None:
+            return self._occupancy["w_player"] + self._occupancy["b_player"]
+        return self._occupancy[player._color]
+
+    def countCentral(self, player) -> int:
+        """Count a player's pieces on the four central spaces of this era"""
+        return self._central[player._color]
+
+    def _addOccupant(self, piece, central: bool):
+        owner = piece.owner
+        self._occupancy[owner] += 1
+        if central:
+            self._central[owner] += 1
+        self.board._totals[owner] += 1
+        if self._occupancy[owner] == 1:
+            self.board._eras_occupied[owner] += 1
+
+    def _removeOccupant(self, piece, central: bool):
+        owner = piece.owner
+        self._occupancy[owner] -= 1
+        if central:
+            self._central[owner] -= 1
+        self.board._totals[owner] -= 1
+        if self._occupancy[owner] == 0:
+            self.board._eras_occupied[owner] -= 1
+
     def getPieces(self, player=None):
         """Get all pieces in this era, optionally filtered by player"""
         pieces = []
@@ -485,6 +868,9 @@ class Era:
                     # Get the player object based on piece owner
                     player = board.w_player if last_piece.owner == "w_player" else board.b_player
                     player.deactivate_piece(last_piece)
+                    if board.listeners:
+                        board._notify("push", era=self.name, chain=len(pieces_to_push),
+                                      removed=last_piece.id)
                 return True
             
             current_pos = Position(next_x, next_y, current_pos._era)
@@ -497,6 +883,8 @@ class Era:
             if 0 <= new_x < 4 and 0 <= new_y < 4:
                 self.grid[new_y][new_x].setPiece(piece)
         
+        if board.listeners:
+            board._notify("push", era=self.name, chain=len(pieces_to_push), removed=None)
         return True
 
     def _can_push_chain(self, start_pos: Position, dx: int, dy: int) -> bool:
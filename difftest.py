@@ -0,0 +1,436 @@
+"""
+Differential testing of the rules engine.
+
+Several engines play the same games in lockstep, and every ply they must agree
+on the set of legal moves, the position each move leads to (Board.to_state())
+and the winner:
+
+    rules       the rules written again from scratch on to_state() tuples
+    board       one live board, moves validated and played with Board.makeMove
+    clone       every ply on a copy-on-write Board.clone() of the last position
+    successors  legal moves and resulting positions from Board.successors()
+    state       every ply on a board rebuilt with Board.from_state()
+
+The object engines all share Move.execute and the Era push code, so comparing
+them with each other only finds bugs in the faster paths. The rules engine
+shares no code with them and is the reference by default, which is what lets a
+rules bug in the move logic show up.
+
+Games are random, from a seed, or replayed from an event log. The first
+disagreement is shrunk to a minimal move sequence that still shows it, so
+that it can be replayed with --moves. A faster engine is checked by adding it
+to ENGINES and comparing it with the rules:
+
+    python difftest.py --games 10000 --workers 8
+    python difftest.py --replay games.jsonl.gz
+    python difftest.py --moves "A:n:future B:ss:present ..."
+
+The exit status is 1 when any divergence is found, so a run can gate changes.
+"""
+import argparse
+import os
+import random
+import sys
+from collections import namedtuple
+
+from board import Board
+from eventlog import read_events
+from gameio import NullIO
+from movehistory import Move
+from player import PlayerFactory
+
+ERAS = ("past", "present", "future")
+
+
+class Divergence(namedtuple("Divergence", "seed ply what moves details")):
+    """
+    seed: seed of the game, None for a replay
+    ply: index of the move at which the engines disagreed
+    what: "legal moves", "rejected move", "position" or "winner"
+    moves: the moves played up to and including the divergent one
+    details: engine name -> what that engine reported
+    """
+    __slots__ = ()
+
+
+def move_text(key: tuple) -> str:
+    """(piece id, directions, era) as 'piece:directions:era', '-' for no piece"""
+    piece_id, directions, era = key
+    return f"{piece_id or '-'}:{directions}:{era}"
+
+
+def parse_moves(text: str) -> list:
+    """The inverse of move_text for a space-separated sequence"""
+    keys = []
+    for token in text.split():
+        piece_id, directions, era = token.split(":")
+        if era not in ERAS:
+            raise ValueError(f"Invalid era '{era}' in move '{token}'.")
+        keys.append((None if piece_id == "-" else piece_id, directions, era))
+    return keys
+
+
+def _initial_board() -> Board:
+    """The starting position, set up the way Game does it"""
+    board = Board()
+    board.w_player = PlayerFactory.create_player("human", "w_player", board, NullIO())
+    board.b_player = PlayerFactory.create_player("human", "b_player", board, NullIO())
+    board.current_player = board.w_player
+    board._setupBoard()
+    return board
+
+
+def _build_move(board: Board, key: tuple):
+    """The Move for key on board, or None if the piece is not in the mover's focus era"""
+    piece_id, directions, era = key
+    player = board.current_player
+    next_player = "b_player" if player._color == "w_player" else "w_player"
+    piece = None
+    if piece_id is not None:
+        piece = next((piece for piece in player.current_era.getPieces(player) if piece.id == piece_id), None)
+        if piece is None:
+            return None
+    return Move(piece, list(directions), board._getEraByName(era), next_player)
+
+
+def _legal_keys(board: Board) -> set:
+    """Every complete move for the player to move, from getValidMoves"""
+    player = board.current_player
+    eras = [name for name in ERAS if name != player.current_era.name]
+    keys = {(None, "", era) for era in eras}
+    for move in board.getValidMoves(player):
+        keys.update((move.piece.id, "".join(move.directions), era) for era in eras)
+    return keys
+
+
+class RulesEngine:
+    """
+    The rules again on to_state() tuples, sharing no code with Board or Move.
+    Pushes are as the game plays them: a chain that reaches the edge loses
+    only its last piece, which is deactivated, and the mover takes the first
+    piece's space, so in a longer chain that piece leaves the board without
+    being deactivated.
+    """
+    WHITE = "ABCDEFG"
+    DIRECTIONS = "nsewfb"
+    OFFSETS = {"n": (0, -1), "s": (0, 1), "e": (1, 0), "w": (-1, 0)}
+
+    def start(self):
+        cells = ["."] * 48
+        for era in range(3):
+            cells[era * 16] = "123"[era]
+            cells[era * 16 + 15] = "ABC"[era]
+        return ("".join(cells), "DEFG", "4567", "", "past", "future", "w_player")
+
+    def owner(self, piece_id: str) -> str:
+        return "w_player" if piece_id in self.WHITE else "b_player"
+
+    def target(self, cell: int, direction: str):
+        """The cell one step from cell, or None off the board or out of time"""
+        era, y, x = cell // 16, cell % 16 // 4, cell % 4
+        if direction in "fb":
+            era += 1 if direction == "f" else -1
+            if not 0 <= era < 3:
+                return None
+        else:
+            dx, dy = self.OFFSETS[direction]
+            x, y = x + dx, y + dy
+            if not (0 <= x < 4 and 0 <= y < 4):
+                return None
+        return era * 16 + y * 4 + x
+
+    def open_step(self, cells: str, cell: int, direction: str, mover: str):
+        """
+        Where a piece of mover's at cell may step, judged on cells as they
+        are before the move: time travel needs an empty space, a step in
+        space any space not held by mover.
+        """
+        target = self.target(cell, direction)
+        if target is None or cells[target] == ".":
+            return target
+        if direction in "fb" or self.owner(cells[target]) == mover:
+            return None
+        return target
+
+    def surrounded(self, cells: str, cell: int, mover: str) -> bool:
+        for direction in "nsew":
+            target = self.target(cell, direction)
+            if target is not None and (cells[target] == "." or self.owner(cells[target]) != mover):
+                return False
+        return True
+
+    def legal(self, state) -> set:
+        cells, _, _, _, w_era, b_era, mover = state
+        focus = ERAS.index(w_era if mover == "w_player" else b_era)
+        eras = [name for name in ERAS if name != ERAS[focus]]
+        keys = {(None, "", era) for era in eras}
+        for cell in range(focus * 16, focus * 16 + 16):
+            piece_id = cells[cell]
+            if piece_id == "." or self.owner(piece_id) != mover or self.surrounded(cells, cell, mover):
+                continue
+            for first in self.DIRECTIONS:
+                middle = self.open_step(cells, cell, first, mover)
+                if middle is None:
+                    continue
+                keys.update((piece_id, first, era) for era in eras)
+                for second in self.DIRECTIONS:
+                    if self.open_step(cells, middle, second, mover) is not None:
+                        keys.update((piece_id, first + second, era) for era in eras)
+        return keys
+
+    def play(self, state, key):
+        if key not in self.legal(state):
+            return None
+        cells, w_supply, b_supply, deactivated, w_era, b_era, mover = state
+        piece_id, directions, era = key
+        cells = list(cells)
+        supply = list(w_supply if mover == "w_player" else b_supply)
+        deactivated = list(deactivated)
+        if piece_id is not None:
+            cell = cells.index(piece_id)
+            for direction in directions:
+                cell = self.step(cells, supply, deactivated, cell, direction, mover)
+                if cell is None:
+                    return None
+        if mover == "w_player":
+            return ("".join(cells), "".join(supply), b_supply, "".join(sorted(deactivated)), era, b_era, "b_player")
+        return ("".join(cells), w_supply, "".join(supply), "".join(sorted(deactivated)), w_era, era, "w_player")
+
+    def step(self, cells: list, supply: list, deactivated: list, cell: int, direction: str, mover: str):
+        """Move the piece at cell one step in place, returning its new cell or None if it is blocked"""
+        target = self.target(cell, direction)
+        piece_id = cells[cell]
+        cells[cell] = "."
+        if direction in "fb":
+            if direction == "b" and supply:
+                cells[cell] = supply.pop(0)
+        elif cells[target] != ".":
+            if self.owner(cells[target]) == mover:
+                cells[cell] = piece_id
+                return None
+            chain = [target]
+            while True:
+                beyond = self.target(chain[-1], direction)
+                if beyond is None:
+                    deactivated.append(cells[chain[-1]])
+                    cells[chain[-1]] = "."
+                    break
+                if cells[beyond] == ".":
+                    for pushed in reversed(chain):
+                        cells[self.target(pushed, direction)] = cells[pushed]
+                    break
+                chain.append(beyond)
+        cells[target] = piece_id
+        return target
+
+    def state(self, state) -> tuple:
+        return state
+
+    def winner(self, state):
+        cells = state[0]
+        white = sum(cells.count(piece_id) for piece_id in self.WHITE)
+        if white <= 1:
+            return "b_player"
+        if 48 - cells.count(".") - white <= 1:
+            return "w_player"
+        return None
+
+
+class BoardEngine:
+    """The object engine as the game uses it"""
+    def start(self):
+        return _initial_board()
+
+    def legal(self, board) -> set:
+        return _legal_keys(board)
+
+    def play(self, board, key):
+        move = _build_move(board, key)
+        if move is None or not board.makeMove(move):
+            return None
+        return board
+
+    def state(self, board) -> tuple:
+        return board.to_state()
+
+    def winner(self, board):
+        return board.outcome()
+
+
+class CloneEngine(BoardEngine):
+    """Plays every move on a fresh copy-on-write clone, as the search does"""
+    def play(self, board, key):
+        return super().play(board.clone(), key)
+
+
+class SuccessorEngine(BoardEngine):
+    """Takes the legal moves and their positions from Board.successors()"""
+    def start(self):
+        return _initial_board(), None
+
+    def legal(self, position) -> set:
+        board, _ = position
+        self._successors = {(move.piece.id if move.piece else None, "".join(move.directions), move.next_era.name):
+                            state for move, state in board.successors()}
+        return set(self._successors)
+
+    def play(self, position, key):
+        board, _ = position
+        if key not in self._successors:
+            return None
+        # The board follows makeMove so the next ply starts from the same place
+        child = super().play(board.clone(), key)
+        return (child, self._successors[key]) if child is not None else None
+
+    def state(self, position) -> tuple:
+        return position[1] if position[1] is not None else position[0].to_state()
+
+    def winner(self, position):
+        return position[0].outcome()
+
+
+class StateEngine(BoardEngine):
+    """Rebuilds the board from its to_state() encoding before every move"""
+    def play(self, board, key):
+        return super().play(Board.from_state(board.to_state()), key)
+
+
+ENGINES = {"rules": RulesEngine, "board": BoardEngine, "clone": CloneEngine,
+           "successors": SuccessorEngine, "state": StateEngine}
+
+
+def run_game(names: list, seed=None, max_plies: int = 200, moves: list = None):
+    """
+    Play one game through the named engines, random from seed or following
+    moves, and return the first Divergence or None. A moves sequence that
+    turns illegal in every engine simply ends the game.
+    """
+    engines = [ENGINES[name]() for name in names]
+    positions = [engine.start() for engine in engines]
+    rng = random.Random(seed)
+    played = []
+    limit = max_plies if moves is None else len(moves)
+    for ply in range(limit):
+        legal = [engine.legal(position) for engine, position in zip(engines, positions)]
+        if moves is not None:
+            key = moves[ply]
+            if all(key not in keys for keys in legal):
+                return None
+        else:
+            key = rng.choice(sorted(legal[0], key=move_text))
+        played.append(key)
+        if any(keys != legal[0] for keys in legal):
+            return Divergence(seed, ply, "legal moves", played,
+                              {name: sorted(map(move_text, keys ^ legal[0])) for name, keys in zip(names, legal)})
+
+        positions = [engine.play(position, key) for engine, position in zip(engines, positions)]
+        if any(position is None for position in positions):
+            return Divergence(seed, ply, "rejected move", played,
+                              {name: position is None for name, position in zip(names, positions)})
+        states = [engine.state(position) for engine, position in zip(engines, positions)]
+        if any(state != states[0] for state in states):
+            return Divergence(seed, ply, "position", played, dict(zip(names, states)))
+        winners = [engine.winner(position) for engine, position in zip(engines, positions)]
+        if any(winner != winners[0] for winner in winners):
+            return Divergence(seed, ply, "winner", played, dict(zip(names, winners)))
+        if winners[0] is not None:
+            break
+    return None
+
+
+def shrink(names: list, divergence: Divergence) -> Divergence:
+    """
+    Delta debugging: drop ever smaller runs of moves while the engines still
+    disagree in the same way, and return the smallest divergence found. Runs
+    are whole rounds, a move by each side, so that the same side stays to move.
+    """
+    best = divergence
+    chunks = 2
+    while len(best.moves) > 2:
+        rounds = len(best.moves) // 2
+        size = 2 * -(-rounds // chunks)
+        for start in reversed(range(0, len(best.moves) - size, size)):
+            candidate = best.moves[:start] + best.moves[start + size:]
+            found = run_game(names, moves=candidate)
+            if found is not None and found.what == best.what:
+                best = found._replace(seed=divergence.seed)
+                chunks = max(chunks - 1, 2)
+                break
+        else:
+            if size == 2:
+                break
+            chunks = min(chunks * 2, rounds)
+    return best
+
+
+def check_seed(names: list, seed: int, max_plies: int = 200):
+    """Play one random game and return its shrunk divergence or None; module-level for the WorkerPool"""
+    found = run_game(names, seed, max_plies)
+    return shrink(names, found) if found is not None else None
+
+
+def recorded_games(path: str) -> list:
+    """The move sequences of the games in an event log"""
+    games = []
+    for event in read_events(path):
+        if event["event"] == "game_start":
+            games.append([])
+        elif event["event"] == "move" and games:
+            games[-1].append((event["piece"], event["directions"], event["era"]))
+    return games
+
+
+def report(divergence: Divergence) -> list:
+    """Text lines describing a divergence and its reproducer"""
+    lines = [f"divergence in {divergence.what} at ply {divergence.ply}"
+             + (f" (seed {divergence.seed})" if divergence.seed is not None else "")]
+    for name, detail in divergence.details.items():
+        lines.append(f"  {name}: {detail}")
+    lines.append("  reproduce: python difftest.py --moves \"" + " ".join(map(move_text, divergence.moves)) + "\"")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play games through several engines and compare them every ply")
+    parser.add_argument("--engines", default=",".join(ENGINES), help="comma-separated, the first is the reference")
+    parser.add_argument("--games", type=int, default=100, help="random games to play")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first random game")
+    parser.add_argument("--max-plies", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--replay", help="event log whose games are replayed instead")
+    parser.add_argument("--moves", help="replay a single move sequence, as printed for a reproducer")
+    args = parser.parse_args(argv)
+    names = args.engines.split(",")
+    for name in names:
+        if name not in ENGINES:
+            raise ValueError(f"Invalid engine '{name}'. Must be one of {', '.join(ENGINES)}.")
+    if len(names) < 2:
+        raise ValueError("At least two engines are needed to compare.")
+    if args.workers < 1:
+        raise ValueError(f"Invalid worker count {args.workers}. Must be a positive integer.")
+
+    if args.moves or args.replay:
+        games = [parse_moves(args.moves)] if args.moves else recorded_games(args.replay)
+        found = [run_game(names, moves=moves) for moves in games]
+        found = [shrink(names, divergence) for divergence in found if divergence is not None]
+        total = len(games)
+    else:
+        seeds = range(args.seed, args.seed + args.games)
+        if args.workers > 1:
+            from workerpool import WorkerPool
+            with WorkerPool(args.workers) as pool:
+                results = pool.map(check_seed, [names] * len(seeds), seeds, [args.max_plies] * len(seeds))
+        else:
+            results = [check_seed(names, seed, args.max_plies) for seed in seeds]
+        found = [divergence for divergence in results if divergence is not None]
+        total = len(seeds)
+
+    for divergence in found:
+        for line in report(divergence):
+            print(line)
+    print(f"{total} games, {len(found)} divergent ({', '.join(names)})")
+    return 1 if found else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
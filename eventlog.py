@@ -0,0 +1,103 @@
+"""
+Structured game records.
+
+Game reports what happens as event dicts, e.g.
+
+    {"event": "move", "turn": 3, "player": "white", "piece": "B", "directions": "nb", "era": "present"}
+
+to an EventSink. Event types are game_start, move, pushed_off,
+supply_activated, era_switched (a move that only changes the focus era) and
+game_over. Sinks are shared by every copy
+of the game (undo history, AI simulations), like IO providers.
+json and gzip are imported only by the file sink, so games that do not log
+skip loading them.
+"""
+from abc import ABC, abstractmethod
+from collections import deque
+
+
+class EventSink(ABC):
+    """Receives game events"""
+    # False lets the game skip building events nobody records
+    enabled = True
+
+    @abstractmethod
+    def emit(self, event: dict):
+        pass
+
+    def flush(self):
+        """Push any buffered events to their destination"""
+        pass
+
+    def close(self):
+        self.flush()
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+class NullSink(EventSink):
+    """Discards every event"""
+    enabled = False
+
+    def emit(self, event: dict):
+        pass
+
+
+class RingBufferSink(EventSink):
+    """Keeps the most recent events in memory"""
+    def __init__(self, capacity: int = 10_000):
+        if capacity < 1:
+            raise ValueError(f"Invalid capacity {capacity}. Must be at least 1.")
+        self.events = deque(maxlen=capacity)
+
+    def emit(self, event: dict):
+        self.events.append(event)
+
+
+class JsonlSink(EventSink):
+    """
+    Writes one JSON object per line, buffering batch_size events per write.
+    The file is gzip-compressed when compress is True or the path ends in .gz.
+    """
+    def __init__(self, path: str, batch_size: int = 1024, compress: bool = None):
+        if batch_size < 1:
+            raise ValueError(f"Invalid batch size {batch_size}. Must be at least 1.")
+        import json
+        self._dumps = json.dumps
+        if compress is None:
+            compress = path.endswith(".gz")
+        if compress:
+            import gzip
+            self._file = gzip.open(path, "at", encoding="utf-8")
+        else:
+            self._file = open(path, "a", encoding="utf-8")
+        self._batch_size = batch_size
+        self._pending = []
+
+    def emit(self, event: dict):
+        self._pending.append(self._dumps(event, separators=(",", ":")))
+        if len(self._pending) >= self._batch_size:
+            self.flush()
+
+    def flush(self):
+        if self._pending:
+            self._file.write("\n".join(self._pending) + "\n")
+            self._pending.clear()
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+
+def read_events(path: str):
+    """Iterate over the events of a JsonlSink file"""
+    import gzip
+    import json
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as events:
+        for line in events:
+            if line.strip():
+                yield json.loads(line)
@@ -0,0 +1,149 @@
+"""
+Input/output providers used by Game and HumanPlayer.
+
+The game never talks to the terminal directly; it reads and writes lines
+through a provider so it can be driven by a console, a script or a network
+session. Synchronous providers are used by Game.run. Asyncio providers can
+drive a game running in a worker thread through SyncBridge.
+
+asyncio is only imported by the asyncio providers, so console and headless
+games do not pay for loading it.
+"""
+from abc import ABC, abstractmethod
+
+
+class IOProvider(ABC):
+    """Synchronous line-based input/output"""
+    @abstractmethod
+    def read(self, prompt: str) -> str:
+        """Show a prompt and return the next line of input (raises EOFError when exhausted)"""
+        pass
+
+    @abstractmethod
+    def write(self, text: str):
+        """Output a line of text"""
+        pass
+
+    def __deepcopy__(self, memo):
+        # Providers are shared by every copy of the game (undo history, AI simulations)
+        return self
+
+
+class ConsoleIO(IOProvider):
+    """Reads from stdin and writes to stdout"""
+    def read(self, prompt: str) -> str:
+        return input(prompt)
+
+    def write(self, text: str):
+        print(text)
+
+
+class ScriptedIO(IOProvider):
+    """Feeds a fixed sequence of input lines and optionally captures the output"""
+    def __init__(self, lines, capture: bool = True):
+        self._lines = iter(lines)
+        self._capture = capture
+        self.output = []
+
+    def read(self, prompt: str) -> str:
+        if self._capture and prompt:
+            self.output.append(prompt.rstrip("\n"))
+        try:
+            return next(self._lines)
+        except StopIteration:
+            raise EOFError("scripted input exhausted") from None
+
+    def write(self, text: str):
+        if self._capture:
+            self.output.append(text)
+
+
+class NullIO(IOProvider):
+    """Discards all output and has no input"""
+    def read(self, prompt: str) -> str:
+        raise EOFError("no input available")
+
+    def write(self, text: str):
+        pass
+
+
+class AsyncIOProvider(ABC):
+    """Asyncio line-based input/output"""
+    @abstractmethod
+    async def read(self, prompt: str) -> str:
+        pass
+
+    @abstractmethod
+    async def write(self, text: str):
+        pass
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+class AsyncStreamIO(AsyncIOProvider):
+    """Reads and writes lines over asyncio streams, e.g. a socket connection"""
+    def __init__(self, reader: 'asyncio.StreamReader', writer: 'asyncio.StreamWriter'):
+        self._reader = reader
+        self._writer = writer
+
+    async def read(self, prompt: str) -> str:
+        if prompt:
+            await self.write(prompt.rstrip("\n"))
+        line = await self._reader.readline()
+        if not line:
+            raise EOFError("connection closed")
+        return line.decode().rstrip("\r\n")
+
+    async def write(self, text: str):
+        self._writer.write((text + "\n").encode())
+        await self._writer.drain()
+
+
+class AsyncScriptedIO(AsyncIOProvider):
+    """Asyncio counterpart of ScriptedIO, fed through a queue"""
+    def __init__(self, lines=(), capture: bool = True):
+        import asyncio
+        self._queue = asyncio.Queue()
+        for line in lines:
+            self._queue.put_nowait(line)
+        self._capture = capture
+        self.output = []
+
+    def feed(self, line: str):
+        """Queue another input line"""
+        self._queue.put_nowait(line)
+
+    def close(self):
+        """Signal that no more input will arrive"""
+        self._queue.put_nowait(None)
+
+    async def read(self, prompt: str) -> str:
+        if self._capture and prompt:
+            self.output.append(prompt.rstrip("\n"))
+        line = await self._queue.get()
+        if line is None:
+            raise EOFError("scripted input exhausted")
+        return line
+
+    async def write(self, text: str):
+        if self._capture:
+            self.output.append(text)
+
+
+class SyncBridge(IOProvider):
+    """
+    Exposes an asyncio provider to a game running in a worker thread,
+    e.g. await asyncio.to_thread(Game(..., io=SyncBridge(provider, loop)).run)
+    """
+    def __init__(self, provider: AsyncIOProvider, loop: 'asyncio.AbstractEventLoop'):
+        self._provider = provider
+        self._loop = loop
+
+    def read(self, prompt: str) -> str:
+        import asyncio
+        return asyncio.run_coroutine_threadsafe(self._provider.read(prompt), self._loop).result()
+
+    def write(self, text: str):
+        import asyncio
+        asyncio.run_coroutine_threadsafe(self._provider.write(text), self._loop).result()
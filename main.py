@@ -1,16 +1,17 @@
-from position import Position
 import sys
-import pickle
+import random
 import time
-import copy
-from decimal import Decimal, setcontext, BasicContext
-from datetime import datetime
 from board import Board
-from player import PlayerFactory, HumanPlayer, HeuristicAIPlayer, RandomAIPlayer
-from movehistory import Originator, Caretaker, Memento
+from player import PlayerFactory, HumanPlayer, HeuristicAIPlayer, RandomAIPlayer, SearchAIPlayer, NTupleAIPlayer
+from movehistory import Originator, Caretaker, Memento, CHECKPOINT_INTERVAL, MAX_CHECKPOINTS
+from gameio import ConsoleIO
+from renderer import BoardRenderer
+from scoremodel import ScoreModel
+from eventlog import NullSink, JsonlSink
+from adjudication import Adjudicator
+from timecontrol import Clock, Deadline
 
 from enum import Enum
-from typing import Optional, Dict, Callable
 
 class GameState(Enum):
     PLAYING = "playing"
@@ -22,12 +23,47 @@ class GameState(Enum):
 class Game:
     """Manages the game flow and user interactions."""
     
-    def __init__(self, white_type="human", black_type="human", undo_redo="off", score="off"):
-        """Initialize the game with specified player types and settings."""
+    def __init__(self, white_type="human", black_type="human", undo_redo="off", score="off", io=None,
+                 display="on", seed=None, workers=1, white_options=None, black_options=None, events=None,
+                 adjudicator=None, time_control=None, move_time=None,
+                 history_interval=CHECKPOINT_INTERVAL, history_checkpoints=MAX_CHECKPOINTS):
+        """Initialize the game with specified player types and settings.
+
+        io is the IOProvider used for all prompts and output, defaulting to the console.
+        display "off" skips board rendering and the per-move lines entirely.
+        seed determines every player's random stream, so a game can be replayed exactly;
+        a fresh seed is drawn when it is None and recorded in self.seed.
+        workers > 1 lets heuristic players score their moves across that many processes.
+        white_options/black_options are extra PlayerFactory settings, e.g. {"depth": 3}.
+        events is the EventSink receiving the game record, see eventlog.
+        adjudicator ends drawn-out games, see adjudication; the default draws on threefold
+        repetition or after 200 moves without a capture or supply piece.
+        time_control (a timecontrol.TimeControl) gives both players a clock; running out loses.
+        move_time caps the seconds an AI player may spend on each move.
+        history_interval and history_checkpoints set how often undo history keeps a full
+        checkpoint and how many it keeps at most, see movehistory.Caretaker.
+        """
         
         # Game settings (initialize these first)
+        self.io = io if io is not None else ConsoleIO()
         self.undo_redo = undo_redo.lower() == "on"
         self.score = score.lower() == "on"
+        self.renderer = BoardRenderer(self.io, quiet=display.lower() == "off")
+        self.score_model = ScoreModel(self)
+        self.seed = seed if seed is not None else random.SystemRandom().randrange(2 ** 32)
+        self.workers = workers
+        self.player_options = {"w_player": dict(white_options or {}), "b_player": dict(black_options or {})}
+        # Callables notified of engine events during moves, see Board.listeners
+        self.listeners = []
+        self.events = events if events is not None else NullSink()
+        self.adjudicator = adjudicator if adjudicator is not None else Adjudicator()
+        # Rule that ended the game by adjudication, if any
+        self.adjudication = None
+        self.time_control = time_control
+        self.move_time = move_time
+        self.history_interval = history_interval
+        self.history_checkpoints = history_checkpoints
+        self.clocks = self._new_clocks()
         self.state = GameState.PLAYING
         self.turn_number = 1
         
@@ -36,8 +72,12 @@ class Game:
         self.board.score = self.score
         
         # Player initialization
-        self.w_player = PlayerFactory.create_player(white_type, "w_player", self.board)
-        self.b_player = PlayerFactory.create_player(black_type, "b_player", self.board)
+        self.w_player = PlayerFactory.create_player(white_type, "w_player", self.board, self.io,
+                                                    self._player_rng("w_player"),
+                                                    **self._player_options(white_type, "w_player"))
+        self.b_player = PlayerFactory.create_player(black_type, "b_player", self.board, self.io,
+                                                    self._player_rng("b_player"),
+                                                    **self._player_options(black_type, "b_player"))
         
         # Set board references
         self.board.w_player = self.w_player
@@ -47,71 +87,26 @@ class Game:
         
         # Initialize current player
         self.current_player = self.w_player
+        self.adjudicator.start(self.board)
         
         # Initialize undo/redo functionality
         if self.undo_redo:
             self.originator = Originator(self)
-            self.caretaker = Caretaker(self.originator)
+            self.caretaker = Caretaker(self.originator, self.history_interval, self.history_checkpoints)
             self.caretaker.save()
         
         # Add a flag to control board display
         self.should_display_board = True
-    
-    def _display_eras(self):
-        """Display the current state of all eras."""
-        print("---------------------------------")
-        
-        # Display black's focus indicator
-        if self.b_player.current_era == self.board.future:
-            print(" " * 26 + "black" + " " * 2)
-        elif self.b_player.current_era == self.board.present:
-            print(" " * 14 + "black" + " " * 2)
-        else:
-            print(" " * 2 + "black" + " " * 2)
-        
-        # Display all three eras side by side
-        self._display_era_rows(self.board.past, self.board.present, self.board.future)
-        
 
-        # Display white's focus indicator
-        if self.w_player.current_era == self.board.future:
-            print(" " * 26 + "white" + " " * 2)
-        elif self.w_player.current_era == self.board.present:
-            print(" " * 14 + "white" + " " * 2)
-        else:
-            print(" " * 2 + "white" + " " * 2)
-        
-            
-        # Display turn information
-        print(f"Turn: {self.turn_number}, Current player: {'white' if self.current_player == self.w_player else 'black'}")
-    
-    def _display_era_rows(self, past, present, future):
-        """Helper method to display rows of all eras side by side."""
-        for y in range(4):
-            # Display grid lines
-            print("+-+-+-+-+   +-+-+-+-+   +-+-+-+-+")
-            
-            # Display pieces in each era
-            past_row = self._format_row(past.grid[y])
-            present_row = self._format_row(present.grid[y])
-            future_row = self._format_row(future.grid[y])
-            print(f"{past_row}   {present_row}   {future_row}")
-        
-        # Bottom grid line
-        print("+-+-+-+-+   +-+-+-+-+   +-+-+-+-+")
+        self._log_start()
     
-    def _format_row(self, row):
-        """Format a single row of an era for display."""
-        row_str = "|"
-        for space in row:
-            if space.isOccupied():
-                piece = space.getPiece()
-                # Use the piece's ID directly instead of calculating it
-                symbol = piece.id
-            else:
-                symbol = " "
-            row_str += f"{symbol}|"
-        return row_str
+    def _display_eras(self):
+        """Display the current state of all eras, followed by the scores if enabled."""
+        score_lines = []
+        if self.score:
+            score_lines = [self._format_scores(self.w_player, "white"),
+                           self._format_scores(self.b_player, "black")]
+        self.renderer.draw(self, score_lines)
     
     def _undo_redo_decorator(func):
         """Decorator to handle undo/redo functionality"""
@@ -120,100 +115,17 @@ class Game:
                 while self.state == GameState.PLAYING:
                     if self.should_display_board:
                         self._display_eras()
-                        if self.score:
-                            self._display_scores(self.w_player, "white")
-                            self._display_scores(self.b_player, "black")
                     
                     if hasattr(self, 'originator'):
-                        action = input("undo, redo, or next\n").strip().lower()
+                        action = self.io.read("undo, redo, or next\n").strip().lower()
                         
                         if action == "undo":
-                            result = self.caretaker.undo()
-                            if result is None:
-                                continue
-                            
-                            # Store the era references from the result
-                            w_era = result.w_player.current_era
-                            b_era = result.b_player.current_era
-                            
-                            # Update game state with the restored state
-                            self.board = copy.deepcopy(result.board)
-                            self.turn_number = result.turn_number
-                            self.state = result.state
-                            
-                            # Restore player states including supply and piece tracking
-                            # White player restoration
-                            self.w_player._supply = copy.deepcopy(result.w_player._supply)
-                            self.w_player._pieces = copy.deepcopy(result.w_player._pieces)
-                            self.w_player._activated_pieces = copy.deepcopy(result.w_player._activated_pieces)
-                            self.w_player.current_era = self.board.past if w_era == result.board.past else \
-                                                    self.board.present if w_era == result.board.present else \
-                                                    self.board.future
-                            
-                            # Black player restoration
-                            self.b_player._supply = copy.deepcopy(result.b_player._supply)
-                            self.b_player._pieces = copy.deepcopy(result.b_player._pieces)
-                            self.b_player._activated_pieces = copy.deepcopy(result.b_player._activated_pieces)
-                            self.b_player.current_era = self.board.past if b_era == result.board.past else \
-                                                    self.board.present if b_era == result.board.present else \
-                                                    self.board.future
-                            
-                            # Update current player reference
-                            self.current_player = self.w_player if result.current_player._color == "w_player" else self.b_player
-                            self.board.current_player = self.current_player
-                            
-                            # Fix piece positions on the board
-                            for era in [self.board.past, self.board.present, self.board.future]:
-                                for y in range(4):
-                                    for x in range(4):
-                                        if era.grid[y][x].isOccupied():
-                                            piece = era.grid[y][x].getPiece()
-                                            piece.position = Position(x, y, era)
-                            self.should_display_board = True
+                            if self.undo():
+                                self.should_display_board = True
                             continue
                         elif action == "redo":
-                            result = self.caretaker.redo()
-                            if result is None:
-                                continue
-                            
-                            # Store the era references from the result
-                            w_era = result.w_player.current_era
-                            b_era = result.b_player.current_era
-                            
-                            # Update game state with the restored state
-                            self.board = copy.deepcopy(result.board)
-                            self.turn_number = result.turn_number
-                            self.state = result.state
-                            
-                            # Restore player states including supply and piece tracking
-                            # White player restoration
-                            self.w_player._supply = copy.deepcopy(result.w_player._supply)
-                            self.w_player._pieces = copy.deepcopy(result.w_player._pieces)
-                            self.w_player._activated_pieces = copy.deepcopy(result.w_player._activated_pieces)
-                            self.w_player.current_era = self.board.past if w_era == result.board.past else \
-                                                    self.board.present if w_era == result.board.present else \
-                                                    self.board.future
-                            
-                            # Black player restoration
-                            self.b_player._supply = copy.deepcopy(result.b_player._supply)
-                            self.b_player._pieces = copy.deepcopy(result.b_player._pieces)
-                            self.b_player._activated_pieces = copy.deepcopy(result.b_player._activated_pieces)
-                            self.b_player.current_era = self.board.past if b_era == result.board.past else \
-                                                    self.board.present if b_era == result.board.present else \
-                                                    self.board.future
-                            
-                            # Update current player reference
-                            self.current_player = self.w_player if result.current_player._color == "w_player" else self.b_player
-                            self.board.current_player = self.current_player
-                            
-                            self.should_display_board = True
-                            # Fix piece positions on the board
-                            for era in [self.board.past, self.board.present, self.board.future]:
-                                for y in range(4):
-                                    for x in range(4):
-                                        if era.grid[y][x].isOccupied():
-                                            piece = era.grid[y][x].getPiece()
-                                            piece.position = Position(x, y, era)
+                            if self.redo():
+                                self.should_display_board = True
                             continue
                         elif action == "next":
                             self.should_display_board = False
@@ -223,22 +135,13 @@ class Game:
                     
                     
                     # Get and execute move
-                    move = self.current_player.getMove(self.board)
-                    if move and self.board.makeMove(move):
-                        print(move)
-                        self.current_player = self.b_player if self.current_player == self.w_player else self.w_player
-                        self.turn_number += 1
-                        
-                        self.state = self._get_winner()
-                        
-                        # Save state after successful move
-                        if hasattr(self, 'originator'):
-                            self.caretaker.save()
+                    move = self.next_move()
+                    self.play_move(move)
                     
                     # Reset display flag for next iteration
                     self.should_display_board = True
-                print("play again?")
-                play_again = input().lower().strip()
+                self.io.write("play again?")
+                play_again = self.io.read("").lower().strip()
                 if play_again != "yes":
                     break
                     
@@ -246,6 +149,32 @@ class Game:
                 self._reset_game()
         return wrapper
     
+    def undo(self) -> bool:
+        """Go back one turn; False if there is nothing to undo"""
+        return self._restore(self.caretaker.undo())
+
+    def redo(self) -> bool:
+        """Go forward one undone turn; False if there is nothing to redo"""
+        return self._restore(self.caretaker.redo())
+
+    def _restore(self, snapshot) -> bool:
+        """
+        Take the board, both players and the adjudicator from a history
+        snapshot, copied together so the players' pieces are the board's own
+        """
+        if snapshot is None:
+            return False
+        snapshot = snapshot.copy()
+        self.board = snapshot.board
+        self.w_player = snapshot.w_player
+        self.b_player = snapshot.b_player
+        self.current_player = snapshot.current_player
+        self.turn_number = snapshot.turn_number
+        self.state = snapshot.state
+        self.adjudicator = snapshot.adjudicator
+        self.adjudication = snapshot.adjudication
+        return True
+
     @_undo_redo_decorator
     def run(self):
         """Main game loop"""
@@ -253,27 +182,17 @@ class Game:
             while self.state == GameState.PLAYING:
                 if self.should_display_board:
                     self._display_eras()
-                    if self.score:
-                        self._display_scores(self.w_player, "white")
-                        self._display_scores(self.b_player, "black")
                 
                 # Get and execute move
-                move = self.current_player.getMove(self.board)
-                if move and self.board.makeMove(move):
-                    print(move)
-                    self.current_player = self.b_player if self.current_player == self.w_player else self.w_player
-                    self.turn_number += 1
-                    game_state = self._get_winner()
-                    # Save state after successful move
-                    if hasattr(self, 'originator'):
-                        self.caretaker.save()
+                move = self.next_move()
+                self.play_move(move)
                 
                 # Reset display flag for next iteration
                 self.should_display_board = True
             
 
-            print("play again?")
-            play_again = input().lower().strip()
+            self.io.write("play again?")
+            play_again = self.io.read("").lower().strip()
             if play_again != "yes":
                 break
                 
@@ -281,13 +200,147 @@ class Game:
             self._reset_game()
 
     
+    def _player_rng(self, color: str) -> random.Random:
+        """Independent random stream for one player, derived from the game seed"""
+        return random.Random(f"{self.seed}:{color}")
+
+    def _player_options(self, player_type: str, color: str) -> dict:
+        """Extra PlayerFactory settings for a player"""
+        options = {}
+        if player_type == "heuristic" and self.workers > 1:
+            options["workers"] = self.workers
+        options.update(self.player_options[color])
+        return options
+
+    def _new_clocks(self) -> dict:
+        if self.time_control is None:
+            return {}
+        return {"w_player": Clock(self.time_control), "b_player": Clock(self.time_control)}
+
+    def move_budget(self, color: str):
+        """Seconds the player may spend on its next move, or None without a time limit"""
+        budgets = [self.clocks[color].budget()] if self.clocks else []
+        if self.move_time is not None:
+            budgets.append(self.move_time)
+        return min(budgets) if budgets else None
+
+    def charge_clock(self, color: str, seconds: float) -> bool:
+        """Deduct the time a move took from the player's clock; False, ending the game, if it ran out"""
+        if not self.clocks or self.clocks[color].charge(seconds):
+            return True
+        self.adjudication = "time"
+        if color == "w_player":
+            self.io.write("white ran out of time, black has won")
+            self.state = GameState.BLACK_WON
+        else:
+            self.io.write("black ran out of time, white has won")
+            self.state = GameState.WHITE_WON
+        if self.events.enabled:
+            self.events.emit({"event": "game_over", "turn": self.turn_number, "result": self.state.value,
+                              "adjudication": self.adjudication})
+            self.events.flush()
+        return False
+
+    def next_move(self):
+        """
+        Ask the current player for its move within its time budget and charge
+        its clock. Returns None if the player ran out of time.
+        """
+        player = self.current_player
+        budget = self.move_budget(player._color)
+        player.deadline = Deadline.after(budget) if budget is not None else None
+        start = time.monotonic()
+        try:
+            move = player.getMove(self.board)
+        finally:
+            player.deadline = None
+        if not self.charge_clock(player._color, time.monotonic() - start):
+            return None
+        return move
+
+    def play_move(self, move) -> bool:
+        """Apply a move for the current player and advance the turn.
+
+        Returns True if the move was made, False if it was missing or invalid.
+        """
+        if not move:
+            return False
+        player = self.current_player
+        from_era = player.current_era.name
+        board_events = []
+        # Only the real move is observed, not the AI's simulations
+        self.board.listeners = self.listeners
+        if self.events.enabled:
+            self.board.listeners = self.listeners + [lambda event, data: board_events.append((event, data))]
+        try:
+            made = self.board.makeMove(move)
+        finally:
+            self.board.listeners = []
+        if not made:
+            return False
+        if not self.renderer.quiet:
+            self.io.write(str(move))
+
+        self.current_player = self.b_player if self.current_player == self.w_player else self.w_player
+        self.turn_number += 1
+
+        self.state = self._get_winner()
+        if self.state == GameState.PLAYING:
+            self.state = self._adjudicate()
+        if self.events.enabled:
+            self._log_move(player, move, from_era, board_events)
+
+        # Save state after successful move
+        if hasattr(self, 'originator'):
+            self.caretaker.save(move)
+        return True
+
+    def _log_start(self):
+        if self.events.enabled:
+            self.events.emit({"event": "game_start", "seed": self.seed})
+
+    def _log_move(self, player, move, from_era: str, board_events: list):
+        """Emit the events of the move just played"""
+        turn = self.turn_number - 1
+        color = "white" if player._color == "w_player" else "black"
+        self.events.emit({"event": "move", "turn": turn, "player": color,
+                          "piece": move.piece.id if move.piece else None,
+                          "directions": "".join(move.directions) if move.piece else "",
+                          "era": move.next_era.name if move.next_era else None})
+        for event, data in board_events:
+            if event == "push" and data["removed"] is not None:
+                self.events.emit({"event": "pushed_off", "turn": turn, "piece": data["removed"],
+                                  "era": data["era"]})
+            elif event == "supply_activated":
+                self.events.emit({"event": "supply_activated", "turn": turn, "player": color,
+                                  "piece": data["piece"], "era": data["era"]})
+        if move.piece is None:
+            # Every move hands focus to another era; only a move without a piece does nothing else
+            self.events.emit({"event": "era_switched", "turn": turn, "player": color,
+                              "from": from_era, "to": player.current_era.name})
+        if self.state != GameState.PLAYING:
+            self.events.emit({"event": "game_over", "turn": turn, "result": self.state.value,
+                              "adjudication": self.adjudication})
+            self.events.flush()
+
     def _reset_game(self):
         """Reset the game to initial state"""
         # Store current settings before reset
         white_type = "heuristic" if isinstance(self.w_player, HeuristicAIPlayer) else \
-                     "random" if isinstance(self.w_player, RandomAIPlayer) else "human"
+                     "random" if isinstance(self.w_player, RandomAIPlayer) else \
+                     "search" if isinstance(self.w_player, SearchAIPlayer) else \
+                     "ntuple" if isinstance(self.w_player, NTupleAIPlayer) else "human"
         black_type = "heuristic" if isinstance(self.b_player, HeuristicAIPlayer) else \
-                     "random" if isinstance(self.b_player, RandomAIPlayer) else "human"
+                     "random" if isinstance(self.b_player, RandomAIPlayer) else \
+                     "search" if isinstance(self.b_player, SearchAIPlayer) else \
+                     "ntuple" if isinstance(self.b_player, NTupleAIPlayer) else "human"
+        
+        # Stop any background work of the old players
+        self.w_player.close()
+        self.b_player.close()
+        
+        # Derive the next game's seed from this one so a series of games stays reproducible
+        self.seed = random.Random(f"{self.seed}:next").randrange(2 ** 32)
         
         # Reset turn counter and state
         self.turn_number = 1
@@ -298,8 +351,12 @@ class Game:
         self.board.score = self.score  # Preserve score display setting
         
         # Recreate players with same types as before
-        self.w_player = PlayerFactory.create_player(white_type, "w_player", self.board)
-        self.b_player = PlayerFactory.create_player(black_type, "b_player", self.board)
+        self.w_player = PlayerFactory.create_player(white_type, "w_player", self.board, self.io,
+                                                    self._player_rng("w_player"),
+                                                    **self._player_options(white_type, "w_player"))
+        self.b_player = PlayerFactory.create_player(black_type, "b_player", self.board, self.io,
+                                                    self._player_rng("b_player"),
+                                                    **self._player_options(black_type, "b_player"))
         
         # Reset board references
         self.board.w_player = self.w_player
@@ -314,82 +371,68 @@ class Game:
         
         # Reset display flag
         self.should_display_board = True
+
+        self.adjudication = None
+        self.clocks = self._new_clocks()
+        self.adjudicator.start(self.board)
+        self._log_start()
         
         # Reset undo/redo if enabled
         if self.undo_redo:
             self.originator = Originator(self)
-            self.caretaker = Caretaker(self.originator)
+            self.caretaker = Caretaker(self.originator, self.history_interval, self.history_checkpoints)
             self.caretaker.save()
     
     def _get_winner(self) -> GameState:
         """Determine the winner of the game"""
-        w_pieces = 0
-        b_pieces = 0
-        
-        # Count pieces for each player across all eras
-        for era in [self.board.past, self.board.present, self.board.future]:
-            w_pieces += len(era.getPieces(self.w_player))
-            b_pieces += len(era.getPieces(self.b_player))
+        winner = self.board.outcome()
         
         # If white has no pieces, black wins
-        if w_pieces <= 1:
-            print("black has won")
+        if winner == "b_player":
+            self.io.write("black has won")
             return GameState.BLACK_WON
         # If black has no pieces, white wins
-        elif b_pieces <= 1:
-            print("white has won")
+        elif winner == "w_player":
+            self.io.write("white has won")
             return GameState.WHITE_WON
         # If both have pieces, game continues
         return GameState.PLAYING
 
+    def _adjudicate(self) -> GameState:
+        """Record the position and end the game if an adjudication rule applies"""
+        reason = self.adjudicator.record(self.board)
+        if reason is None:
+            return GameState.PLAYING
+        self.adjudication = reason
+        rule = reason.replace("_", " ")
+        winner = self.adjudicator.adjudicate(self.board, reason)
+        if winner == "w_player":
+            self.io.write(f"white has won by adjudication ({rule})")
+            return GameState.WHITE_WON
+        if winner == "b_player":
+            self.io.write(f"black has won by adjudication ({rule})")
+            return GameState.BLACK_WON
+        self.io.write(f"draw by {rule}")
+        return GameState.DRAW
+
     def _count_player_eras(self, player: 'PlayerStrategy') -> int:
         """Count number of eras containing player's pieces"""
-        count = 0
-        for era in [self.board.past, self.board.present, self.board.future]:
-            # Only count pieces that belong to this player
-            player_pieces = [p for p in era.getPieces(player) 
-                            if p.owner == player._color 
-                            and p not in player._deactivated_pieces]
-            if len(player_pieces) > 0:
-                count += 1
-        return count
+        return self.score_model.player_score(player).eras
 
     def _display_scores(self, player, color: str):
         """Display scores for a player"""
-        # Count number of eras with pieces
-        eras = self._count_player_eras(player)
-        
-        # Count active pieces
-        pieces = len(player._pieces)
-        
-        # Determine valid supply piece IDs based on player color
-        valid_ids = ("4","5","6","7") if player._color == "b_player" else ("D","E","F","G")
-        
-        # Calculate available supply pieces (not activated or deactivated)
-        available_supply = [p for p in player._supply
-                           if p.id in valid_ids 
-                           and p not in player._activated_pieces
-                           and p not in player._deactivated_pieces]
-        supply = len(available_supply)
-        
-        # Count pieces in focused era (current era)
-        pieces_in_focus = len([p for p in player.current_era.getPieces(player)
-                              if p.owner == player._color])  # Verify ownership
-        
-        # Calculate advantage using HeuristicAIPlayer's evaluation
-        advantage = HeuristicAIPlayer._evaluate_piece_advantage(self.board, player)
-        
-        # Calculate centrality
-        centrality = HeuristicAIPlayer._evaluate_centrality(self.board, player)
-        
-        # Display the scores
-        print(f"{color}'s score: {eras} eras, {advantage} advantage, {supply} supply, "
-              f"{centrality} centrality, {pieces_in_focus} in focus")
+        self.io.write(self._format_scores(player, color))
+
+    def _format_scores(self, player, color: str) -> str:
+        """Format the score line for a player from the cached score model"""
+        score = self.score_model.player_score(player)
+        return (f"{color}'s score: {score.eras} eras, {score.advantage} advantage, {score.supply} supply, "
+                f"{score.centrality} centrality, {score.focus} in focus")
 
 
 
 def validate_and_get_args(argv):
-    if len(argv) > 5:
+    if len(argv) > 9:
         raise ValueError(f"Invalid number of arguments")
     
     defaults = {
@@ -397,9 +440,13 @@ def validate_and_get_args(argv):
         "black_type": "human",
         "undo_redo": "off",
         "score": "off",
+        "display": "on",
+        "seed": None,
+        "workers": "1",
+        "log": None,
     }
 
-    valid_player_types = {"human", "heuristic", "random"}
+    valid_player_types = {"human", "heuristic", "random", "search", "ntuple"}
     valid_redo_undo_options = {"on", "off"}
     
     # Assign defaults or override with provided values
@@ -407,28 +454,51 @@ def validate_and_get_args(argv):
     black_type = argv[2] if len(argv) > 2 else defaults["black_type"]
     undo_redo = argv[3] if len(argv) > 3 else defaults["undo_redo"]
     score = argv[4] if len(argv) > 4 else defaults["score"]
+    display = argv[5] if len(argv) > 5 else defaults["display"]
+    seed = argv[6] if len(argv) > 6 else defaults["seed"]
+    workers = argv[7] if len(argv) > 7 else defaults["workers"]
+    log = argv[8] if len(argv) > 8 and argv[8] != "off" else defaults["log"]
     
     # Validate inputs
     if white_type not in valid_player_types:
-        raise ValueError(f"Invalid white player type '{white_type}'. Must be 'human', 'heuristic', or 'random'.")
+        raise ValueError(f"Invalid white player type '{white_type}'. Must be 'human', 'heuristic', 'random', 'search' or 'ntuple'.")
     if black_type not in valid_player_types:
-        raise ValueError(f"Invalid black player type '{black_type}'. Must be 'human', 'heuristic', or 'random'.")
+        raise ValueError(f"Invalid black player type '{black_type}'. Must be 'human', 'heuristic', 'random', 'search' or 'ntuple'.")
     if undo_redo not in valid_redo_undo_options:
         raise ValueError(f"Invalid undo/redo option '{undo_redo}'. Must be 'on' or 'off'.")
     if score not in valid_redo_undo_options:
         raise ValueError(f"Invalid score option '{score}'. Must be 'on' or 'off'.")
+    if display not in valid_redo_undo_options:
+        raise ValueError(f"Invalid display option '{display}'. Must be 'on' or 'off'.")
+    if seed is not None:
+        if seed == "random":
+            seed = None
+        elif not seed.isdigit():
+            raise ValueError(f"Invalid seed '{seed}'. Must be a non-negative integer or 'random'.")
+        else:
+            seed = int(seed)
+    if not workers.isdigit() or int(workers) < 1:
+        raise ValueError(f"Invalid worker count '{workers}'. Must be a positive integer.")
     
-    return white_type, black_type, undo_redo, score
+    return white_type, black_type, undo_redo, score, display, seed, int(workers), log
 
 
 if __name__ == "__main__":
     argv = sys.argv
     
     try:
-        white_type, black_type, undo_redo, score = validate_and_get_args(argv)
+        white_type, black_type, undo_redo, score, display, seed, workers, log = validate_and_get_args(argv)
         
         # Start the game with the parsed or default arguments
-        Game(white_type=white_type, black_type=black_type, undo_redo=undo_redo, score=score).run()
+        events = JsonlSink(log) if log else None
+        game = Game(white_type=white_type, black_type=black_type, undo_redo=undo_redo, score=score,
+                    display=display, seed=seed, workers=workers, events=events)
+        try:
+            game.run()
+        finally:
+            game.w_player.close()
+            game.b_player.close()
+            game.events.close()
     except ValueError as error:
         print(f"Error: {error}")
 
@@ -1,53 +1,99 @@
 from position import Position
+from adjudication import Adjudicator
+from collections import namedtuple
 from copy import deepcopy
 import copy
 
+# Moves between full checkpoints of the history, and the most checkpoints kept
+CHECKPOINT_INTERVAL = 16
+MAX_CHECKPOINTS = 32
+
+
+class Snapshot:
+    """The parts of a Game that undo and redo restore"""
+    __slots__ = ("board", "w_player", "b_player", "current_player", "turn_number", "state",
+                 "adjudicator", "adjudication")
+
+    def __init__(self, board, w_player, b_player, current_player, turn_number, state, adjudicator, adjudication):
+        self.board = board
+        self.w_player = w_player
+        self.b_player = b_player
+        self.current_player = current_player
+        self.turn_number = turn_number
+        self.state = state
+        self.adjudicator = adjudicator
+        self.adjudication = adjudication
+
+    def copy(self) -> 'Snapshot':
+        """A deep copy in which the board, players and eras still refer to each other"""
+        board, w_player, b_player, current_player, adjudicator = copy.deepcopy(
+            (self.board, self.w_player, self.b_player, self.current_player, self.adjudicator))
+        return Snapshot(board, w_player, b_player, current_player, self.turn_number, self.state,
+                        adjudicator, self.adjudication)
+
+
+class Delta(namedtuple("Delta", "piece directions era next_player turn_number state adjudication records position")):
+    """
+    One move of the history and the game fields it left behind:
+    piece: id of the moved piece, None for an era switch
+    directions: the directions as a string
+    era: name of the era the mover focused on next
+    records: positions recorded by the adjudicator after the move
+    position: adjudicator key of the position after the move
+    """
+    __slots__ = ()
+
+
 class Originator:
     """Manages the game state that needs to be saved and restored"""
     def __init__(self, game):
         self._state = game
     
-    def save(self):
-        """Creates a memento containing a deep copy of current state"""
-        game_copy = type(self._state)()
-        
-        # Deep copy the board first
-        game_copy.board = copy.deepcopy(self._state.board)
-        
-        # Deep copy players and their states
-        game_copy.w_player = copy.deepcopy(self._state.w_player)
-        game_copy.b_player = copy.deepcopy(self._state.b_player)
-        
-        # Ensure all piece references are properly maintained
-        for player in [game_copy.w_player, game_copy.b_player]:
-            # Fix supply pieces
-            for piece in player._supply:
-                piece.owner = player._color
-            
-            # Fix active pieces
-            for piece in player._pieces:
-                piece.owner = player._color
-            
-            # Ensure supply tracking is preserved
-            player._activated_pieces = copy.deepcopy(player._activated_pieces)
-            player._supply = copy.deepcopy(player._supply)
-            player._pieces = copy.deepcopy(player._pieces)
-        
-        # Copy other game state
-        game_copy.current_player = game_copy.w_player if self._state.current_player == self._state.w_player else game_copy.b_player
-        game_copy.turn_number = self._state.turn_number
-        game_copy.state = self._state.state
-        
-        # Make sure the current_era references point to the new board's eras
-        game_copy.w_player.current_era = game_copy.board.past if self._state.w_player.current_era == self._state.board.past else \
-                                        game_copy.board.present if self._state.w_player.current_era == self._state.board.present else \
-                                        game_copy.board.future
-        
-        game_copy.b_player.current_era = game_copy.board.past if self._state.b_player.current_era == self._state.board.past else \
-                                        game_copy.board.present if self._state.b_player.current_era == self._state.board.present else \
-                                        game_copy.board.future
-        
-        return Memento(game_copy)
+    def save(self, positions: bool = True):
+        """
+        Creates a memento containing a deep copy of current state; without
+        positions the adjudicator's position counts are left out
+        """
+        game = self._state
+        adjudicator = game.adjudicator if positions else game.adjudicator.without_positions()
+        # The board refers to both players, so one copy keeps every reference inside the snapshot
+        board, w_player, b_player, adjudicator = copy.deepcopy(
+            (game.board, game.w_player, game.b_player, adjudicator))
+        board.w_player = w_player
+        board.b_player = b_player
+        current_player = w_player if game.current_player._color == "w_player" else b_player
+        board.current_player = current_player
+        return Memento(Snapshot(board, w_player, b_player, current_player, game.turn_number, game.state,
+                                adjudicator, game.adjudication))
+
+    def delta(self, move) -> Delta:
+        """Records the move just played and the game fields it changed"""
+        game = self._state
+        return Delta(move.piece.id if move.piece else None, "".join(move.directions) if move.piece else "",
+                     move.next_era.name, move.next_player, game.turn_number, game.state,
+                     game.adjudication, game.adjudicator.moves, Adjudicator.position_key(game.board))
+
+    def replay(self, memento, deltas):
+        """Rebuilds the state reached by playing deltas from the state in memento"""
+        snapshot = memento.get_state().copy()
+        board = snapshot.board
+        for delta in deltas:
+            player = board.current_player
+            piece = None
+            if delta.piece is not None:
+                piece = next(piece for piece in player.current_era.getPieces(player) if piece.id == delta.piece)
+            if not board.makeMove(Move(piece, list(delta.directions), board._getEraByName(delta.era),
+                                       delta.next_player)):
+                raise ValueError(f"Invalid history: move {delta} cannot be replayed.")
+            if snapshot.adjudicator.moves < delta.records:
+                snapshot.adjudicator.record(board)
+        if deltas:
+            last = deltas[-1]
+            snapshot.current_player = board.current_player
+            snapshot.turn_number = last.turn_number
+            snapshot.state = last.state
+            snapshot.adjudication = last.adjudication
+        return Memento(snapshot)
     
     def restore(self, memento):
         """Restores state from a memento"""
@@ -63,21 +109,80 @@ class Memento:
         return self._state
 
 class Caretaker:
-    """Manages the history of game states"""
-    def __init__(self, originator):
-        self._mementos = []
+    """
+    Manages the history of game states.
+
+    A full checkpoint is kept every interval moves and only the moves in
+    between, so a turn is rebuilt by replaying the moves since the checkpoint
+    before it. Beyond max_checkpoints the older checkpoints are thinned where
+    they lie closest together, keeping the newest half at the interval: turns
+    near the head replay at most interval moves, older ones roughly
+    4 * moves / max_checkpoints. The adjudicator's position counts are rebuilt
+    from the position keys of the moves rather than copied into checkpoints.
+    """
+    def __init__(self, originator, interval: int = CHECKPOINT_INTERVAL, max_checkpoints: int = MAX_CHECKPOINTS):
+        if interval < 1:
+            raise ValueError(f"Invalid checkpoint interval {interval}. Must be at least 1.")
+        if max_checkpoints < 2:
+            raise ValueError(f"Invalid checkpoint limit {max_checkpoints}. Must be at least 2.")
         self._originator = originator
+        self.interval = interval
+        self.max_checkpoints = max_checkpoints
+        # The move that led to each turn, None where the history starts
+        self._deltas = []
+        # Mementos by index into _deltas; only those where the history starts hold position counts
+        self._checkpoints = {}
         self._head = -1
     
-    def save(self):
-        """Saves current state and updates history"""
+    def save(self, move=None):
+        """Saves current state and updates history; without the move played, as a checkpoint"""
         # Truncate any future states when saving after an undo
-        if self._head < len(self._mementos) - 1:
-            self._mementos = self._mementos[:self._head + 1]
+        del self._deltas[self._head + 1:]
+        for index in [index for index in self._checkpoints if index > self._head]:
+            del self._checkpoints[index]
         
-        # Save new state
-        self._mementos.append(self._originator.save())
         self._head += 1
+        if move is None or not self._deltas:
+            self._deltas.append(None)
+            self._checkpoints[self._head] = self._originator.save()
+            return
+        self._deltas.append(self._originator.delta(move))
+        if self._head % self.interval == 0:
+            self._checkpoints[self._head] = self._originator.save(positions=False)
+            while len(self._checkpoints) > self.max_checkpoints and self._thin():
+                pass
+
+    def _thin(self) -> bool:
+        """Drop the old checkpoint whose neighbours lie closest together; False if none can go"""
+        indices = sorted(self._checkpoints)
+        old = len(indices) - self.max_checkpoints // 2
+        # Where the history starts nothing can be replayed up to the checkpoint
+        candidates = [i for i in range(1, old) if self._deltas[indices[i]] is not None]
+        if not candidates:
+            return False
+        drop = min(candidates, key=lambda i: indices[i + 1] - indices[i - 1])
+        del self._checkpoints[indices[drop]]
+        return True
+
+    def _memento(self, index: int):
+        """The state at index, replayed from the nearest checkpoint before it"""
+        start = max(checkpoint for checkpoint in self._checkpoints if checkpoint <= index)
+        memento = self._originator.replay(self._checkpoints[start], self._deltas[start + 1:index + 1])
+        memento.get_state().adjudicator.positions = self._positions(index)
+        return memento
+
+    def _positions(self, index: int) -> dict:
+        """The adjudicator's position counts at index: those where the history starts plus the moves since"""
+        base = max(checkpoint for checkpoint in self._checkpoints
+                   if checkpoint <= index and self._deltas[checkpoint] is None)
+        adjudicator = self._checkpoints[base].get_state().adjudicator
+        positions = dict(adjudicator.positions)
+        records = adjudicator.moves
+        for delta in self._deltas[base + 1:index + 1]:
+            if delta.records > records:
+                positions[delta.position] = positions.get(delta.position, 0) + 1
+                records = delta.records
+        return positions
     
     def undo(self):
         """Restores previous state"""
@@ -85,22 +190,15 @@ class Caretaker:
             return None
         
         self._head -= 1
-        return self._mementos[self._head].get_state()
+        return self._memento(self._head).get_state()
     
     def redo(self):
         """Restores next state"""
-        if self._head >= len(self._mementos) - 1:
+        if self._head >= len(self._deltas) - 1:
             return None
         
         self._head += 1
-        return self._mementos[self._head].get_state()
-    
-    def next(self):
-        """Prepares for next move by ensuring we're at latest state"""
-        self._mementos = self._mementos[:self._head + 1]
-        memento = copy.deepcopy(self._mementos[-1])
-        self._originator.restore(memento)
-        return memento.get_state()
+        return self._memento(self._head).get_state()
 
 class Move:
     def __init__(self, piece, directions, next_era, next_player):
@@ -114,45 +212,25 @@ class Move:
         Execute the move on the board
         Returns True if successful, False otherwise
         """
+        if board._copy_on_write:
+            # The board shares eras with a clone, change private copies instead
+            move = board._prepare_move(self)
+            return move._execute(board)
+        return self._execute(board)
+
+    def _execute(self, board: 'Board') -> bool:
         # Handle special case of era-change-only move
         if self.piece is None:
             board.current_player.current_era = self.next_era
             board.current_player = board.b_player if self.next_player == "b_player" else board.w_player
             return True
 
-        current_pos = self.piece.position
-        current_era = current_pos._era
-
         # Execute each direction
+        current_pos = self.piece.position
         for direction in self.directions:
-            new_pos = self._move_get_new_position(current_pos, direction, board)
-            if new_pos is None:
+            current_pos = self._step(board, current_pos, direction)
+            if current_pos is None:
                 return False
-                
-            # Move the piece
-            if direction in ['f', 'b']:
-                # Clear piece from current position in old era
-                current_era.grid[current_pos._y][current_pos._x].clearPiece()
-                
-                # If moving backward in time and player has supply, spawn a new piece
-                if direction == 'b' and board.current_player._supply:
-                    # Get the first piece from supply
-                    supply_piece = board.current_player._supply[0]
-                    activated_piece = board.current_player.activate_piece(supply_piece.id)
-                    if activated_piece:
-                        # Place the new piece in the original position
-                        current_era.grid[current_pos._y][current_pos._x].setPiece(activated_piece)
-                
-                # Set piece in new position in new era
-                new_pos._era.grid[new_pos._y][new_pos._x].setPiece(self.piece)
-            else:
-                success = current_era.movePiece(current_pos, new_pos)
-                if not success:
-                    return False
-            
-            # Update for next direction
-            current_pos = new_pos
-            current_era = new_pos._era
 
         # Update board focus for next turn
         board.current_player.current_era = self.next_era
@@ -160,6 +238,37 @@ class Move:
         
         return True
 
+    def _step(self, board: 'Board', current_pos: 'Position', direction: str):
+        """Move the piece one direction from current_pos, returning its new position or None on failure"""
+        current_era = current_pos._era
+        new_pos = self._move_get_new_position(current_pos, direction, board)
+        if new_pos is None:
+            return None
+            
+        # Move the piece
+        if direction in ['f', 'b']:
+            # Clear piece from current position in old era
+            current_era.grid[current_pos._y][current_pos._x].clearPiece()
+            
+            # If moving backward in time and player has supply, spawn a new piece
+            if direction == 'b' and board.current_player._supply:
+                # Get the first piece from supply
+                supply_piece = board.current_player._supply[0]
+                activated_piece = board.current_player.activate_piece(supply_piece.id)
+                if activated_piece:
+                    # Place the new piece in the original position
+                    current_era.grid[current_pos._y][current_pos._x].setPiece(activated_piece)
+                    if board.listeners:
+                        board._notify("supply_activated", piece=activated_piece.id, era=current_era.name)
+            
+            # Set piece in new position in new era
+            new_pos._era.grid[new_pos._y][new_pos._x].setPiece(self.piece)
+        else:
+            success = current_era.movePiece(current_pos, new_pos)
+            if not success:
+                return None
+        return new_pos
+
     def _move_get_new_position(self, current_pos: 'Position', direction: str, board: 'Board'):
         """Calculate new position after a move in given direction"""
         result = board._get_new_position(current_pos._x, current_pos._y, direction, current_pos._era)
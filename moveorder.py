@@ -0,0 +1,102 @@
+"""Move ordering for AI search: cheap static scores plus killer and history tables."""
+
+# Ordering bonuses, largest first; history scores are capped below KILLER
+CAPTURE = 1_000_000
+SPAWN = 100_000
+KILLER = 10_000
+
+
+def move_key(move) -> tuple:
+    """Identify a move independently of the board object it was generated on"""
+    piece_id = move.piece.id if move.piece else None
+    era_name = move.next_era.name if move.next_era else None
+    return piece_id, tuple(move.directions), era_name
+
+
+class MoveOrderer:
+    """
+    Orders candidate moves before they are evaluated:
+    pushes that knock a piece off the board, then era changes that spawn a
+    supply piece, then killer moves, then moves ranked by the history table.
+    """
+    def __init__(self, max_ply: int = 32, killers_per_ply: int = 2):
+        self._killers = [[] for _ in range(max_ply)]
+        self._killers_per_ply = killers_per_ply
+        self._history = {}
+
+    def order(self, board: 'Board', moves: list, ply: int = 0) -> list:
+        """Return the moves sorted from most to least promising"""
+        return sorted(moves, key=lambda move: self.score(board, move, ply), reverse=True)
+
+    def score(self, board: 'Board', move, ply: int = 0) -> int:
+        """Score a move without executing it"""
+        key = move_key(move)
+        captures, spawns = self._static_features(board, move)
+        score = CAPTURE * captures
+        if spawns:
+            score += SPAWN
+        if ply < len(self._killers) and key in self._killers[ply]:
+            score += KILLER
+        return score + min(self._history.get(key, 0), KILLER - 1)
+
+    def record_cutoff(self, move, ply: int, depth: int):
+        """Remember a move that caused a beta cutoff (or was best at the root)"""
+        key = move_key(move)
+        if ply < len(self._killers):
+            killers = self._killers[ply]
+            if key in killers:
+                killers.remove(key)
+            killers.insert(0, key)
+            del killers[self._killers_per_ply:]
+        self._history[key] = self._history.get(key, 0) + depth * depth
+
+    def new_search(self):
+        """Forget killers and age the history table before searching a new position"""
+        for killers in self._killers:
+            killers.clear()
+        self._history = {key: value // 2 for key, value in self._history.items() if value > 1}
+
+    @staticmethod
+    def _static_features(board: 'Board', move) -> tuple:
+        """
+        Walk the move's path on the current grid and return
+        (pieces pushed off the board, whether a supply piece is spawned).
+        The second step is judged against the grid before the first step, which
+        is close enough for ordering.
+        """
+        if not move.piece:
+            return 0, False
+
+        owner = move.piece.owner
+        player = board.w_player if owner == "w_player" else board.b_player
+        supply = len(player._supply) if player else 0
+        x, y, era = move.piece.position._x, move.piece.position._y, move.piece.position._era
+        captures = 0
+        spawns = False
+        offsets = {'n': (0, -1), 's': (0, 1), 'e': (1, 0), 'w': (-1, 0)}
+
+        for direction in move.directions:
+            if direction in offsets:
+                dx, dy = offsets[direction]
+                nx, ny = x + dx, y + dy
+                if not (0 <= nx < 4 and 0 <= ny < 4):
+                    break
+                target = era.grid[ny][nx].piece
+                if target is not None and target.owner != owner:
+                    # Follow the chain; it falls off if it reaches the edge
+                    cx, cy = nx, ny
+                    while 0 <= cx < 4 and 0 <= cy < 4 and era.grid[cy][cx].piece is not None:
+                        cx, cy = cx + dx, cy + dy
+                    if not (0 <= cx < 4 and 0 <= cy < 4):
+                        captures += 1
+                x, y = nx, ny
+            else:
+                new_era = board._get_new_era(era, direction)
+                if new_era is None:
+                    break
+                if direction == 'b' and supply:
+                    spawns = True
+                    supply -= 1
+                era = new_era
+
+        return captures, spawns
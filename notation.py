@@ -0,0 +1,133 @@
+"""
+Text and binary notations for positions, both round-tripping through Board.to_state().
+
+The text form, in the spirit of chess FEN, has nine space-separated fields:
+
+    1.../..../..../...A 2.../..../..../...B 3.../..../..../...C DEFG 4567 - 0 2 w
+
+the past, present and future eras (rows top to bottom separated by '/', one
+character per space, '.' for empty), white's supply, black's supply, the
+deactivated pieces ('-' when a list is empty), white's and black's focus era
+(0 past, 1 present, 2 future) and the colour to move (w or b).
+
+The packed form is 29 bytes: 48 four-bit cells, the supplies and the
+deactivated pieces as 14-bit masks, and one byte holding both focus eras and
+the colour to move. Supplies are stored as sets; a supply is always the last
+of its player's spare pieces in order, so they unpack as they were.
+"""
+
+ERA_NAMES = ("past", "present", "future")
+# Cell codes: 0 is an empty space, then black pieces 1-7 and white pieces A-G
+PIECE_IDS = ".1234567ABCDEFG"
+# The pieces each player starts with in supply, in the order they come into play
+SPARE_IDS = {"w_player": "DEFG", "b_player": "4567"}
+PACKED_SIZE = 29
+
+
+def state_to_fen(state: tuple) -> str:
+    """Format a Board.to_state() tuple as text"""
+    cells, w_supply, b_supply, deactivated, w_era, b_era, to_move = state
+    eras = ["/".join(cells[era * 16 + row * 4:era * 16 + row * 4 + 4] for row in range(4))
+            for era in range(3)]
+    return " ".join(eras + [w_supply or "-", b_supply or "-", deactivated or "-",
+                            str(ERA_NAMES.index(w_era)), str(ERA_NAMES.index(b_era)),
+                            "w" if to_move == "w_player" else "b"])
+
+
+def fen_to_state(fen: str) -> tuple:
+    """Parse text notation into a Board.to_state() tuple"""
+    fields = fen.split()
+    if len(fields) != 9:
+        raise ValueError(f"Invalid position '{fen}'. Expected 9 fields, got {len(fields)}.")
+
+    cells = ""
+    for era in fields[:3]:
+        rows = era.split("/")
+        if len(rows) != 4 or any(len(row) != 4 for row in rows):
+            raise ValueError(f"Invalid era '{era}'. Must be 4 rows of 4 spaces.")
+        cells += "".join(rows)
+    w_supply, b_supply, deactivated = (field if field != "-" else "" for field in fields[3:6])
+    if fields[6] not in ("0", "1", "2") or fields[7] not in ("0", "1", "2"):
+        raise ValueError(f"Invalid focus eras '{fields[6]} {fields[7]}'. Must be 0, 1 or 2.")
+    if fields[8] not in ("w", "b"):
+        raise ValueError(f"Invalid colour to move '{fields[8]}'. Must be 'w' or 'b'.")
+
+    state = (cells, w_supply, b_supply, deactivated,
+             ERA_NAMES[int(fields[6])], ERA_NAMES[int(fields[7])],
+             "w_player" if fields[8] == "w" else "b_player")
+    _check_pieces(state)
+    return state
+
+
+def state_to_bytes(state: tuple) -> bytes:
+    """Pack a Board.to_state() tuple into PACKED_SIZE bytes"""
+    cells, w_supply, b_supply, deactivated, w_era, b_era, to_move = state
+    codes = [PIECE_IDS.index(piece_id) for piece_id in cells]
+    packed = bytearray(codes[i] << 4 | codes[i + 1] for i in range(0, 48, 2))
+    packed += _mask(w_supply + b_supply).to_bytes(2, "big")
+    packed += _mask(deactivated).to_bytes(2, "big")
+    packed.append(ERA_NAMES.index(w_era) | ERA_NAMES.index(b_era) << 2
+                  | (1 if to_move == "b_player" else 0) << 4)
+    return bytes(packed)
+
+
+def bytes_to_state(data: bytes) -> tuple:
+    """Unpack bytes made by state_to_bytes into a Board.to_state() tuple"""
+    if len(data) != PACKED_SIZE:
+        raise ValueError(f"Invalid packed position. Expected {PACKED_SIZE} bytes, got {len(data)}.")
+    if any(byte >> 4 >= len(PIECE_IDS) or byte & 0xF >= len(PIECE_IDS) for byte in data[:24]):
+        raise ValueError(f"Invalid packed position. Cell codes must be below {len(PIECE_IDS)}.")
+    cells = "".join(PIECE_IDS[byte >> 4] + PIECE_IDS[byte & 0xF] for byte in data[:24])
+    supply = _unmask(int.from_bytes(data[24:26], "big"))
+    deactivated = _unmask(int.from_bytes(data[26:28], "big"))
+    flags = data[28]
+    if flags & 3 > 2 or flags >> 2 & 3 > 2:
+        raise ValueError("Invalid packed position. Focus era out of range.")
+    if flags >> 5:
+        raise ValueError("Invalid packed position. Unused flag bits are set.")
+    state = (cells,
+             "".join(piece_id for piece_id in supply if piece_id.isalpha()),
+             "".join(piece_id for piece_id in supply if piece_id.isdigit()),
+             deactivated,
+             ERA_NAMES[flags & 3], ERA_NAMES[flags >> 2 & 3],
+             "b_player" if flags >> 4 & 1 else "w_player")
+    _check_pieces(state)
+    return state
+
+
+def _mask(piece_ids: str) -> int:
+    mask = 0
+    for piece_id in piece_ids:
+        mask |= 1 << (PIECE_IDS.index(piece_id) - 1)
+    return mask
+
+
+def _unmask(mask: int) -> str:
+    if mask >> 14:
+        raise ValueError("Invalid packed position. Piece mask has unused bits set.")
+    return "".join(PIECE_IDS[bit + 1] for bit in range(14) if mask >> bit & 1)
+
+
+def _check_pieces(state: tuple):
+    """
+    Reject unknown ids, supplies no game can leave behind, pieces in more
+    than one place and a board without pieces
+    """
+    cells, w_supply, b_supply, deactivated = state[:4]
+    for piece_id in cells:
+        if piece_id not in PIECE_IDS:
+            raise ValueError(f"Invalid piece '{piece_id}'.")
+    for piece_id in w_supply + b_supply + deactivated:
+        if piece_id not in PIECE_IDS[1:]:
+            raise ValueError(f"Invalid piece '{piece_id}'.")
+    if any(not piece_id.isalpha() for piece_id in w_supply) or \
+            any(not piece_id.isdigit() for piece_id in b_supply):
+        raise ValueError("Invalid supply. White's supply holds letters, black's holds digits.")
+    for supply, spares in ((w_supply, SPARE_IDS["w_player"]), (b_supply, SPARE_IDS["b_player"])):
+        if spares[len(spares) - len(supply):] != supply:
+            raise ValueError(f"Invalid supply '{supply}'. Must be the last of '{spares}', in order.")
+    placed = [piece_id for piece_id in cells + w_supply + b_supply + deactivated if piece_id != "."]
+    if len(placed) != len(set(placed)):
+        raise ValueError("Invalid position. A piece appears more than once.")
+    if cells.count(".") == len(cells):
+        raise ValueError("Invalid position. The board holds no pieces.")
@@ -0,0 +1,238 @@
+"""
+N-tuple (pattern table) position evaluation, trained by TD learning from self-play.
+
+Each n-tuple is a fixed group of cells; the contents of its cells (empty,
+white or black) index a small table of weights. The tuples are the rows,
+columns and 2x2 squares of every era and, across the eras, the three cells
+of every square. Two more tables score the supply sizes and the focus eras.
+The value of a position is the sum of one weight per table, from white's point
+of view, and is read straight off a Board.to_state() tuple. Features are
+updated incrementally as pieces move: a player evaluating the positions after
+its moves computes the root's table indices once and, for each child, only
+recomputes the tuples with a cell that changed (features_after), about ten of
+the 67 for a typical move.
+
+All weights live in one flat array('f'), saved to and loaded from a small
+binary file:
+
+    python ntuple.py --games 5000 --out ntuple.bin
+"""
+import os
+from array import array
+
+_MAGIC = b"NTUP1"
+
+# Cell contents in to_state() strings: empty, white or black
+_CODES = {".": 0}
+_CODES.update(dict.fromkeys("ABCDEFG", 1))
+_CODES.update(dict.fromkeys("1234567", 2))
+_ERAS = {"past": 0, "present": 1, "future": 2}
+_SUPPLY = 5  # 0 to 4 pieces
+
+# Table next to this module, used by players that are not given one
+DEFAULT_TABLES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ntuple.bin")
+
+
+def _cell(era: int, x: int, y: int) -> int:
+    return era * 16 + y * 4 + x
+
+
+def _build_tuples() -> tuple:
+    """Cell indices of every n-tuple, as laid out in to_state() cells"""
+    tuples = []
+    for era in range(3):
+        tuples.extend(tuple(_cell(era, x, y) for x in range(4)) for y in range(4))
+        tuples.extend(tuple(_cell(era, x, y) for y in range(4)) for x in range(4))
+        tuples.extend((_cell(era, x, y), _cell(era, x + 1, y), _cell(era, x, y + 1), _cell(era, x + 1, y + 1))
+                      for y in range(3) for x in range(3))
+    tuples.extend(tuple(_cell(era, x, y) for era in range(3)) for y in range(4) for x in range(4))
+    return tuple(tuples)
+
+
+_TUPLES = _build_tuples()
+# Where each tuple's table starts in the weight array
+_OFFSETS = []
+_size = 0
+for _cells in _TUPLES:
+    _OFFSETS.append(_size)
+    _size += 3 ** len(_cells)
+_SUPPLY_OFFSET = _size
+_FOCUS_OFFSET = _SUPPLY_OFFSET + _SUPPLY * _SUPPLY
+SIZE = _FOCUS_OFFSET + 3 * 3 * 2
+_PATTERNS = tuple(zip(_OFFSETS, _TUPLES))
+# Positions in the feature list of the tuples containing each cell
+_CELL_TUPLES = tuple(tuple(number for number, cells in enumerate(_TUPLES) if cell in cells) for cell in range(48))
+del _size, _cells
+
+
+class NTupleNetwork:
+    """The weight tables and the TD(0) update rule"""
+    def __init__(self, weights: array = None):
+        if weights is None:
+            weights = array("f", bytes(4 * SIZE))
+        if len(weights) != SIZE:
+            raise ValueError(f"Invalid weight count {len(weights)}. Must be {SIZE}.")
+        self.weights = weights
+
+    @staticmethod
+    def features(state: tuple) -> list:
+        """Weight index of every table for a to_state() tuple"""
+        cells, w_supply, b_supply, _, w_era, b_era, to_move = state
+        codes = [_CODES[cell] for cell in cells]
+        indices = []
+        for offset, pattern in _PATTERNS:
+            index = 0
+            for cell in pattern:
+                index = index * 3 + codes[cell]
+            indices.append(offset + index)
+        indices.append(_SUPPLY_OFFSET + len(w_supply) * _SUPPLY + len(b_supply))
+        indices.append(_FOCUS_OFFSET + (_ERAS[w_era] * 3 + _ERAS[b_era]) * 2 + (to_move == "b_player"))
+        return indices
+
+    @staticmethod
+    def features_after(indices: list, previous: tuple, state: tuple) -> list:
+        """
+        features(state) derived from the indices of a previous state, recomputing
+        only the tuples with a cell that differs and the supply and focus tables
+        """
+        cells, w_supply, b_supply, _, w_era, b_era, to_move = state
+        old_cells = previous[0]
+        changed = set()
+        for cell, (old, new) in enumerate(zip(old_cells, cells)):
+            if old != new:
+                changed.update(_CELL_TUPLES[cell])
+        indices = list(indices)
+        for number in changed:
+            index = 0
+            for cell in _TUPLES[number]:
+                index = index * 3 + _CODES[cells[cell]]
+            indices[number] = _OFFSETS[number] + index
+        indices[-2] = _SUPPLY_OFFSET + len(w_supply) * _SUPPLY + len(b_supply)
+        indices[-1] = _FOCUS_OFFSET + (_ERAS[w_era] * 3 + _ERAS[b_era]) * 2 + (to_move == "b_player")
+        return indices
+
+    def value(self, state: tuple, indices: list = None) -> float:
+        """
+        Estimated outcome for white, between about -1 (black wins) and 1 (white wins);
+        indices are the state's features when already known
+        """
+        weights = self.weights
+        return sum(weights[index] for index in (indices if indices is not None else self.features(state)))
+
+    def evaluate(self, state: tuple, indices: list = None) -> float:
+        """The value of state, or exactly 1 or -1 once a side is down to one piece"""
+        cells = state[0]
+        # Board.outcome checks white first
+        if sum(_CODES[cell] == 1 for cell in cells) <= 1:
+            return -1.0
+        if sum(_CODES[cell] == 2 for cell in cells) <= 1:
+            return 1.0
+        return self.value(state, indices)
+
+    def update(self, state: tuple, target: float, alpha: float) -> float:
+        """Move the value of state towards target and return the error before the step"""
+        indices = self.features(state)
+        weights = self.weights
+        error = target - sum(weights[index] for index in indices)
+        step = alpha * error
+        for index in indices:
+            weights[index] += step
+        return error
+
+    def save(self, path: str):
+        with open(path, "wb") as tables:
+            tables.write(_MAGIC)
+            tables.write(self.weights.tobytes())
+
+    @classmethod
+    def load(cls, path: str) -> 'NTupleNetwork':
+        with open(path, "rb") as tables:
+            data = tables.read()
+        if not data.startswith(_MAGIC) or len(data) != len(_MAGIC) + 4 * SIZE:
+            raise ValueError(f"Invalid n-tuple table file '{path}'.")
+        weights = array("f")
+        weights.frombytes(data[len(_MAGIC):])
+        return cls(weights)
+
+
+# Networks already loaded in this process, by path
+_loaded = {}
+
+
+def load_network(path: str = None) -> NTupleNetwork:
+    """
+    The network stored at path (default DEFAULT_TABLES), loaded once per process,
+    or an untrained one when no path is given and the default file does not exist
+    """
+    if path is None:
+        if not os.path.exists(DEFAULT_TABLES):
+            return NTupleNetwork()
+        path = DEFAULT_TABLES
+    if path not in _loaded:
+        _loaded[path] = NTupleNetwork.load(path)
+    return _loaded[path]
+
+
+def _outcome(state) -> float:
+    from main import GameState
+    return {GameState.WHITE_WON: 1.0, GameState.BLACK_WON: -1.0}.get(state, 0.0)
+
+
+def train(network: NTupleNetwork, games: int, alpha: float = 0.002, epsilon: float = 0.1,
+          seed: int = 0, max_turns: int = None, log=None) -> NTupleNetwork:
+    """
+    TD(0) self-play: two NTupleAIPlayers sharing the network play each other,
+    exploring with probability epsilon, and after every move the value of the
+    previous position is moved towards the value of the new one, or towards
+    the result once the game is over.
+    """
+    from main import GameState
+    from simulate import play_game, DEFAULT_MAX_TURNS
+
+    options = {"network": network, "epsilon": epsilon}
+    for number in range(games):
+        previous = [None]
+
+        def learn(game, player, move, legal_moves, seconds, events):
+            state = game.board.to_state()
+            if previous[0] is not None:
+                over = game.state != GameState.PLAYING
+                target = _outcome(game.state) if over else network.value(state)
+                network.update(previous[0], target, alpha)
+            previous[0] = state
+
+        game = play_game("ntuple", "ntuple", seed + number, max_turns or DEFAULT_MAX_TURNS, observer=learn,
+                         white_options=options, black_options=options)
+        if game.state != GameState.PLAYING:
+            # The final position is worth exactly the result
+            network.update(previous[0], _outcome(game.state), alpha)
+        if log:
+            log(f"game {number + 1}: {game.state.value} after {game.turn_number - 1} moves")
+    return network
+
+
+def main(argv=None):
+    import argparse  # Only the command line needs it; players import this module
+
+    parser = argparse.ArgumentParser(description="Train the n-tuple evaluation by self-play")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--alpha", type=float, default=0.002, help="learning rate")
+    parser.add_argument("--epsilon", type=float, default=0.1, help="share of random exploring moves")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--start", help="table file to continue training from")
+    parser.add_argument("--out", default=DEFAULT_TABLES, help="table file to write")
+    args = parser.parse_args(argv)
+    if args.games < 0:
+        raise ValueError(f"Invalid game count {args.games}. Must be a non-negative integer.")
+
+    network = NTupleNetwork.load(args.start) if args.start else NTupleNetwork()
+    try:
+        train(network, args.games, args.alpha, args.epsilon, args.seed, log=lambda text: print(text, end="\r"))
+    finally:
+        print()
+        network.save(args.out)
+        print(f"tables written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,11 @@ from board import Board
 from movehistory import Move
 from position import Position
 from board import Piece
+from gameio import ConsoleIO
+from moveorder import MoveOrderer, move_key
+import copy
 import random
+from collections import namedtuple
 
 class PlayerFactory:
     """
@@ -11,13 +15,16 @@ class PlayerFactory:
     Supports different player types for each color
     """
     @staticmethod
-    def create_player(player_type, color, board):
+    def create_player(player_type, color, board, io=None, rng=None, **options):
         """
         Create a player strategy based on type and color
         
         Args:
             player_type (PlayerType): Type of player to create
             color (str): Color of the player (white/black)
+            io (IOProvider): Input/output provider, defaults to the console
+            rng (random.Random): Random stream owned by the player, defaults to an unseeded one
+            options: Extra settings for the player type, e.g. depth for "search"
         
         Returns:
             PlayerStrategy: Instantiated player strategy
@@ -25,21 +32,49 @@ class PlayerFactory:
         player_map = {
             "human": HumanPlayer,
             "random": RandomAIPlayer,
-            "heuristic": HeuristicAIPlayer
+            "heuristic": HeuristicAIPlayer,
+            "search": SearchAIPlayer,
+            "ntuple": NTupleAIPlayer
         }
         
         # Retrieve player class, defaulting to HumanPlayer
         player_class = player_map.get(player_type, HumanPlayer)
         
         # Create and return player instance
-        return player_class(color, board)
+        return player_class(color, board, io, rng, **options)
     
 
+class EvaluationWeights(namedtuple("EvaluationWeights", "era_presence advantage supply centrality focus",
+                                   defaults=(3, 2, 1, 1, 1))):
+    """
+    Multipliers of the HeuristicAIPlayer evaluation features:
+    era_presence: eras containing the player's pieces
+    advantage: player's pieces minus the opponent's
+    supply: pieces left in supply
+    centrality: pieces on the central spaces
+    focus: pieces in the next focused era
+    """
+    __slots__ = ()
+
+
 """ Strategy Pattern """
 
 class PlayerStrategy(ABC):
-    def __init__(self, color, board) -> None:
+    # Attributes shared by reference when the player is deep-copied along with a board
+    _shared_attributes = ("_io", "_rng")
+    # Attributes reset (name -> factory) when the player is pickled for another process
+    _transient_attributes = {}
+    # Attributes besides the random state that choosing a move on a pickled copy
+    # changes; the server copies them back to the session's player
+    _returned_attributes = ()
+
+    def __init__(self, color, board, io=None, rng=None) -> None:
         self._color = color
+        self._io = io if io is not None else ConsoleIO()
+        self._rng = rng if rng is not None else random.Random()
+        # timecontrol.Deadline for the move being chosen, set by the game; AI players
+        # check it while they work and settle for the best move so far once it passes
+        self.deadline = None
         self._activated_pieces = []  # Track pieces activated from supply
         self._deactivated_pieces = []  # Track pieces that were deactivated
         
@@ -93,7 +128,67 @@ class PlayerStrategy(ABC):
     def getMove(self, board: Board) -> Move:
         pass
 
+    def close(self):
+        """Release any background work; called when the player leaves the game"""
+        pass
+
+    def __deepcopy__(self, memo):
+        clone = copy.copy(self)
+        memo[id(self)] = clone
+        for name, value in self.__dict__.items():
+            if name not in self._shared_attributes:
+                setattr(clone, name, copy.deepcopy(value, memo))
+        return clone
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for name, factory in self._transient_attributes.items():
+            state[name] = factory()
+        return state
+
+def _score_root_moves(data: bytes, color: str, specs: list, weights: tuple) -> list:
+    """
+    Process pool entry point for HeuristicAIPlayer: rebuild the board from its
+    packed encoding and score each (piece id, directions) candidate.
+    Returns (score, next era name) per candidate, or None for moves that fail.
+    """
+    board = Board.from_bytes(data, "heuristic", "heuristic")
+    player = board.w_player if color == "w_player" else board.b_player
+    player.weights = EvaluationWeights(*weights)
+    next_player = "b_player" if color == "w_player" else "w_player"
+    results = []
+    for piece_id, directions in specs:
+        move = Move(board._find_piece(piece_id), list(directions), None, next_player)
+        result = player._score_move(board, move)
+        results.append(None if result is None else (result[0], result[1].name))
+    return results
+
+
 class HeuristicAIPlayer(PlayerStrategy):
+    """
+    Scores every candidate move with a weighted set of features; weights
+    (an EvaluationWeights or a sequence of five numbers) defaults to 3, 2, 1, 1, 1.
+    With workers > 1 the candidates are split across a process pool; each worker
+    gets the packed Board.to_bytes() encoding and results are merged in the
+    same order the serial loop uses, so the chosen move does not change.
+    """
+    _shared_attributes = PlayerStrategy._shared_attributes + ("_executor",)
+    _transient_attributes = {"_executor": lambda: None}
+    _returned_attributes = PlayerStrategy._returned_attributes + ("_orderer",)
+
+    def __init__(self, color, board, io=None, rng=None, workers=1, weights=None) -> None:
+        super().__init__(color, board, io, rng)
+        self.weights = EvaluationWeights(*weights) if weights is not None else EvaluationWeights()
+        self._orderer = MoveOrderer()
+        self.workers = workers
+        self._executor = None
+
+    def close(self):
+        """Shut down the worker processes"""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
     def getMove(self, board: 'Board') -> Move:
         """Get the best move based on heuristic evaluation"""
         valid_moves = board.getValidMoves(self)
@@ -127,7 +222,7 @@ class HeuristicAIPlayer(PlayerStrategy):
             
             # If we found an era where we can make moves, go there
             if best_era:
-                return Move(None, [], best_era, self._color)
+                return Move(None, [], best_era, "b_player" if self._color == "w_player" else "w_player")
             
             # If we can't make moves anywhere, choose based on piece presence
             eras_with_pieces = [era for era in [board.past, board.present, board.future]
@@ -139,75 +234,137 @@ class HeuristicAIPlayer(PlayerStrategy):
                 # If no pieces in other eras, choose present era
                 next_era = board.present if self.current_era != board.present else board.past
             
-            return Move(None, [], next_era, self._color)
+            return Move(None, [], next_era, "b_player" if self._color == "w_player" else "w_player")
         
-        # We have valid moves, evaluate each one
+        # We have valid moves, evaluate each one, most promising first
         best_move = None
         best_score = float('-inf')
+        best_order = None
+        ranked = sorted(((self._orderer.score(board, move), move) for move in valid_moves),
+                        key=lambda item: item[0], reverse=True)
         
-        for move in valid_moves:
-            # Ensure move has a next era selected
-            if move.next_era is None:
-                # Temporarily try each possible next era to find the best one
-                best_next_era = None
-                best_next_score = float('-inf')
-                
-                for possible_era in [board.past, board.present, board.future]:
-                    if possible_era != self.current_era:
-                        move.next_era = possible_era
-                        # Simulate move
-                        original_pos = move.piece.position if move.piece else None
-                        success = move.execute(board)
-                        
-                        if success:
-                            next_score = (
-                                3 * self._evaluate_era_presence(board) +
-                                2 * self._evaluate_piece_advantage(board, self) +
-                                1 * len(self._supply) +
-                                1 * self._evaluate_centrality(board, self) +
-                                1 * self._evaluate_focus(board, possible_era)
-                            )
-                            
-                            # Undo move simulation
-                            self._undo_move(board, move, original_pos)
-                            
-                            if next_score > best_next_score:
-                                best_next_score = next_score
-                                best_next_era = possible_era
-                
-                move.next_era = best_next_era
-            
-            # Now evaluate the complete move
-            original_pos = move.piece.position if move.piece else None
-            success = move.execute(board)
-            
-            if success:
-                era_presence = self._evaluate_era_presence(board)
-                
-                # Check for winning move
-                if self._count_opponent_eras(board) <= 1:
-                    score = 9999
-                else:
-                    score = (
-                        3 * era_presence +
-                        2 * self._evaluate_piece_advantage(board, self) +
-                        1 * len(self._supply) +
-                        1 * self._evaluate_centrality(board, self) +
-                        1 * self._evaluate_focus(board, move.next_era)
-                    )
-                
-                # Undo move simulation
-                self._undo_move(board, move, original_pos)
+        results = None
+        if self.workers > 1 and len(ranked) > 1:
+            results = self._score_moves_in_parallel(board, [move for _, move in ranked])
+        
+        for index, (order_score, move) in enumerate(ranked):
+            if results is not None:
+                result = results[index]
+            elif best_move is not None and self.deadline is not None and self.deadline.expired():
+                break  # Out of time: keep the best of the moves scored so far
+            else:
+                # Execute each move once; the focus era only changes the focus term,
+                # so the best one follows from the per-era piece counts afterwards
+                result = self._score_move(board, move)
+            if result is not None:
+                score, move.next_era = result
                 
-                # Update best move if score is higher
+                # Update best move if score is higher; ties go to the better-ordered
+                # move, and only moves the orderer cannot separate are decided randomly
                 if score > best_score:
                     best_score = score
                     best_move = move
-                elif score == best_score and random.random() < 0.5:
+                    best_order = order_score
+                elif score == best_score and order_score == best_order and self._rng.random() < 0.5:
                     best_move = move
         
+        if best_move is not None:
+            # Candidates are scored before their focus era is chosen, so remember the move without it
+            self._orderer.record_cutoff(Move(best_move.piece, best_move.directions, None, best_move.next_player), 0, 1)
         return best_move
 
+    def _score_moves_in_parallel(self, board: 'Board', moves: list) -> list:
+        """
+        Score moves across the process pool, returning results in the order of
+        moves. Under a deadline the moves go out in small chunks, no more at a
+        time than there are workers, and nothing new is queued once time is up:
+        a chunk already running cannot be cancelled, so at most one small chunk
+        per worker outlives the move.
+        """
+        if self._executor is None:
+            # Imported here so single-process games never load multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        
+        data = board.to_bytes()
+        count = self.workers * (4 if self.deadline is not None else 1)
+        chunks = [chunk for chunk in (list(range(start, len(moves), count)) for start in range(count)) if chunk]
+        results = [None] * len(moves)
+
+        def submit(chunk):
+            return self._executor.submit(_score_root_moves, data, self._color,
+                                         [(moves[i].piece.id, tuple(moves[i].directions)) for i in chunk],
+                                         tuple(self.weights))
+
+        def collect(chunk, future):
+            for index, result in zip(chunk, future.result()):
+                if result is not None:
+                    results[index] = (result[0], board._getEraByName(result[1]))
+
+        if self.deadline is None:
+            for chunk, future in [(chunk, submit(chunk)) for chunk in chunks]:
+                collect(chunk, future)
+            return results
+
+        from concurrent.futures import FIRST_COMPLETED, wait
+        from itertools import islice
+        queued = iter(chunks)
+        pending = {submit(chunk): chunk for chunk in islice(queued, self.workers)}
+        first_done = False
+        while pending:
+            done = wait(pending, timeout=max(0.0, self.deadline.remaining()), return_when=FIRST_COMPLETED).done
+            if not done:
+                break
+            for future in done:
+                chunk = pending.pop(future)
+                collect(chunk, future)
+                first_done = first_done or chunk is chunks[0]
+            if not self.deadline.expired():
+                for chunk in islice(queued, len(done)):
+                    pending[submit(chunk)] = chunk
+        for future in pending:
+            future.cancel()
+        if not first_done:
+            # The best-ordered move is scored here, so there is always something to play
+            results[0] = self._score_move(board, moves[0])
+        return results
+
+    def _score_move(self, board: 'Board', move: 'Move'):
+        """
+        Simulate a move without a chosen next era and return (score, best next era),
+        or None if the move fails. The board is restored before returning.
+        """
+        saved = board._save_state()
+        focus_eras = [era for era in [board.past, board.present, board.future] if era != self.current_era]
+        move.next_era = focus_eras[0]  # Placeholder, execute() needs an era to hand focus to
+        success = move.execute(board)
+        
+        result = None
+        if success:
+            weights = self.weights
+            # Pick the era with the best weighted focus term, first one on ties
+            best_era = focus_eras[0]
+            for era in focus_eras[1:]:
+                if weights.focus * self._evaluate_focus(board, era) > weights.focus * self._evaluate_focus(board, best_era):
+                    best_era = era
+            
+            # Check for winning move
+            if self._count_opponent_eras(board) <= 1:
+                score = 9999
+            else:
+                score = (
+                    weights.era_presence * self._evaluate_era_presence(board) +
+                    weights.advantage * self._evaluate_piece_advantage(board, self) +
+                    weights.supply * len(self._supply) +
+                    weights.centrality * self._evaluate_centrality(board, self) +
+                    weights.focus * self._evaluate_focus(board, best_era)
+                )
+            result = (score, best_era)
+        
+        # Undo move simulation
+        board._restore_state(saved)
+        return result
+
     def _display_scores(self, board):
         """Display unweighted scores for both players"""
         for player, color in [(board.w_player, "white"), (board.b_player, "black")]:
@@ -231,47 +388,28 @@ class HeuristicAIPlayer(PlayerStrategy):
     @staticmethod
     def _evaluate_piece_advantage(board: 'Board', player: 'PlayerStrategy') -> int:
         """Calculate piece advantage across all eras"""
-        advantage = 0
-        
         # Use color for comparison to determine opponent
         opponent = board.b_player if player._color == "w_player" else board.w_player
         
-        # Calculate advantage across all eras
-        for era in [board.past, board.present, board.future]:
-            # Get pieces for current player in this era
-            player_pieces = len([piece for piece in era.getPieces(player) if piece.owner == player._color])
-            
-            # Get pieces for opponent in this era
-            opponent_pieces = len([piece for piece in era.getPieces(opponent) if piece.owner == opponent._color])
-            
-            # Add difference to total advantage
-            advantage += player_pieces - opponent_pieces
-        
-        return advantage
+        # Read the totals the board keeps across all eras
+        return board.countPieces(player) - board.countPieces(opponent)
 
     @staticmethod
     def _evaluate_centrality(board: 'Board', player) -> int:
         """Evaluate how many pieces are in central positions"""
+        # Center positions (1,1), (1,2), (2,1), (2,2) are worth 1 point
         centrality = 0
         for era in [board.past, board.present, board.future]:
-            for piece in era.getPieces(player):
-                x, y = piece.position._x, piece.position._y
-                # Center positions (1,1), (1,2), (2,1), (2,2) are worth 1 point
-                if 0 < x < 3 and 0 < y < 3:
-                    centrality += 1
+            centrality += era.countCentral(player)
         return centrality
 
     def _evaluate_era_presence(self, board: 'Board') -> int:
         """Evaluate number of eras with pieces"""
-        eras_with_pieces = 0
-        for era in [board.past, board.present, board.future]:
-            if len(era.getPieces(self)) > 0:
-                eras_with_pieces += 1
-        return eras_with_pieces
+        return board.countEras(self)
 
     def _evaluate_focus(self, board: 'Board', next_era) -> int:
         """Evaluate pieces in focused era"""
-        return len(next_era.getPieces(self))
+        return next_era.countPieces(self)
 
     def _get_best_era(self, board: 'Board') -> 'Era':
         """Choose the best era to focus on next"""
@@ -284,7 +422,7 @@ class HeuristicAIPlayer(PlayerStrategy):
                 if pieces > best_score:
                     best_score = pieces
                     best_era = era
-                elif pieces == best_score and random.random() < 0.5:
+                elif pieces == best_score and self._rng.random() < 0.5:
                     best_era = era
         
         # If no better option found, default to an era different from current
@@ -298,25 +436,357 @@ class HeuristicAIPlayer(PlayerStrategy):
                 
         return best_era
 
-    def _undo_move(self, board: 'Board', move: 'Move', original_pos: 'Position'):
-        """Helper method to undo a simulated move"""
-        if move.piece:
-            # Restore piece to original position
-            current_pos = move.piece.position
-            current_era = current_pos._era
-            current_era.grid[current_pos._y][current_pos._x].clearPiece()
-            
-            original_era = original_pos._era
-            original_era.grid[original_pos._y][original_pos._x].setPiece(move.piece)
-
     def _count_opponent_eras(self, board):
         """Count number of eras containing opponent's pieces"""
         opponent = board.b_player if self == board.w_player else board.w_player
-        count = 0
-        for era in [board.past, board.present, board.future]:
-            if len(era.getPieces(opponent)) > 0:
-                count += 1
-        return count
+        return board.countEras(opponent)
+
+class SearchAborted(Exception):
+    """Raised inside a search that has been asked to stop"""
+    pass
+
+
+class _PonderTask:
+    """A background search of the position expected after the opponent's reply"""
+    def __init__(self, key, board, table):
+        self.key = key
+        self.board = board
+        self.table = table
+        self.orderer = MoveOrderer()
+        import threading  # Only pondering players need threads
+        self.stop = threading.Event()
+        self.result = None
+        self.thread = None
+
+
+class SearchAIPlayer(PlayerStrategy):
+    """
+    Depth-limited alpha-beta search over complete moves (copy, directions and
+    next era), using MoveOrderer so the strongest candidates are searched first
+    and a transposition table keyed on Board.to_state().
+    Positions are explored on copies, so the live board is never mutated.
+    Leaves are scored with the HeuristicAIPlayer features and weights.
+
+    With ponder=True the player keeps searching on the opponent's time: after
+    choosing a move it predicts the reply and searches the resulting position
+    in a background thread. If the prediction comes true the result and table
+    are reused, otherwise they are dropped.
+
+    Returning to a position the player already faced in the game is scored as a
+    draw, so the search steers out of cycles the adjudicator would end.
+    """
+    WIN_SCORE = 100000
+    DRAW_SCORE = 0
+    EXACT, LOWER, UPPER = 0, 1, 2
+    # Board copies made during search share the tables and the pondering state;
+    # threads cannot be pickled and the table is not worth shipping to another process
+    _shared_attributes = PlayerStrategy._shared_attributes + ("_table", "_orderer", "_ponder_task", "_history")
+    _transient_attributes = {"_ponder_task": lambda: None, "_table": dict}
+    _returned_attributes = PlayerStrategy._returned_attributes + ("_orderer",)
+
+    def __init__(self, color, board, io=None, rng=None, depth=2, ponder=False, table_size=200000,
+                 weights=None) -> None:
+        super().__init__(color, board, io, rng)
+        self.weights = EvaluationWeights(*weights) if weights is not None else EvaluationWeights()
+        self.depth = depth
+        self.ponder = ponder
+        self._table_size = table_size
+        self._table = {}
+        self._orderer = MoveOrderer()
+        self._ponder_task = None
+        self.ponder_hits = 0
+        # to_state() of every position this player has moved from
+        self._history = set()
+
+    def close(self):
+        """Stop any background search"""
+        task, self._ponder_task = self._ponder_task, None
+        if task is not None:
+            task.stop.set()
+            task.thread.join()
+
+    def remember(self, board: 'Board'):
+        """Count the position as one this player has moved from, a draw if the search returns to it"""
+        self._history.add(board.to_state())
+
+    def getMove(self, board: 'Board') -> Move:
+        """Search the position and return the best move for this player"""
+        # The search tree shares the root's eras, not the game board's
+        root = board.clone(private=True)
+        root.current_player = root.w_player if self._color == "w_player" else root.b_player
+
+        move = self._collect_ponder(root)
+        self.remember(root)
+        if move is None:
+            self._orderer.new_search()
+            if self.deadline is None:
+                move = self._search(root, self._table, self._orderer, None)
+            else:
+                move = self._search_until(root, self.deadline)
+        if move is None:
+            return None
+
+        if self.ponder:
+            self._start_pondering(root, move)
+        return self._translate(move, board)
+
+    def _search_until(self, root: 'Board', deadline) -> Move:
+        """
+        Iterative deepening up to self.depth that stops at the deadline, returning
+        the move of the deepest search that finished
+        """
+        best_move = None
+        for depth in range(1, self.depth + 1):
+            try:
+                best_move = self._search(root, self._table, self._orderer, deadline, depth) or best_move
+            except SearchAborted:
+                break
+            if deadline.expired():
+                break
+        if best_move is None:
+            # Not even one ply in time: take the first move in search order
+            moves = self._ordered_moves(root, self._table, self._orderer, 0)
+            best_move = moves[0] if moves else None
+        return best_move
+
+    def _search(self, root: 'Board', table: dict, orderer: MoveOrderer, stop, depth: int = None) -> Move:
+        """Alpha-beta search of the root position to depth (default self.depth), returning the best move on root"""
+        if depth is None:
+            depth = self.depth
+        if len(table) > self._table_size:
+            table.clear()
+
+        best_move = None
+        alpha, beta = -float('inf'), float('inf')
+        for move in self._ordered_moves(root, table, orderer, 0):
+            child = self._play(root, move)
+            if child is None:
+                continue
+            score = -self._negamax(child, depth - 1, -beta, -alpha, 1, table, orderer, stop)
+            if best_move is None or score > alpha:
+                alpha = score
+                best_move = move
+
+        if best_move is not None:
+            orderer.record_cutoff(best_move, 0, depth)
+            table[root.to_state()] = (depth, alpha, self.EXACT, move_key(best_move))
+        return best_move
+
+    def _negamax(self, node: 'Board', depth: int, alpha: float, beta: float, ply: int,
+                 table: dict, orderer: MoveOrderer, stop) -> float:
+        """Score a position from the point of view of the player to move"""
+        if stop is not None and stop.is_set():
+            raise SearchAborted()
+
+        winner = self._winner(node)
+        if winner is not None:
+            # Prefer quicker wins and slower losses
+            return self.WIN_SCORE - ply if winner == node.current_player._color else ply - self.WIN_SCORE
+        if depth <= 0:
+            return self._evaluate(node)
+
+        key = node.to_state()
+        if key in self._history:
+            return self.DRAW_SCORE
+        entry = table.get(key)
+        if entry is not None and entry[0] >= depth:
+            _, score, flag, _ = entry
+            if flag == self.EXACT:
+                return score
+            if flag == self.LOWER:
+                alpha = max(alpha, score)
+            else:
+                beta = min(beta, score)
+            if alpha >= beta:
+                return score
+
+        original_alpha = alpha
+        best = -float('inf')
+        best_move = None
+        for move in self._ordered_moves(node, table, orderer, ply, key):
+            child = self._play(node, move)
+            if child is None:
+                continue
+            score = -self._negamax(child, depth - 1, -beta, -alpha, ply + 1, table, orderer, stop)
+            if score > best:
+                best = score
+                best_move = move
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                orderer.record_cutoff(move, ply, depth)
+                break
+
+        if best_move is None:
+            return self._evaluate(node)
+
+        flag = self.UPPER if best <= original_alpha else self.LOWER if best >= beta else self.EXACT
+        table[key] = (depth, best, flag, move_key(best_move))
+        return best
+
+    def _ordered_moves(self, node: 'Board', table: dict, orderer: MoveOrderer, ply: int,
+                       key: tuple = None) -> list:
+        """Moves in search order, with the transposition table's best move first"""
+        moves = orderer.order(node, self._complete_moves(node), ply)
+        entry = table.get(node.to_state() if key is None else key)
+        if entry is not None:
+            for index, move in enumerate(moves):
+                if move_key(move) == entry[3]:
+                    moves.insert(0, moves.pop(index))
+                    break
+        return moves
+
+    def _start_pondering(self, root: 'Board', move: Move):
+        """Predict the opponent's reply to move and search the resulting position in the background"""
+        after_move = self._play(root, move)
+        if after_move is None or self._winner(after_move) is not None:
+            return
+        reply = self._predict_reply(after_move)
+        if reply is None:
+            return
+        position = self._play(after_move, reply)
+        if position is None or self._winner(position) is not None:
+            return
+
+        task = _PonderTask(position.to_state(), position, dict(self._table))
+        import threading
+        task.thread = threading.Thread(target=self._ponder, args=(task,), daemon=True)
+        self._ponder_task = task
+        task.thread.start()
+
+    def _predict_reply(self, node: 'Board') -> Move:
+        """The opponent's best reply according to the table, or the first ordered move"""
+        moves = self._ordered_moves(node, self._table, self._orderer, 1)
+        return moves[0] if moves else None
+
+    def _ponder(self, task: '_PonderTask'):
+        try:
+            task.result = self._search(task.board, task.table, task.orderer, task.stop)
+        except SearchAborted:
+            task.result = None
+
+    def _collect_ponder(self, root: 'Board') -> Move:
+        """
+        Finish with the background search: on a correct prediction wait for it, no
+        longer than the deadline, and adopt its move and table, otherwise stop it
+        and discard everything it found. A prediction that is still searching when
+        the deadline passes is stopped, its table kept, and None returned so the
+        move is found by a normal search.
+        """
+        task, self._ponder_task = self._ponder_task, None
+        if task is None:
+            return None
+        if task.key != root.to_state():
+            task.stop.set()
+            task.thread.join()
+            return None
+
+        task.thread.join(None if self.deadline is None else max(0.0, self.deadline.remaining()))
+        if task.thread.is_alive():
+            task.stop.set()
+            task.thread.join()
+        # Entries of an aborted search were stored by finished subtrees and still hold
+        self._table = task.table
+        if task.result is None:
+            return None
+        self.ponder_hits += 1
+        return self._translate(task.result, root)
+
+    @staticmethod
+    def _complete_moves(node: 'Board') -> list:
+        """
+        All moves for the player to move, each paired with every possible next era.
+        The resulting positions are not computed, most children are never searched.
+        """
+        return [move for move, _ in node.successors(include_switches=False, states=False)]
+
+    def _play(self, node: 'Board', move: Move) -> 'Board':
+        """Return a copy of node with the move applied, or None if it fails"""
+        child = self._copy_board(node)
+        child_move = self._translate(move, child)
+        if not child_move.execute(child):
+            return None
+        return child
+
+    def _copy_board(self, board: 'Board') -> 'Board':
+        return board.clone()
+
+    @staticmethod
+    def _translate(move: Move, board: 'Board') -> Move:
+        """Rebuild a move so it refers to the pieces and eras of another copy of the board"""
+        piece = None
+        if move.piece:
+            position = move.piece.position
+            era = board._getEraByName(position._era.name)
+            piece = era.grid[position._y][position._x].getPiece()
+        next_era = board._getEraByName(move.next_era.name) if move.next_era else None
+        return Move(piece, list(move.directions), next_era, move.next_player)
+
+    @staticmethod
+    def _winner(board: 'Board'):
+        """Return the colour of the winner, or None while the game goes on"""
+        return board.outcome()
+
+    def _evaluate(self, board: 'Board') -> int:
+        """Heuristic score for the player to move minus the same score for the opponent"""
+        player = board.current_player
+        opponent = board.b_player if player._color == "w_player" else board.w_player
+        return self._features(board, player) - self._features(board, opponent)
+
+    def _features(self, board: 'Board', player: 'PlayerStrategy') -> int:
+        """The HeuristicAIPlayer features, read from the era counters, under this player's weights"""
+        weights = self.weights
+        return (
+            weights.era_presence * board.countEras(player) +
+            weights.advantage * HeuristicAIPlayer._evaluate_piece_advantage(board, player) +
+            weights.supply * len(player._supply) +
+            weights.centrality * HeuristicAIPlayer._evaluate_centrality(board, player) +
+            weights.focus * player.current_era.countPieces(player)
+        )
+
+class NTupleAIPlayer(PlayerStrategy):
+    """
+    Greedy player scoring the position after each complete move with the
+    n-tuple pattern tables (see ntuple). tables is the file to load, by default
+    ntuple.bin next to the module; network passes a loaded NTupleNetwork
+    instead, as self-play training does. With probability epsilon the player
+    makes a random move.
+    """
+    _shared_attributes = PlayerStrategy._shared_attributes + ("network",)
+
+    def __init__(self, color, board, io=None, rng=None, tables=None, network=None, epsilon=0.0) -> None:
+        super().__init__(color, board, io, rng)
+        if not 0 <= epsilon <= 1:
+            raise ValueError(f"Invalid epsilon {epsilon}. Must be between 0 and 1.")
+        if network is None:
+            from ntuple import load_network  # Imported here, only n-tuple players need the tables
+            network = load_network(tables)
+        self.network = network
+        self.epsilon = epsilon
+
+    def getMove(self, board: 'Board') -> Move:
+        """Return the move leading to the best position for this player"""
+        successors = board.successors(include_switches=False)
+        if not successors:
+            return None
+        if self.epsilon and self._rng.random() < self.epsilon:
+            return self._rng.choice(successors)[0]
+
+        sign = 1 if self._color == "w_player" else -1
+        # Each child differs from the root in a few cells, so its features are updated from the root's
+        root = board.to_state()
+        features = self.network.features(root)
+        best_score, best = None, []
+        for move, state in successors:
+            if best and self.deadline is not None and self.deadline.expired():
+                break
+            score = sign * self.network.evaluate(state, self.network.features_after(features, root, state))
+            if best_score is None or score > best_score:
+                best_score, best = score, [move]
+            elif score == best_score:
+                best.append(move)
+        return self._rng.choice(best)
+
 
 class RandomAIPlayer(PlayerStrategy):
     def getMove(self, board: 'Board') -> Move:
@@ -329,7 +799,7 @@ class RandomAIPlayer(PlayerStrategy):
             # If no pieces in current era, randomly select next era
             possible_eras = [board.past, board.present, board.future]
             possible_eras.remove(self.current_era)
-            next_era = random.choice(possible_eras)
+            next_era = self._rng.choice(possible_eras)
             return Move(None, [], next_era, 
                        "b_player" if self._color == "w_player" else "w_player")
         
@@ -343,17 +813,17 @@ class RandomAIPlayer(PlayerStrategy):
             # If no valid moves, randomly select next era
             possible_eras = [board.past, board.present, board.future]
             possible_eras.remove(self.current_era)
-            next_era = random.choice(possible_eras)
+            next_era = self._rng.choice(possible_eras)
             return Move(None, [], next_era, 
                        "b_player" if self._color == "w_player" else "w_player")
         
         # Select random move
-        selected_move = random.choice(all_valid_moves)
+        selected_move = self._rng.choice(all_valid_moves)
         
         # Add random next era to the move
         possible_eras = [board.past, board.present, board.future]
         possible_eras.remove(self.current_era)
-        next_era = random.choice(possible_eras)
+        next_era = self._rng.choice(possible_eras)
         
         return Move(selected_move.piece, selected_move.directions, next_era,
                    "b_player" if self._color == "w_player" else "w_player")
@@ -368,7 +838,7 @@ class HumanPlayer(PlayerStrategy):
         # Get pieces in current era
         pieces = self.current_era.getPieces(self)
         if not pieces:
-            print("No copies to move")
+            self._io.write("No copies to move")
             next_era = self._input_next_era(board)
             return Move(None, [], next_era, 
                        "b_player" if self._color == "w_player" else "w_player")
@@ -383,7 +853,7 @@ class HumanPlayer(PlayerStrategy):
         
         # If no pieces can move
         if not valid_moves:
-            print("No copies to move")
+            self._io.write("No copies to move")
             next_era = self._input_next_era(board)
             return Move(None, [], next_era, 
                        "b_player" if self._color == "w_player" else "w_player")
@@ -410,7 +880,7 @@ class HumanPlayer(PlayerStrategy):
     def _input_piece(self, board: 'Board', valid_moves: dict) -> 'Piece':
         """Get valid piece selection from user."""
         while True:
-            piece_id = input("Select a copy to move\n").strip().upper()
+            piece_id = self._io.read("Select a copy to move\n").strip().upper()
             
             # 1. Check if piece exists on the board at all
             piece_found = False
@@ -420,11 +890,11 @@ class HumanPlayer(PlayerStrategy):
                         piece_found = True
                         # 2. Check if it's an opponent's piece
                         if piece.owner != self._color:
-                            print("That is not your copy")
+                            self._io.write("That is not your copy")
                             break
                         # 3. Check if piece is in inactive era
                         if era != self.current_era:
-                            print("Cannot select a copy from an inactive era")
+                            self._io.write("Cannot select a copy from an inactive era")
                             break
                         # If we get here, it's a valid piece in the active era
                         return piece
@@ -432,7 +902,7 @@ class HumanPlayer(PlayerStrategy):
                     break
             
             if not piece_found:
-                print("Not a valid copy")
+                self._io.write("Not a valid copy")
 
     def _input_directions(self, board: 'Board', piece: 'Piece', max_directions: int):
         """Select valid move directions."""
@@ -441,17 +911,17 @@ class HumanPlayer(PlayerStrategy):
         
         # Get first direction
         while True:
-            direction = input("Select the first direction to move ['n', 'e', 's', 'w', 'f', 'b']\n").strip().lower()
+            direction = self._io.read("Select the first direction to move ['n', 'e', 's', 'w', 'f', 'b']\n").strip().lower()
             
             # 4. Check if direction is valid
             if direction not in valid_directions:
-                print("Not a valid direction")
+                self._io.write("Not a valid direction")
                 continue
             
             # 5. Check if piece can move in that direction
             temp_move = Move(piece, [direction], None, None)
             if not board._is_valid_direction(temp_move):
-                print(f"Cannot move {direction}")
+                self._io.write(f"Cannot move {direction}")
                 continue
             
             directions.append(direction)
@@ -460,14 +930,14 @@ class HumanPlayer(PlayerStrategy):
         # Similar checks for second direction if needed
         if max_directions > 1:
             while True:
-                direction = input("Select the second direction to move ['n', 'e', 's', 'w', 'f', 'b']\n").strip().lower()
+                direction = self._io.read("Select the second direction to move ['n', 'e', 's', 'w', 'f', 'b']\n").strip().lower()
                 if direction not in valid_directions:
-                    print("Not a valid direction")
+                    self._io.write("Not a valid direction")
                     continue
                 
                 temp_move = Move(piece, directions + [direction], None, None)
                 if not board._is_valid_move(temp_move):
-                    print(f"Cannot move {direction}")
+                    self._io.write(f"Cannot move {direction}")
                     continue
                 
                 directions.append(direction)
@@ -479,18 +949,18 @@ class HumanPlayer(PlayerStrategy):
         """Get valid next era selection."""
         valid_eras = {'past', 'present', 'future'}
         while True:
-            era = input("Select the next era to focus on ['past', 'present', 'future']\n").strip().lower()
+            era = self._io.read("Select the next era to focus on ['past', 'present', 'future']\n").strip().lower()
 
             # 6. Check if era is valid
             if era not in valid_eras:
-                print("Not a valid era")
+                self._io.write("Not a valid era")
                 continue
 
             next_era = getattr(board, era)
             
             # 7. Check if era is current era
             if next_era == self.current_era:
-                print("Cannot select the current era")
+                self._io.write("Cannot select the current era")
                 continue
 
             return next_era
\ No newline at end of file
@@ -0,0 +1,102 @@
+"""Elo arithmetic for match results: rating differences, confidence intervals and SPRT."""
+import math
+
+# Two-sided 95% normal quantile
+Z95 = 1.959964
+
+
+def expected_score(elo: float) -> float:
+    """Expected score of a player rated elo points above the opponent"""
+    return 1 / (1 + 10 ** (-elo / 400))
+
+
+def elo_from_score(score: float) -> float:
+    """Rating difference that produces the given expected score"""
+    score = min(max(score, 1e-6), 1 - 1e-6)
+    return -400 * math.log10(1 / score - 1)
+
+
+class MatchResult:
+    """Wins, draws and losses of one side of a match"""
+    def __init__(self, wins: int = 0, draws: int = 0, losses: int = 0):
+        self.wins = wins
+        self.draws = draws
+        self.losses = losses
+
+    def add(self, score: float):
+        """Record one game scored 1, 0.5 or 0 for this side"""
+        if score == 1:
+            self.wins += 1
+        elif score == 0:
+            self.losses += 1
+        elif score == 0.5:
+            self.draws += 1
+        else:
+            raise ValueError(f"Invalid game score {score}. Must be 0, 0.5 or 1.")
+
+    def merge(self, other: 'MatchResult'):
+        self.wins += other.wins
+        self.draws += other.draws
+        self.losses += other.losses
+
+    @property
+    def games(self) -> int:
+        return self.wins + self.draws + self.losses
+
+    @property
+    def score(self) -> float:
+        """Average points per game, 0.5 when no games were played"""
+        return (self.wins + 0.5 * self.draws) / self.games if self.games else 0.5
+
+    def variance(self) -> float:
+        """Per-game variance of the score"""
+        if not self.games:
+            return 0.0
+        score = self.score
+        return (self.wins * (1 - score) ** 2 + self.draws * (0.5 - score) ** 2
+                + self.losses * score ** 2) / self.games
+
+    def elo(self) -> tuple:
+        """(Elo difference, lower bound, upper bound) with a 95% confidence interval"""
+        if not self.games:
+            return 0.0, -math.inf, math.inf
+        margin = Z95 * math.sqrt(self.variance() / self.games)
+        return (elo_from_score(self.score),
+                elo_from_score(self.score - margin),
+                elo_from_score(self.score + margin))
+
+    def __str__(self):
+        elo, low, high = self.elo()
+        return f"+{self.wins} ={self.draws} -{self.losses} ({elo:+.1f} Elo, 95% CI {low:+.1f} to {high:+.1f})"
+
+
+class SPRT:
+    """
+    Sequential probability ratio test of H0: elo = elo0 against H1: elo = elo1,
+    using the normal approximation of the log-likelihood ratio.
+    """
+    def __init__(self, elo0: float = 0, elo1: float = 10, alpha: float = 0.05, beta: float = 0.05):
+        if elo1 <= elo0:
+            raise ValueError(f"Invalid SPRT bounds {elo0}, {elo1}. elo1 must be above elo0.")
+        self.elo0 = elo0
+        self.elo1 = elo1
+        self.lower = math.log(beta / (1 - alpha))
+        self.upper = math.log((1 - beta) / alpha)
+
+    def llr(self, result: MatchResult) -> float:
+        """Log-likelihood ratio of H1 over H0 given the result"""
+        variance = result.variance()
+        if not result.games or variance == 0:
+            return 0.0
+        score0 = expected_score(self.elo0)
+        score1 = expected_score(self.elo1)
+        return (score1 - score0) * (2 * result.score - score0 - score1) * result.games / (2 * variance)
+
+    def status(self, result: MatchResult):
+        """"H1" or "H0" once a hypothesis is accepted, None while the test continues"""
+        llr = self.llr(result)
+        if llr >= self.upper:
+            return "H1"
+        if llr <= self.lower:
+            return "H0"
+        return None
@@ -0,0 +1,58 @@
+"""Buffered board rendering for the console game."""
+
+SEPARATOR = "+-+-+-+-+   +-+-+-+-+   +-+-+-+-+"
+FRAME_TOP = "---------------------------------"
+
+# Column where the focus indicator of each era starts
+FOCUS_OFFSETS = {"past": 2, "present": 14, "future": 26}
+
+
+class BoardRenderer:
+    """
+    Builds each frame into a single buffer and writes it with one call.
+
+    Row strings are cached per era and only rebuilt when the pieces in that
+    row change. In quiet mode nothing is rendered at all.
+    """
+    def __init__(self, io, quiet: bool = False):
+        self._io = io
+        self.quiet = quiet
+        self._row_cache = {}  # (era name, y) -> (piece ids, row string)
+        self._focus_lines = {
+            (era_name, color): " " * offset + color + " " * 2
+            for era_name, offset in FOCUS_OFFSETS.items()
+            for color in ("white", "black")
+        }
+
+    def draw(self, game, extra_lines=()):
+        """Render the game and any extra lines (e.g. scores) in a single write"""
+        if self.quiet:
+            return
+        lines = self.render(game)
+        lines.extend(extra_lines)
+        self._io.write("\n".join(lines))
+
+    def render(self, game) -> list:
+        """Return the lines of the current frame"""
+        board = game.board
+        eras = (board.past, board.present, board.future)
+        lines = [FRAME_TOP, self._focus_lines[(game.b_player.current_era.name, "black")]]
+        for y in range(4):
+            lines.append(SEPARATOR)
+            lines.append("   ".join(self._row(era, y) for era in eras))
+        lines.append(SEPARATOR)
+        lines.append(self._focus_lines[(game.w_player.current_era.name, "white")])
+        lines.append(f"Turn: {game.turn_number}, Current player: "
+                     f"{'white' if game.current_player == game.w_player else 'black'}")
+        return lines
+
+    def _row(self, era, y: int) -> str:
+        """Return the row string, rebuilding it only if its cells changed"""
+        ids = tuple(space.piece.id if space.piece else " " for space in era.grid[y])
+        key = (era.name, y)
+        cached = self._row_cache.get(key)
+        if cached is not None and cached[0] == ids:
+            return cached[1]
+        row = "|" + "|".join(ids) + "|"
+        self._row_cache[key] = (ids, row)
+        return row
@@ -0,0 +1,45 @@
+"""Score panel statistics read from counters the board maintains as pieces move."""
+from collections import namedtuple
+
+
+class PlayerScore(namedtuple("PlayerScore", "eras advantage supply centrality focus")):
+    """
+    eras: eras containing the player's pieces
+    advantage: player's pieces minus the opponent's, across all eras
+    supply: pieces left in supply
+    centrality: pieces on the four central spaces of each era
+    focus: pieces in the player's focused era
+    """
+    __slots__ = ()
+
+
+class ScoreModel:
+    """
+    Cheap, pollable view of both players' scores.
+
+    Every number comes from the per-era counters kept up to date by
+    Space.setPiece/clearPiece, so a poll never scans the grid.
+    """
+    def __init__(self, game):
+        self._game = game
+
+    def player_score(self, player) -> PlayerScore:
+        board = self._game.board
+        opponent = board.b_player if player._color == "w_player" else board.w_player
+        eras = (board.past, board.present, board.future)
+
+        own = [era.countPieces(player) for era in eras]
+        return PlayerScore(
+            eras=sum(1 for count in own if count > 0),
+            advantage=sum(own) - sum(era.countPieces(opponent) for era in eras),
+            supply=len(player._supply),
+            centrality=sum(era.countCentral(player) for era in eras),
+            focus=player.current_era.countPieces(player),
+        )
+
+    def snapshot(self) -> dict:
+        """Return the scores of both players keyed by colour name"""
+        return {
+            "white": self.player_score(self._game.w_player),
+            "black": self.player_score(self._game.b_player),
+        }
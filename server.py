@@ -0,0 +1,416 @@
+"""
+Asyncio game server hosting many concurrent games over a line protocol.
+
+Every connection is one session. Commands are single lines; each response
+is zero or more data lines followed by a line starting with "ok" or "error".
+
+    new <white_type> <black_type> [seed]
+                                    start a game ('human', 'heuristic', 'random', 'search', 'ntuple')
+    board                           show the eras
+    scores                          both players' score panel statistics
+    move <copy> <dir>[,<dir>] <era> play a human move, e.g. "move A n,e present"
+    era <era>                       switch focus without moving a copy
+    ai                              let the AI play the current turn
+    auto [max_turns]                let the AI play until a human is to move
+    stats                           per-session latency metrics
+    quit                            close the session
+
+AI moves are computed in a process pool so a slow search never blocks the
+event loop or the other sessions. With a time control or move time the AI
+must answer by a deadline that includes any wait for a free worker, and a
+player whose clock runs out loses; human moves are not timed.
+"""
+import argparse
+import asyncio
+import pickle
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from gameio import NullIO
+from main import Game, GameState
+from movehistory import Move
+from player import SearchAIPlayer
+from timecontrol import Deadline, TimeControl
+
+
+AI_TYPES = {"heuristic", "random", "search", "ntuple"}
+PLAYER_TYPES = AI_TYPES | {"human"}
+
+
+def _compute_ai_move(board_blob: bytes, color: str, deadline: float = None):
+    """
+    Worker entry point: unpickle a board and return the AI's move as plain data,
+    together with the player's advanced random state and _returned_attributes
+    (move ordering tables) so the session plays as the same game would locally.
+    deadline is a time.monotonic() value the move must be chosen by.
+
+    The player is a fresh copy every turn, so a search player's transposition
+    table and pondering do not carry over between server moves; pondering is
+    switched off, as no later call would ever collect its thread.
+    """
+    board = pickle.loads(board_blob)
+    player = board.w_player if color == "w_player" else board.b_player
+    player.deadline = Deadline(deadline) if deadline is not None else None
+    if getattr(player, "ponder", False):
+        player.ponder = False
+    move = player.getMove(board)
+    if move is None:
+        return None
+    piece_id = move.piece.id if move.piece else None
+    era_name = move.next_era.name if move.next_era else None
+    returned = {name: getattr(player, name) for name in player._returned_attributes}
+    return piece_id, list(move.directions), era_name, player._rng.getstate(), returned
+
+
+class LatencyMetrics:
+    """Keeps a bounded window of latency samples per operation"""
+    def __init__(self, window: int = 1024):
+        self._window = window
+        self._samples = {}
+        self._counts = {}
+
+    def record(self, name: str, seconds: float):
+        if name not in self._samples:
+            self._samples[name] = deque(maxlen=self._window)
+            self._counts[name] = 0
+        self._samples[name].append(seconds)
+        self._counts[name] += 1
+
+    def summary(self) -> dict:
+        """Return count, mean, p50, p95 and max (in milliseconds) per operation"""
+        result = {}
+        for name, samples in self._samples.items():
+            ordered = sorted(samples)
+            n = len(ordered)
+            result[name] = {
+                "count": self._counts[name],
+                "mean_ms": 1000 * sum(ordered) / n,
+                "p50_ms": 1000 * ordered[n // 2],
+                "p95_ms": 1000 * ordered[min(n - 1, int(n * 0.95))],
+                "max_ms": 1000 * ordered[-1],
+            }
+        return result
+
+
+class Session:
+    """A single game hosted by the server"""
+    def __init__(self, session_id: int):
+        self.id = session_id
+        self.game = None
+        self.types = {}
+        self.metrics = LatencyMetrics()
+
+    def start(self, white_type: str, black_type: str, seed: int = None, time_control: TimeControl = None,
+              move_time: float = None):
+        self.game = Game(white_type=white_type, black_type=black_type, io=NullIO(), seed=seed,
+                         time_control=time_control, move_time=move_time)
+        self.types = {"w_player": white_type, "b_player": black_type}
+
+    def current_type(self) -> str:
+        return self.types[self.game.current_player._color]
+
+    def board_lines(self) -> list:
+        """Format the eras side by side, one line per row"""
+        return self.game.renderer.render(self.game)[1:]
+
+
+class GameServer:
+    """Serves many concurrent sessions, computing AI moves in a process pool"""
+    def __init__(self, workers: int = None, max_sessions: int = 1000, time_control: TimeControl = None,
+                 move_time: float = None):
+        self._workers = workers
+        self._executor = ProcessPoolExecutor(max_workers=workers)
+        self._max_sessions = max_sessions
+        self.time_control = time_control
+        self.move_time = move_time
+        self._sessions = {}
+        self._next_id = 1
+        self.metrics = LatencyMetrics()
+        self._server = None
+        self._handlers = set()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0, path: str = None):
+        """Start listening on TCP, or on a Unix socket when a path is given"""
+        if path:
+            self._server = await asyncio.start_unix_server(self.handle_client, path=path)
+        else:
+            self._server = await asyncio.start_server(self.handle_client, host, port)
+        return self._server
+
+    def address(self):
+        return self._server.sockets[0].getsockname()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+        for handler in list(self._handlers):
+            handler.cancel()
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        if self._server is not None:
+            await self._server.wait_closed()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    async def handle_client(self, reader, writer):
+        if len(self._sessions) >= self._max_sessions:
+            writer.write(b"error server full\n")
+            await writer.drain()
+            writer.close()
+            return
+
+        handler = asyncio.current_task()
+        self._handlers.add(handler)
+        session = Session(self._next_id)
+        self._next_id += 1
+        self._sessions[session.id] = session
+        try:
+            writer.write(f"ok session {session.id}\n".encode())
+            await writer.drain()
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                started = time.perf_counter()
+                command, *args = line.decode(errors="replace").split() or [""]
+                if command == "quit":
+                    writer.write(b"ok bye\n")
+                    await writer.drain()
+                    break
+                try:
+                    lines = await self._dispatch(session, command.lower(), args)
+                except Exception as error:
+                    # A failed command, e.g. on a worker that died, is reported and the session goes on
+                    lines = [f"error {type(error).__name__}: " + " ".join(str(error).split())]
+                writer.write(("\n".join(lines) + "\n").encode())
+                await writer.drain()
+                elapsed = time.perf_counter() - started
+                session.metrics.record("request", elapsed)
+                self.metrics.record("request", elapsed)
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._handlers.discard(handler)
+            del self._sessions[session.id]
+            writer.close()
+
+    async def _dispatch(self, session: Session, command: str, args: list) -> list:
+        """Run a single command and return the response lines"""
+        if command == "new":
+            if (len(args) not in (2, 3) or args[0] not in PLAYER_TYPES or args[1] not in PLAYER_TYPES
+                    or (len(args) == 3 and not args[2].isdigit())):
+                return ["error usage: new <white_type> <black_type> [seed]"]
+            session.start(args[0], args[1], int(args[2]) if len(args) == 3 else None,
+                          self.time_control, self.move_time)
+            return [f"ok new {args[0]} {args[1]} seed={session.game.seed}"]
+        if command == "stats":
+            return [f"stat {name} " + " ".join(f"{key}={value:.3f}" if isinstance(value, float)
+                                                else f"{key}={value}" for key, value in summary.items())
+                    for name, summary in session.metrics.summary().items()] + ["ok stats"]
+        if session.game is None:
+            return ["error no game, use: new <white_type> <black_type>"]
+        if command == "board":
+            return [f"board {line}" for line in session.board_lines()] + ["ok board"]
+        if command == "scores":
+            return [f"score {color} " + " ".join(f"{key}={value}" for key, value in score._asdict().items())
+                    for color, score in session.game.score_model.snapshot().items()] + ["ok scores"]
+        if session.game.state != GameState.PLAYING:
+            return [f"error game over {session.game.state.value}"]
+        if command in ("move", "era"):
+            if session.current_type() != "human":
+                return ["error not a human turn"]
+            move, error = self._parse_move(session.game, command, args)
+            if move is None:
+                return [f"error {error}"]
+            if not session.game.play_move(move):
+                return ["error invalid move"]
+            return [self._played_line(move), f"ok {session.game.state.value}"]
+        if command == "ai":
+            if session.current_type() not in AI_TYPES:
+                return ["error not an AI turn"]
+            move = await self._play_ai_turn(session)
+            if move is None:
+                if session.game.state != GameState.PLAYING:
+                    return [f"ok {session.game.state.value}"]  # Lost on time
+                return ["error AI failed to move"]
+            return [self._played_line(move), f"ok {session.game.state.value}"]
+        if command == "auto":
+            max_turns = int(args[0]) if args and args[0].isdigit() else 200
+            lines = []
+            while (session.game.state == GameState.PLAYING
+                   and session.current_type() in AI_TYPES and len(lines) < max_turns):
+                move = await self._play_ai_turn(session)
+                if move is None:
+                    if session.game.state != GameState.PLAYING:
+                        break  # Lost on time
+                    return lines + ["error AI failed to move"]
+                lines.append(self._played_line(move))
+            return lines + [f"ok {session.game.state.value}"]
+        return [f"error unknown command '{command}'"]
+
+    async def _play_ai_turn(self, session: Session):
+        """Compute the AI move off the event loop and apply it to the session's game"""
+        game = session.game
+        color = game.current_player._color
+        if isinstance(game.current_player, SearchAIPlayer):
+            # The worker searches a copy, so the session's player keeps the game's positions
+            game.current_player.remember(game.board)
+        blob = pickle.dumps(game.board)
+        budget = game.move_budget(color)
+        deadline = time.monotonic() + budget if budget is not None else None
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        executor = self._executor
+        try:
+            spec = await loop.run_in_executor(executor, _compute_ai_move, blob, color, deadline)
+        except BrokenProcessPool:
+            # A worker died and the pool is unusable; later moves get a new one
+            if self._executor is executor:
+                self._executor = ProcessPoolExecutor(max_workers=self._workers)
+                executor.shutdown(wait=False)
+            raise
+        elapsed = time.perf_counter() - started
+        session.metrics.record("ai_move", elapsed)
+        self.metrics.record("ai_move", elapsed)
+        if not game.charge_clock(color, elapsed) or spec is None:
+            return None
+
+        piece_id, directions, era_name, rng_state, returned = spec
+        game.current_player._rng.setstate(rng_state)
+        for name, value in returned.items():
+            setattr(game.current_player, name, value)
+        piece = game.board._find_piece(piece_id) if piece_id else None
+        next_era = game.board._getEraByName(era_name) if era_name else None
+        move = Move(piece, directions, next_era,
+                    "b_player" if color == "w_player" else "w_player")
+        if not game.play_move(move):
+            return None
+        return move
+
+    @staticmethod
+    def _parse_move(game: Game, command: str, args: list):
+        """Build a Move from protocol arguments, returning (move, error)"""
+        player = game.current_player
+        next_player = "b_player" if player._color == "w_player" else "w_player"
+        era_arg = args[-1] if args else ""
+        next_era = game.board._getEraByName(era_arg)
+        if next_era is None:
+            return None, "not a valid era"
+        if next_era == player.current_era:
+            return None, "cannot select the current era"
+        if command == "era":
+            if len(args) != 1:
+                return None, "usage: era <era>"
+            return Move(None, [], next_era, next_player), None
+
+        if len(args) != 3:
+            return None, "usage: move <copy> <dir>[,<dir>] <era>"
+        piece = game.board._find_piece(args[0].upper())
+        if piece is None:
+            return None, "not a valid copy"
+        if piece.owner != player._color:
+            return None, "that is not your copy"
+        if piece.position._era != player.current_era:
+            return None, "cannot select a copy from an inactive era"
+        directions = args[1].lower().split(",")
+        if not 1 <= len(directions) <= 2 or any(d not in "nsewfb" or len(d) != 1 for d in directions):
+            return None, "not a valid direction"
+        move = Move(piece, directions, next_era, next_player)
+        if not game.board._is_valid_move(move):
+            return None, "cannot move that way"
+        return move, None
+
+    @staticmethod
+    def _played_line(move: Move) -> str:
+        piece_id = move.piece.id if move.piece else "None"
+        directions = ",".join(move.directions) if move.directions else "None"
+        return f"played {piece_id} {directions} {move.next_era.name if move.next_era else 'None'}"
+
+
+async def run_client(commands: list, host: str = "127.0.0.1", port: int = None, path: str = None) -> list:
+    """Send commands over one connection and collect every response line"""
+    if path:
+        reader, writer = await asyncio.open_unix_connection(path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    responses = [(await reader.readline()).decode().rstrip("\n")]
+    for command in commands:
+        writer.write((command + "\n").encode())
+        await writer.drain()
+        while True:
+            line = (await reader.readline()).decode().rstrip("\n")
+            if not line:
+                break
+            responses.append(line)
+            if line.startswith("ok") or line.startswith("error"):
+                break
+    writer.close()
+    await writer.wait_closed()
+    return responses
+
+
+async def _loopback_benchmark(sessions: int, white_type: str, black_type: str,
+                              max_turns: int, workers: int, time_control: TimeControl = None,
+                              move_time: float = None):
+    """Run many AI-vs-AI sessions against an in-process server over loopback"""
+    server = GameServer(workers=workers, max_sessions=sessions, time_control=time_control, move_time=move_time)
+    await server.start("127.0.0.1", 0)
+    host, port = server.address()[:2]
+    started = time.perf_counter()
+    results = await asyncio.gather(*[
+        run_client([f"new {white_type} {black_type}", f"auto {max_turns}", "quit"], host, port)
+        for _ in range(sessions)])
+    elapsed = time.perf_counter() - started
+    await server.close()
+
+    moves = sum(sum(1 for line in lines if line.startswith("played")) for lines in results)
+    print(f"{sessions} sessions, {moves} moves in {elapsed:.2f}s")
+    for name, summary in server.metrics.summary().items():
+        print(f"{name}: " + ", ".join(f"{key}={value:.2f}" if isinstance(value, float)
+                                      else f"{key}={value}" for key, value in summary.items()))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="That Time You Killed Me game server")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve = subparsers.add_parser("serve", help="run the game server")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=7878)
+    serve.add_argument("--unix", help="listen on a Unix socket path instead of TCP")
+    serve.add_argument("--workers", type=int, default=None, help="AI worker processes")
+    serve.add_argument("--max-sessions", type=int, default=1000)
+    serve.add_argument("--time", help="clock per player in seconds, with an optional +increment, e.g. 60+0.5")
+    serve.add_argument("--move-time", type=float, help="seconds an AI may spend per move")
+
+    bench = subparsers.add_parser("bench", help="run concurrent AI sessions over loopback")
+    bench.add_argument("--sessions", type=int, default=50)
+    bench.add_argument("--white", default="heuristic", choices=sorted(AI_TYPES))
+    bench.add_argument("--black", default="random", choices=sorted(AI_TYPES))
+    bench.add_argument("--max-turns", type=int, default=100)
+    bench.add_argument("--workers", type=int, default=None, help="AI worker processes")
+    bench.add_argument("--time", help="clock per player in seconds, with an optional +increment, e.g. 60+0.5")
+    bench.add_argument("--move-time", type=float, help="seconds an AI may spend per move")
+
+    args = parser.parse_args(argv)
+    time_control = TimeControl.parse(args.time) if args.time else None
+    if args.command == "bench":
+        asyncio.run(_loopback_benchmark(args.sessions, args.white, args.black,
+                                        args.max_turns, args.workers, time_control, args.move_time))
+        return
+
+    async def serve_forever():
+        server = GameServer(workers=args.workers, max_sessions=args.max_sessions,
+                            time_control=time_control, move_time=args.move_time)
+        listener = await server.start(args.host, args.port, args.unix)
+        print(f"listening on {args.unix or server.address()}")
+        try:
+            await listener.serve_forever()
+        finally:
+            await server.close()
+
+    asyncio.run(serve_forever())
+
+
+if __name__ == "__main__":
+    main()
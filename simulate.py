@@ -0,0 +1,136 @@
+"""
+Headless game runner for AI-vs-AI batches: no prompts, no board output.
+
+Also the slim entry point for scripted runs, e.g. python -m simulate heuristic random --games 10.
+Games run through main.Game, so besides the engine and the players it loads
+what Game imports: the renderer, undo history, event log sinks, I/O providers,
+score model and clocks, small modules that together take about 2 ms of the
+roughly 15 ms import (see startup_bench.py). asyncio, multiprocessing,
+threading and the log file support (json, gzip) are imported on first use.
+"""
+import time
+
+from adjudication import Adjudicator
+from gameio import NullIO
+from main import Game, GameState
+from rating import MatchResult
+from timecontrol import TimeControl
+
+# Turn cap for AI games that never reach a winner
+DEFAULT_MAX_TURNS = 500
+
+
+def play_game(white_type: str = "random", black_type: str = "random", seed=None,
+              max_turns: int = DEFAULT_MAX_TURNS, observer=None, io=None, **options) -> Game:
+    """
+    Play one game between two AI players and return the finished Game.
+
+    observer, when given, is called after every move as
+    observer(game, player, move, legal_moves, seconds, events) where legal_moves
+    is the number of moves the player could choose from, seconds the time the
+    player took to choose and events the (event, data) pairs reported by the board.
+    Games still undecided after max_turns moves end with state PLAYING.
+    Remaining keyword arguments are passed to Game (workers, white_options, ...).
+    """
+    game = Game(white_type, black_type, io=io if io is not None else NullIO(), display="off",
+                seed=seed, **options)
+    events = []
+    game.listeners.append(lambda event, data: events.append((event, data)))
+    try:
+        while game.state == GameState.PLAYING and game.turn_number <= max_turns:
+            player = game.current_player
+            legal_moves = len(game.board.getValidMoves(player)) if observer else 0
+            start = time.perf_counter()
+            move = game.next_move()
+            seconds = time.perf_counter() - start
+            events.clear()
+            if not game.play_move(move):
+                break
+            if observer:
+                observer(game, player, move, legal_moves, seconds, events)
+    finally:
+        game.w_player.close()
+        game.b_player.close()
+    return game
+
+
+def game_score(game: Game, color: str) -> float:
+    """Points for one side ("w_player" or "b_player"): 1 win, 0.5 draw or unfinished, 0 loss"""
+    winner = {GameState.WHITE_WON: "w_player", GameState.BLACK_WON: "b_player"}.get(game.state)
+    if winner is None:
+        return 0.5
+    return 1.0 if winner == color else 0.0
+
+
+def play_pair(first: tuple, second: tuple, seed, max_turns: int = DEFAULT_MAX_TURNS,
+              time_control: TimeControl = None, move_time: float = None) -> tuple:
+    """
+    Play two games from the same seed with colours swapped and return the
+    first entrant's scores. Entrants are (player type, PlayerFactory options);
+    time_control and move_time are passed to both games.
+    Module-level so it can run in a process pool.
+    """
+    white_first = play_game(first[0], second[0], seed=seed, max_turns=max_turns,
+                            white_options=first[1], black_options=second[1],
+                            time_control=time_control, move_time=move_time)
+    black_first = play_game(second[0], first[0], seed=seed, max_turns=max_turns,
+                            white_options=second[1], black_options=first[1],
+                            time_control=time_control, move_time=move_time)
+    return game_score(white_first, "w_player"), game_score(black_first, "b_player")
+
+
+def play_match(first: tuple, second: tuple, pairs: int, seed: int = 0, executor=None,
+               sprt=None, batch: int = 16, max_turns: int = DEFAULT_MAX_TURNS) -> MatchResult:
+    """
+    Play up to pairs colour-swapped game pairs (seeds seed, seed + 1, ...) and
+    return the first entrant's result. Pairs run on executor (a WorkerPool or
+    anything with a compatible map) when given, batch at a time; with an SPRT
+    the match stops as soon as a hypothesis is accepted.
+    """
+    result = MatchResult()
+    for start in range(0, pairs, batch):
+        seeds = range(seed + start, seed + min(start + batch, pairs))
+        if executor is not None:
+            outcomes = executor.map(play_pair, [first] * len(seeds), [second] * len(seeds),
+                                    seeds, [max_turns] * len(seeds))
+        else:
+            outcomes = (play_pair(first, second, pair_seed, max_turns) for pair_seed in seeds)
+        for scores in outcomes:
+            for score in scores:
+                result.add(score)
+        if sprt is not None and sprt.status(result) is not None:
+            break
+    return result
+
+
+def main(argv=None):
+    """Headless entry point: python -m simulate [white] [black] --games N"""
+    import argparse  # Only the command line needs it
+
+    parser = argparse.ArgumentParser(description="Play AI games without any console interaction")
+    parser.add_argument("white", nargs="?", default="random", help="white player type")
+    parser.add_argument("black", nargs="?", default="random", help="black player type")
+    parser.add_argument("--games", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("--max-turns", type=int, default=DEFAULT_MAX_TURNS)
+    parser.add_argument("--repetitions", type=int, default=3, help="occurrences of a position that draw")
+    parser.add_argument("--quiet-moves", type=int, default=200,
+                        help="moves without a capture or supply piece that draw")
+    parser.add_argument("--time", help="clock per player in seconds, with an optional +increment, e.g. 60+0.5")
+    parser.add_argument("--move-time", type=float, help="seconds allowed per move")
+    args = parser.parse_args(argv)
+    time_control = TimeControl.parse(args.time) if args.time else None
+
+    results = {}
+    for seed in range(args.seed, args.seed + args.games):
+        adjudicator = Adjudicator(args.repetitions, args.quiet_moves)
+        game = play_game(args.white, args.black, seed=seed, max_turns=args.max_turns, adjudicator=adjudicator,
+                         time_control=time_control, move_time=args.move_time)
+        results[game.state.value] = results.get(game.state.value, 0) + 1
+        reason = f" by {game.adjudication.replace('_', ' ')}" if game.adjudication else ""
+        print(f"seed {seed}: {game.state.value}{reason} after {game.turn_number - 1} moves")
+    print(", ".join(f"{state} {count}" for state, count in sorted(results.items())))
+
+
+if __name__ == "__main__":
+    main()
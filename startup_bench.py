@@ -0,0 +1,48 @@
+"""
+Startup-time benchmark: how long a fresh interpreter takes to get ready.
+
+Each command runs in a new process several times; the minimum and median
+wall times are reported, next to a bare interpreter for reference.
+
+    python startup_bench.py --runs 20
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+COMMANDS = {
+    "interpreter": ["-c", "pass"],
+    "import main": ["-c", "import main"],
+    "import simulate": ["-c", "import simulate"],
+    "import server": ["-c", "import server"],
+    "python -m simulate": ["-m", "simulate", "--games", "0"],
+}
+
+
+def measure(arguments: list, runs: int) -> list:
+    """Wall time in seconds of each run of the interpreter with the given arguments"""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + arguments, check=True, stdout=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure interpreter and import startup time")
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args(argv)
+    if args.runs < 1:
+        raise ValueError(f"Invalid run count {args.runs}. Must be at least 1.")
+
+    print(f"{'command':<22} {'min ms':>8} {'median ms':>10}")
+    for name, arguments in COMMANDS.items():
+        times = measure(arguments, args.runs)
+        print(f"{name:<22} {min(times) * 1000:>8.1f} {statistics.median(times) * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
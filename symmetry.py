@@ -0,0 +1,106 @@
+"""
+Position symmetries: the eight reflections/rotations of the 4x4 eras, each
+optionally combined with swapping the colours (1<->A, ..., 7<->G).
+
+A transform is a (spatial, swap) pair. Eras keep their order under every
+transform, since moving back in time ('b') is what spawns supply pieces.
+Positions are handled as Board.to_state() tuples; Board.from_state() turns a
+canonical state back into a board.
+"""
+
+IDENTITY = (0, False)
+
+# Spatial transforms of a square (x, y) on the 4x4 grid
+_SPATIAL = (
+    lambda x, y: (x, y),          # identity
+    lambda x, y: (3 - y, x),      # rotate 90
+    lambda x, y: (3 - x, 3 - y),  # rotate 180
+    lambda x, y: (y, 3 - x),      # rotate 270
+    lambda x, y: (3 - x, y),      # mirror left-right
+    lambda x, y: (x, 3 - y),      # mirror top-bottom
+    lambda x, y: (y, x),          # main diagonal
+    lambda x, y: (3 - y, 3 - x),  # anti-diagonal
+)
+_INVERSE_SPATIAL = (0, 3, 2, 1, 4, 5, 6, 7)
+
+_OFFSETS = {'n': (0, -1), 's': (0, 1), 'e': (1, 0), 'w': (-1, 0)}
+_BLACK_IDS = "1234567"
+_WHITE_IDS = "ABCDEFG"
+_SWAP_IDS = str.maketrans(_BLACK_IDS + _WHITE_IDS, _WHITE_IDS + _BLACK_IDS)
+
+
+def _build_tables():
+    """Per spatial transform: the source cell of every destination cell, and the direction map"""
+    sources = []
+    directions = []
+    for transform in _SPATIAL:
+        source = [0] * 48
+        for era in range(3):
+            for y in range(4):
+                for x in range(4):
+                    new_x, new_y = transform(x, y)
+                    source[era * 16 + new_y * 4 + new_x] = era * 16 + y * 4 + x
+        sources.append(tuple(source))
+
+        origin = transform(1, 1)
+        mapping = {'f': 'f', 'b': 'b'}
+        for direction, (dx, dy) in _OFFSETS.items():
+            moved = transform(1 + dx, 1 + dy)
+            offset = (moved[0] - origin[0], moved[1] - origin[1])
+            mapping[direction] = next(name for name, value in _OFFSETS.items() if value == offset)
+        directions.append(mapping)
+    return tuple(sources), tuple(directions)
+
+
+_SOURCES, _DIRECTIONS = _build_tables()
+TRANSFORMS = tuple((spatial, swap) for swap in (False, True) for spatial in range(8))
+
+
+def transform_state(state: tuple, transform: tuple) -> tuple:
+    """Apply a transform to a Board.to_state() tuple"""
+    spatial, swap = transform
+    cells, w_supply, b_supply, deactivated, w_era, b_era, to_move = state
+    source = _SOURCES[spatial]
+    cells = "".join([cells[index] for index in source])
+    if not swap:
+        return cells, w_supply, b_supply, deactivated, w_era, b_era, to_move
+    return (cells.translate(_SWAP_IDS),
+            b_supply.translate(_SWAP_IDS),
+            w_supply.translate(_SWAP_IDS),
+            "".join(sorted(deactivated.translate(_SWAP_IDS))),
+            b_era, w_era,
+            "b_player" if to_move == "w_player" else "w_player")
+
+
+def canonicalize(position) -> tuple:
+    """
+    Map a Board (or to_state() tuple) to its canonical representative.
+    Returns (canonical state, transform) with transform_state(state, transform) == canonical.
+    """
+    state = position if isinstance(position, tuple) else position.to_state()
+    best_state, best_transform = state, IDENTITY
+    for transform in TRANSFORMS[1:]:
+        candidate = transform_state(state, transform)
+        if candidate < best_state:
+            best_state, best_transform = candidate, transform
+    return best_state, best_transform
+
+
+def inverse(transform: tuple) -> tuple:
+    """The transform that undoes the given one"""
+    spatial, swap = transform
+    return _INVERSE_SPATIAL[spatial], swap
+
+
+def transform_move(spec: tuple, transform: tuple) -> tuple:
+    """
+    Map a (piece id, directions, next era name) move through a transform, so a
+    move found in the canonical position can be played in the original one
+    using transform_move(spec, inverse(transform)).
+    """
+    spatial, swap = transform
+    piece_id, directions, era_name = spec
+    if swap and piece_id is not None:
+        piece_id = piece_id.translate(_SWAP_IDS)
+    mapping = _DIRECTIONS[spatial]
+    return piece_id, tuple(mapping[direction] for direction in directions), era_name
@@ -0,0 +1,90 @@
+import pytest
+
+from adjudication import MOVE_LIMIT, QUIET, REPETITION, Adjudicator
+from board import Board
+from gameio import NullIO
+from main import Game, GameState
+from movehistory import Move
+
+# Both players switch to the present and back: the start position again every four moves
+CYCLE = ["present", "present", "past", "future"]
+
+
+def _game(**options):
+    return Game("random", "random", io=NullIO(), display="off", seed=1, **options)
+
+
+def _switch(game, era: str):
+    player = game.current_player
+    next_player = "b_player" if player._color == "w_player" else "w_player"
+    assert game.play_move(Move(None, [], game.board._getEraByName(era), next_player))
+
+
+def _play_cycle(game, moves: int, start: int = 0):
+    for ply in range(start, start + moves):
+        assert game.state == GameState.PLAYING
+        _switch(game, CYCLE[ply % 4])
+
+
+def test_threefold_repetition_is_a_draw():
+    game = _game()
+    _play_cycle(game, 7)
+    assert game.state == GameState.PLAYING
+    _play_cycle(game, 1, 7)
+    assert game.state == GameState.DRAW and game.adjudication == REPETITION
+
+
+def test_quiet_moves_and_move_limit():
+    game = _game(adjudicator=Adjudicator(repetitions=None, quiet_moves=6))
+    _play_cycle(game, 5)
+    assert game.state == GameState.PLAYING
+    _play_cycle(game, 1, 5)
+    assert game.state == GameState.DRAW and game.adjudication == QUIET
+
+    game = _game(adjudicator=Adjudicator(repetitions=None, quiet_moves=None, max_moves=3))
+    _play_cycle(game, 3)
+    assert game.state == GameState.DRAW and game.adjudication == MOVE_LIMIT
+
+
+def test_captures_and_supply_reset_the_quiet_count():
+    start = Board.from_state(("1..............A2..............B3..............C", "DEFG", "4567", "",
+                              "past", "future", "w_player"))
+    spawned = Board.from_state(("1..............A2.............DB3..............C", "EFG", "4567", "",
+                                "past", "future", "b_player"))
+    adjudicator = Adjudicator(repetitions=None, quiet_moves=2)
+    adjudicator.start(start)
+    assert adjudicator.record(start) is None and adjudicator.quiet == 1
+    assert adjudicator.record(spawned) is None and adjudicator.quiet == 0
+    assert adjudicator.record(spawned) is None and adjudicator.quiet == 1
+    assert adjudicator.record(spawned) == QUIET
+
+
+def test_hook_names_the_winner():
+    game = _game(adjudicator=Adjudicator(max_moves=2, hook=lambda board, reason: "b_player"))
+    _play_cycle(game, 2)
+    assert game.state == GameState.BLACK_WON and game.adjudication == MOVE_LIMIT
+
+
+def test_invalid_rules():
+    for options in ({"repetitions": 1}, {"quiet_moves": 0}, {"max_moves": 0}):
+        with pytest.raises(ValueError):
+            Adjudicator(**options)
+
+
+def test_repetition_counts_follow_undo():
+    game = _game(undo_redo="on")
+    _play_cycle(game, 4)
+    start_key = Adjudicator.position_key(game.board)
+    assert game.adjudicator.positions[start_key] == 2
+    # Undone occurrences no longer count
+    assert game.undo()
+    assert game.adjudicator.positions[start_key] == 1
+    _play_cycle(game, 4, 3)
+    assert game.state == GameState.PLAYING and game.adjudicator.positions[start_key] == 2
+    assert game.undo() and game.redo()
+    assert game.adjudicator.positions[start_key] == 2
+    _play_cycle(game, 1, 7)
+    assert game.state == GameState.DRAW and game.adjudication == REPETITION
+    # Undoing the drawing move reopens the game
+    assert game.undo()
+    assert game.state == GameState.PLAYING and game.adjudication is None
@@ -0,0 +1,46 @@
+from difftest import _initial_board
+
+
+def test_clone_is_isolated_from_its_parent():
+    board = _initial_board()
+    before = board.to_state()
+    clone = board.clone()
+    successors = clone.successors()
+    move, after = successors[len(successors) // 2]
+    assert clone.makeMove(move)
+    assert clone.to_state() == after
+    assert board.to_state() == before
+
+    # Moves on the parent do not reach the clone either
+    parent_move, parent_after = board.successors()[-1]
+    assert board.makeMove(parent_move)
+    assert board.to_state() == parent_after
+    assert clone.to_state() == after
+
+
+def test_live_board_stops_copying_after_clones_are_dropped():
+    board = _initial_board()
+    board.successors()
+    assert not board._copy_on_write
+
+    clones = [board.clone() for _ in range(3)]
+    assert board._copy_on_write
+    del clones
+    # Once every era and supply the board changes is its own, moves are plain again
+    for ply in range(40):
+        if not board._copy_on_write:
+            break
+        successors = board.successors()
+        assert board.makeMove(successors[ply % len(successors)][0])
+    assert not board._copy_on_write
+
+    eras = (board.past, board.present, board.future)
+    before = {space.piece.id: space.piece for era in eras for row in era.grid for space in row if space.piece}
+    for ply in range(5):
+        successors = board.successors()
+        assert board.makeMove(successors[-1][0])
+        assert not board._copy_on_write
+    # Neither eras nor pieces were copied
+    assert (board.past, board.present, board.future) == eras
+    after = {space.piece.id: space.piece for era in eras for row in era.grid for space in row if space.piece}
+    assert all(before[piece_id] is piece for piece_id, piece in after.items() if piece_id in before)
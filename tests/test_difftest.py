@@ -0,0 +1,19 @@
+from difftest import ENGINES, RulesEngine, run_game
+from player import PlayerStrategy
+
+
+def test_engines_agree_with_the_rules():
+    for seed in range(3):
+        assert run_game(list(ENGINES), seed, max_plies=60) is None
+
+
+def test_rules_catch_a_bug_the_object_engines_share(monkeypatch):
+    # Pushed-off pieces are no longer deactivated, in every object engine at once
+    monkeypatch.setattr(PlayerStrategy, "deactivate_piece", lambda self, piece: None)
+    assert all(run_game(["board", "clone", "successors", "state"], seed) is None for seed in range(3))
+    found = [run_game(["rules", "board"], seed) for seed in range(3)]
+    assert any(divergence is not None and divergence.what == "position" for divergence in found)
+
+
+def test_rules_start_where_the_board_starts():
+    assert RulesEngine().start() == ENGINES["board"]().start().to_state()
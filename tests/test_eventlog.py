@@ -0,0 +1,62 @@
+import pytest
+
+from eventlog import JsonlSink, NullSink, RingBufferSink, read_events
+from simulate import play_game
+
+EVENTS = [{"event": "game_start", "seed": 1},
+          {"event": "move", "turn": 0, "player": "white", "piece": "A", "directions": "nb", "era": "present"},
+          {"event": "game_over", "turn": 0, "result": "draw", "adjudication": None}]
+
+
+def test_ring_buffer_keeps_the_latest_events():
+    sink = RingBufferSink(capacity=2)
+    for event in EVENTS:
+        sink.emit(event)
+    assert list(sink.events) == EVENTS[1:]
+    with pytest.raises(ValueError):
+        RingBufferSink(capacity=0)
+    assert not NullSink.enabled and RingBufferSink.enabled
+
+
+@pytest.mark.parametrize("name", ["events.jsonl", "events.jsonl.gz"])
+def test_jsonl_sink_round_trips(tmp_path, name):
+    path = str(tmp_path / name)
+    sink = JsonlSink(path, batch_size=2)
+    for event in EVENTS:
+        sink.emit(event)
+    if not name.endswith(".gz"):
+        # Two events make a batch and are written, the third waits for a flush
+        assert list(read_events(path)) == EVENTS[:2]
+    sink.close()
+    sink.close()
+    assert list(read_events(path)) == EVENTS
+
+    # A second sink appends to the same file
+    sink = JsonlSink(path)
+    sink.emit(EVENTS[0])
+    sink.close()
+    assert list(read_events(path)) == EVENTS + EVENTS[:1]
+    with pytest.raises(ValueError):
+        JsonlSink(path, batch_size=0)
+
+
+def test_game_events():
+    pushed_off = False
+    for seed in range(4):
+        sink = RingBufferSink()
+        game = play_game("random", "random", seed, 300, events=sink)
+        events = list(sink.events)
+        assert events[0] == {"event": "game_start", "seed": seed}
+        assert (events[-1]["event"] == "game_over") == (game.state.value != "playing")
+        moves = {event["turn"]: event for event in events if event["event"] == "move"}
+        assert sorted(moves) == list(range(1, game.turn_number))
+
+        # Only moves without a piece are reported as era switches
+        switches = [event for event in events if event["event"] == "era_switched"]
+        assert switches
+        assert [switch["turn"] for switch in switches] == [turn for turn, move in sorted(moves.items())
+                                                            if move["piece"] is None]
+        for switch in switches:
+            assert moves[switch["turn"]]["era"] == switch["to"] != switch["from"]
+        pushed_off = pushed_off or any(event["event"] == "pushed_off" for event in events)
+    assert pushed_off
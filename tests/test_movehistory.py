@@ -0,0 +1,110 @@
+from gameio import NullIO, ScriptedIO
+from main import Game
+from simulate import play_game
+
+
+def _record(game):
+    adjudicator = game.adjudicator
+    return (game.board.to_state(), game.turn_number, game.state, game.adjudication,
+            adjudicator.moves, adjudicator.quiet, dict(adjudicator.positions))
+
+
+def _snapshot_record(snapshot):
+    adjudicator = snapshot.adjudicator
+    return (snapshot.board.to_state(), snapshot.turn_number, snapshot.state, snapshot.adjudication,
+            adjudicator.moves, adjudicator.quiet, dict(adjudicator.positions))
+
+
+def test_every_turn_replays_across_thinning():
+    for seed in range(4):
+        recorded = {}
+        game = play_game("random", "random", seed, 150, history_interval=2, history_checkpoints=4,
+                         undo_redo="on",
+                         observer=lambda game, *_: recorded.__setitem__(game.turn_number - 1, _record(game)))
+        caretaker = game.caretaker
+        assert len(caretaker._checkpoints) <= 4
+        for index, expected in recorded.items():
+            snapshot = caretaker._memento(index).get_state()
+            assert _snapshot_record(snapshot) == expected
+            assert snapshot.current_player is snapshot.board.current_player
+            assert snapshot.w_player.current_era in (snapshot.board.past, snapshot.board.present,
+                                                     snapshot.board.future)
+
+
+def test_thinning_keeps_recent_checkpoints_at_the_interval():
+    game = Game("random", "random", undo_redo="on", io=NullIO(), display="off", seed=1,
+                history_interval=2, history_checkpoints=6)
+    for _ in range(100):
+        game.play_move(game.next_move())
+    indices = sorted(game.caretaker._checkpoints)
+    head = len(game.caretaker._deltas) - 1
+    assert len(indices) == 6 and indices[0] == 0
+    assert indices[-3:] == [head - head % 2 - 4, head - head % 2 - 2, head - head % 2]
+    # Older checkpoints are spread out, not piled up at the start
+    assert max(b - a for a, b in zip(indices, indices[1:])) <= 4 * head // 6
+
+
+def test_undo_redo_restores_turns():
+    game = Game("random", "random", undo_redo="on", io=NullIO(), display="off", seed=2,
+                history_interval=3, history_checkpoints=3)
+    states = [game.board.to_state()]
+    for _ in range(20):
+        game.play_move(game.next_move())
+        states.append(game.board.to_state())
+    caretaker = game.caretaker
+    for index in range(19, 4, -1):
+        assert caretaker.undo().board.to_state() == states[index]
+    assert caretaker.redo().board.to_state() == states[6]
+    assert caretaker.redo().board.to_state() == states[7]
+
+
+def test_scripted_undo_keeps_playing():
+    io = ScriptedIO(["next"] * 30 + ["undo"] * 12 + ["redo"] * 4 + ["next"] * 300 + ["no"])
+    game = Game("random", "random", undo_redo="on", io=io, seed=5, history_interval=4, history_checkpoints=3)
+    game.run()
+    assert game.state.value != "playing"
+
+
+def _assert_consistent(game):
+    board = game.board
+    assert board.w_player is game.w_player and board.b_player is game.b_player
+    assert board.current_player is game.current_player
+    eras = (board.past, board.present, board.future)
+    for player in (game.w_player, game.b_player):
+        assert player.current_era in eras
+        pieces = {id(piece) for piece in player._pieces}
+        for era in eras:
+            for row in era.grid:
+                for space in row:
+                    if space.piece is not None and space.piece.owner == player._color:
+                        assert id(space.piece) in pieces
+                        assert space.piece.position._era is era
+
+
+def test_game_undo_redo_restores_the_recorded_state():
+    game = Game("random", "random", undo_redo="on", io=NullIO(), display="off", seed=0,
+                history_interval=3, history_checkpoints=4)
+    recorded = [_record(game)]
+    for _ in range(30):
+        game.play_move(game.next_move())
+        recorded.append(_record(game))
+    # A piece was pushed off the board and deactivated along the way
+    assert recorded[12][0][3] == "" and recorded[-1][0][3] != ""
+
+    for index in range(29, -1, -1):
+        assert game.undo()
+        assert _record(game) == recorded[index]
+        _assert_consistent(game)
+    assert not game.undo()
+    for index in range(1, 16):
+        assert game.redo()
+        assert _record(game) == recorded[index]
+        _assert_consistent(game)
+
+    # Playing on from a restored turn keeps the game and its history in step
+    for _ in range(5):
+        game.play_move(game.next_move())
+        _assert_consistent(game)
+    state = _record(game)
+    assert game.undo() and game.redo()
+    assert _record(game) == state
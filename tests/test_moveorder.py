@@ -0,0 +1,17 @@
+from gameio import NullIO
+from main import Game
+from moveorder import KILLER
+
+
+def test_heuristic_cutoff_changes_its_ordering():
+    game = Game("heuristic", "heuristic", io=NullIO(), display="off", seed=4)
+    player, board = game.w_player, game.board
+    before = {(move.piece.id, tuple(move.directions)): player._orderer.score(board, move)
+              for move in board.getValidMoves(player)}
+
+    best = player.getMove(board)
+    key = (best.piece.id, tuple(best.directions))
+    after = {(move.piece.id, tuple(move.directions)): player._orderer.score(board, move)
+             for move in board.getValidMoves(player)}
+    assert after[key] >= before[key] + KILLER
+    assert max(after, key=after.get) == key
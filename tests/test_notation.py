@@ -0,0 +1,61 @@
+import pytest
+
+from notation import PACKED_SIZE, bytes_to_state, fen_to_state, state_to_bytes, state_to_fen
+from simulate import play_game
+
+START = "1.../..../..../...A 2.../..../..../...B 3.../..../..../...C DEFG 4567 - 0 2 w"
+
+
+def _positions():
+    positions = []
+    for seed in range(3):
+        play_game("random", "random", seed, 200,
+                  observer=lambda game, *_: positions.append(game.board.to_state()))
+    return positions
+
+
+def test_every_position_round_trips():
+    positions = _positions()
+    assert any(state[3] for state in positions) and any(not state[1] for state in positions)
+    for state in positions:
+        assert fen_to_state(state_to_fen(state)) == state
+        packed = state_to_bytes(state)
+        assert len(packed) == PACKED_SIZE
+        assert bytes_to_state(packed) == state
+
+
+def test_start_position():
+    state = fen_to_state(START)
+    assert state_to_fen(state) == START
+    assert bytes_to_state(state_to_bytes(state)) == state
+
+
+@pytest.mark.parametrize("data", [
+    b"\xff" * PACKED_SIZE,
+    b"\x00" * (PACKED_SIZE - 1),
+    b"\x10" + b"\x00" * 23 + b"\xc0\x00" + b"\x00\x00" + b"\x00",  # unused supply bits
+    b"\x10" + b"\x00" * 27 + b"\x03",  # focus era 3
+    b"\x10" + b"\x00" * 27 + b"\x20",  # unused flag bit
+    b"\x00" * PACKED_SIZE,  # empty board
+])
+def test_invalid_packed_positions(data):
+    with pytest.raises(ValueError):
+        bytes_to_state(data)
+
+
+@pytest.mark.parametrize("fen", [
+    START[:-2],
+    "..../..../..../.... ..../..../..../.... ..../..../..../.... - - - 0 2 w",  # no pieces
+    "1.../..../..../...A 2.../..../..../...B 3.../..../..../...C DEFG 4567 A 0 2 w",  # A twice
+    "1.../..../..../...A 2.../..../..../...D 3.../..../..../...C DEFG 4567 - 0 2 w",  # D twice
+    "1.../..../..../...A 2.../..../..../...B 3.../..../..../...C DFG 4567 - 0 2 w",  # E used first
+    "1.../..../..../...A 2.../..../..../...B 3.../..../..../...C ABCDEFG 4567 - 0 2 w",
+    "1.../..../..../...A 2.../..../..../...B 3.../..../..../...C 4567 DEFG - 0 2 w",
+    "1.../..../..../...X 2.../..../..../...B 3.../..../..../...C DEFG 4567 - 0 2 w",
+    "1.../..../..../...A 2.../..../..../...B 3.../..../... DEFG 4567 - 0 2 w",
+    "1.../..../..../...A 2.../..../..../...B 3.../..../..../...C DEFG 4567 - 3 2 w",
+    "1.../..../..../...A 2.../..../..../...B 3.../..../..../...C DEFG 4567 - 0 2 x",
+])
+def test_invalid_text_positions(fen):
+    with pytest.raises(ValueError):
+        fen_to_state(fen)
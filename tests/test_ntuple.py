@@ -0,0 +1,28 @@
+import random
+
+from ntuple import NTupleNetwork
+from simulate import play_game
+
+
+def test_incremental_features_match_full_features():
+    pairs = []
+
+    def collect(game, *_):
+        root = game.board.to_state()
+        pairs.extend((root, state) for _, state in game.board.successors())
+
+    for seed in range(3):
+        play_game("random", "random", seed, 60, observer=collect)
+    assert pairs
+    for root, state in pairs:
+        assert NTupleNetwork.features_after(NTupleNetwork.features(root), root, state) == NTupleNetwork.features(state)
+
+
+def test_save_and_load_round_trip(tmp_path):
+    rng = random.Random(0)
+    network = NTupleNetwork()
+    for index in range(0, len(network.weights), 97):
+        network.weights[index] = rng.uniform(-1, 1)
+    path = str(tmp_path / "tables.bin")
+    network.save(path)
+    assert NTupleNetwork.load(path).weights == network.weights
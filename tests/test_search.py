@@ -0,0 +1,54 @@
+import time
+
+from board import Board
+from gameio import NullIO
+from main import Game
+from player import EvaluationWeights
+from timecontrol import Deadline
+
+
+def _search_game(**options):
+    return Game("search", "search", io=NullIO(), display="off", seed=1, white_options=options)
+
+
+def test_ponder_hit_is_adopted():
+    game = _search_game(depth=1, ponder=True)
+    player = game.w_player
+    player.getMove(game.board)
+    task = player._ponder_task
+    task.thread.join()
+
+    move = player.getMove(Board.from_state(task.key))
+    assert move is not None
+    assert player.ponder_hits == 1
+    player.close()
+
+
+def test_ponder_hit_stops_at_deadline():
+    game = _search_game(depth=6, ponder=True)
+    player = game.w_player
+    player.deadline = Deadline.after(0.1)
+    player.getMove(game.board)
+    task = player._ponder_task
+    assert task.thread.is_alive()
+
+    player.deadline = Deadline.after(0.2)
+    started = time.monotonic()
+    move = player.getMove(Board.from_state(task.key))
+    assert time.monotonic() - started < 1.0
+    assert move is not None
+    assert task.stop.is_set() and not task.thread.is_alive()
+    assert player.ponder_hits == 0
+    player.close()
+
+
+def test_search_evaluates_with_its_weights():
+    game = _search_game()
+    # A position after a move where the two sides' features differ
+    board = next(board for board in (Board.from_state(state) for _, state in game.board.successors())
+                 if game.w_player._evaluate(board) != 0)
+    default = game.w_player._evaluate(board)
+
+    doubled = _search_game(weights=EvaluationWeights(*(2 * weight for weight in EvaluationWeights())))
+    assert doubled.w_player._evaluate(board) == 2 * default
+    assert _search_game(weights=(0, 0, 0, 0, 0)).w_player._evaluate(board) == 0
@@ -0,0 +1,102 @@
+import asyncio
+import os
+import pickle
+import threading
+import time
+
+from gameio import NullIO
+from main import Game, GameState
+import server as server_module
+from server import AI_TYPES, GameServer, Session, _compute_ai_move
+from simulate import play_game
+
+
+def test_worker_does_not_leave_ponder_threads():
+    game = Game("search", "random", io=NullIO(), display="off", seed=3,
+                white_options={"depth": 6, "ponder": True})
+    threads = threading.active_count()
+    spec = _compute_ai_move(pickle.dumps(game.board), "w_player", time.monotonic() + 0.1)
+    assert spec is not None
+    assert threading.active_count() == threads
+
+
+def test_session_search_player_remembers_positions():
+    async def play(turns):
+        server = GameServer(workers=1)
+        session = Session(1)
+        session.start("search", "random", seed=2)
+        played = []
+        try:
+            for _ in range(turns):
+                if session.game.current_player is session.game.w_player:
+                    played.append(session.game.board.to_state())
+                assert await server._play_ai_turn(session) is not None
+        finally:
+            await server.close()
+        return session, played
+
+    session, played = asyncio.run(play(6))
+    assert session.game.w_player._history == set(played)
+
+
+def _move_key(move):
+    return move.piece.id if move.piece else None, "".join(move.directions), move.next_era.name
+
+
+def test_session_replays_the_local_game_for_every_ai_type():
+    async def serve(player_type, turns):
+        server = GameServer(workers=1)
+        session = Session(1)
+        session.start(player_type, player_type, seed=11)
+        moves = []
+        try:
+            while session.game.state == GameState.PLAYING and len(moves) < turns:
+                moves.append(_move_key(await server._play_ai_turn(session)))
+        finally:
+            await server.close()
+        return moves
+
+    for player_type in sorted(AI_TYPES):
+        local = []
+        play_game(player_type, player_type, 11, 30, observer=lambda game, player, move, *_: local.append(_move_key(move)))
+        assert asyncio.run(serve(player_type, len(local))) == local, player_type
+
+
+def _dying_worker(*args):
+    os._exit(1)
+
+
+def test_failed_commands_keep_the_session_open(monkeypatch):
+    async def talk():
+        server = GameServer(workers=1)
+        await server.start()
+        reader, writer = await asyncio.open_connection(*server.address()[:2])
+
+        async def send(command):
+            writer.write(command.encode() + b"\n")
+            lines = []
+            while not lines or not lines[-1].startswith(("ok", "error")):
+                line = await reader.readline()
+                if not line:
+                    raise ConnectionError(f"connection closed after '{command}'")
+                lines.append(line.decode().strip())
+            return lines
+
+        try:
+            assert (await reader.readline()).startswith(b"ok session")
+            assert await send("new random random 1") == ["ok new random random seed=1"]
+            monkeypatch.setattr(Session, "board_lines", lambda self: 1 / 0)
+            assert (await send("board"))[-1].startswith("error ZeroDivisionError")
+
+            # The pool's workers fork on first use, so they run the patched entry point and die
+            monkeypatch.setattr(server_module, "_compute_ai_move", _dying_worker)
+            assert (await send("ai"))[-1].startswith("error BrokenProcessPool")
+            monkeypatch.setattr(server_module, "_compute_ai_move", _compute_ai_move)
+            # The next move runs on a new pool
+            assert (await send("ai"))[-1].startswith("ok")
+            assert await send("quit") == ["ok bye"]
+        finally:
+            writer.close()
+            await server.close()
+
+    asyncio.run(talk())
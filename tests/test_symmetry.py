@@ -0,0 +1,45 @@
+from board import Board
+from simulate import play_game
+from symmetry import IDENTITY, TRANSFORMS, canonicalize, inverse, transform_move, transform_state
+
+
+def _positions():
+    positions = []
+    for seed in range(2):
+        play_game("random", "random", seed, 60,
+                  observer=lambda game, *_: positions.append(game.board.to_state()))
+    return positions[::3]
+
+
+def _successors(state):
+    """(piece id, directions, next era) -> resulting to_state() for every legal move"""
+    return {(move.piece.id if move.piece else None, tuple(move.directions), move.next_era.name): after
+            for move, after in Board.from_state(state).successors()}
+
+
+def test_transforms_round_trip():
+    for state in _positions():
+        for transform in TRANSFORMS:
+            image = transform_state(state, transform)
+            assert Board.from_state(image).to_state() == image
+            assert transform_state(image, inverse(transform)) == state
+    assert TRANSFORMS[0] == IDENTITY
+
+
+def test_transforms_keep_the_game_legal():
+    for state in _positions():
+        successors = _successors(state)
+        for transform in TRANSFORMS:
+            # The image of every legal move is legal in the image and leads to the image of its result
+            expected = {transform_move(move, transform): transform_state(after, transform)
+                        for move, after in successors.items()}
+            assert _successors(transform_state(state, transform)) == expected
+
+
+def test_canonical_forms_agree_across_symmetric_positions():
+    for state in _positions():
+        canonical, transform = canonicalize(state)
+        assert transform_state(state, transform) == canonical
+        assert canonicalize(Board.from_state(state)) == (canonical, transform)
+        for other in TRANSFORMS:
+            assert canonicalize(transform_state(state, other))[0] == canonical
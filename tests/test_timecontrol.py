@@ -0,0 +1,95 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+import player as player_module
+from gameio import NullIO
+from main import Game, GameState
+from player import _score_root_moves
+from timecontrol import SAFETY_MARGIN, Clock, Deadline, TimeControl
+
+
+def test_parse():
+    assert TimeControl.parse("60") == TimeControl(60.0, 0.0)
+    assert TimeControl.parse("60+0.5") == TimeControl(60.0, 0.5)
+    for text in ("", "abc", "60+x", "0", "-5", "10+-1"):
+        with pytest.raises(ValueError):
+            TimeControl.parse(text)
+    with pytest.raises(ValueError):
+        TimeControl(10, moves_to_go=0)
+
+
+def test_clock_budget_and_charge():
+    clock = Clock(TimeControl(30, 1, moves_to_go=10))
+    assert clock.budget() == pytest.approx((30 - SAFETY_MARGIN) / 10 + 0.8)
+    assert clock.charge(2.0)
+    assert clock.remaining == pytest.approx(29.0) and clock.moves == 1
+    # Never more than the clock holds, after the margin
+    clock.remaining = 0.5
+    assert clock.budget() == pytest.approx(0.45)
+    assert not clock.charge(0.6)
+    assert clock.remaining == 0.0 and clock.moves == 1
+
+
+def test_deadline():
+    deadline = Deadline.after(0.05)
+    assert not deadline.expired() and not deadline.is_set()
+    assert 0 < deadline.remaining() <= 0.05
+    time.sleep(0.06)
+    assert deadline.expired() and deadline.is_set()
+    assert deadline.remaining() < 0
+    assert Deadline(time.monotonic() - 1).expired()
+
+
+def test_game_budget_and_loss_on_time():
+    game = Game("random", "random", io=NullIO(), display="off", seed=1,
+                time_control=TimeControl(1), move_time=0.01)
+    assert game.move_budget("w_player") == 0.01
+    assert game.charge_clock("w_player", 0.5)
+    assert not game.charge_clock("w_player", 0.6)
+    assert game.state == GameState.BLACK_WON and game.adjudication == "time"
+    assert Game("random", "random", io=NullIO(), display="off").move_budget("w_player") is None
+
+
+class _Expired:
+    def expired(self):
+        return True
+
+
+def test_heuristic_stops_scoring_at_the_deadline():
+    game = Game("heuristic", "random", io=NullIO(), display="off", seed=1)
+    player = game.w_player
+    scored = []
+    score_move = player._score_move
+    player._score_move = lambda board, move: scored.append(move) or score_move(board, move)
+    player.deadline = _Expired()
+    assert player.getMove(game.board) is not None
+    # Only the first candidate is scored, as there is always a move to play
+    assert len(scored) == 1
+
+
+
+def _slow_score_root_moves(*args):
+    time.sleep(0.5)
+    return _score_root_moves(*args)
+
+
+def test_parallel_heuristic_keeps_to_the_deadline(monkeypatch):
+    # Workers fork after the patch, so they run the slow version too
+    monkeypatch.setattr(player_module, "_score_root_moves", _slow_score_root_moves)
+    game = Game("heuristic", "random", io=NullIO(), display="off", seed=1, workers=2)
+    player = game.w_player
+    player._executor = ProcessPoolExecutor(max_workers=2)
+    submitted = []
+    submit = player._executor.submit
+    player._executor.submit = lambda *args: submitted.append(args) or submit(*args)
+    try:
+        player.deadline = Deadline.after(0.1)
+        started = time.monotonic()
+        assert player.getMove(game.board) is not None
+        assert time.monotonic() - started < 0.3
+        # Nothing finished in time, so no more chunks were queued than there are workers
+        assert len(submitted) == 2
+    finally:
+        player.close()
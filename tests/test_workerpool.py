@@ -0,0 +1,60 @@
+import os
+import pickle
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from workerpool import SharedTable, WorkerPool, shared_table
+
+
+def _key(number: int) -> bytes:
+    return number.to_bytes(2, "big")
+
+
+def _lookup_or_die(number: int, marker: str) -> bytes:
+    """Look the number up in the shared table; the first task to run kills its worker instead"""
+    try:
+        os.close(os.open(marker, os.O_CREAT | os.O_EXCL))
+    except FileExistsError:
+        return shared_table("squares").get(_key(number))
+    os._exit(1)
+
+
+def _die(number: int):
+    os._exit(1)
+
+
+@pytest.fixture
+def squares():
+    table = SharedTable.create({_key(number): _key(number * number) for number in range(100)}, 2, 2)
+    yield table
+    table.close()
+
+
+def test_shared_table_lookups(squares):
+    assert len(squares) == 100
+    assert squares.get(_key(7)) == _key(49)
+    assert _key(99) in squares and _key(100) not in squares
+    assert squares.get(b"\x00", "short key") == "short key"
+    with pytest.raises(ValueError):
+        SharedTable.create({b"ab": b"abc"}, 2, 2)
+
+    # A pickled table attaches to the same block instead of copying it
+    attached = pickle.loads(pickle.dumps(squares))
+    assert attached.name == squares.name and attached.get(_key(7)) == _key(49)
+    attached.close()
+
+
+def test_pool_restarts_after_a_worker_dies(squares, tmp_path):
+    marker = str(tmp_path / "died")
+    with WorkerPool(workers=2, tables={"squares": squares}) as pool:
+        results = pool.map(_lookup_or_die, range(40), [marker] * 40)
+        assert pool.restarts == 1
+    assert results == [_key(number * number) for number in range(40)]
+
+
+def test_pool_gives_up_after_max_restarts():
+    with WorkerPool(workers=1, max_restarts=1) as pool:
+        with pytest.raises(BrokenProcessPool):
+            pool.map(_die, range(3))
+        assert pool.restarts == 1
@@ -0,0 +1,95 @@
+"""
+Time controls and per-move deadlines.
+
+A TimeControl gives each player a Clock starting at base seconds. After every
+move the time taken is deducted and the increment added (increment 0 is
+sudden death); a player whose clock runs out loses. Before each move the clock
+allots a budget, and AI players receive it as a Deadline: they check it
+cooperatively while choosing and, once it has passed, return the best move
+found so far. A fixed move time gives every move the same budget instead, or
+caps the clock's.
+
+Deadlines are points on time.monotonic(), which is shared by every process on
+the machine, so a deadline set by the game also holds in a worker process.
+"""
+import time
+from collections import namedtuple
+
+# Seconds kept back on the clock for the overhead around each move
+SAFETY_MARGIN = 0.05
+
+
+class Deadline:
+    """A point in time by which a move must be chosen"""
+    __slots__ = ("at",)
+
+    def __init__(self, at: float):
+        self.at = at
+
+    @classmethod
+    def after(cls, seconds: float) -> 'Deadline':
+        return cls(time.monotonic() + seconds)
+
+    def remaining(self) -> float:
+        return self.at - time.monotonic()
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self.at
+
+    # Lets a deadline stand in for the stop event of a search
+    is_set = expired
+
+
+class TimeControl(namedtuple("TimeControl", "base increment moves_to_go", defaults=(0.0, 30))):
+    """
+    base: seconds on each clock at the start
+    increment: seconds added after each move
+    moves_to_go: number of moves the remaining time is shared out over
+    """
+    __slots__ = ()
+
+    def __new__(cls, base: float, increment: float = 0.0, moves_to_go: int = 30):
+        if base <= 0:
+            raise ValueError(f"Invalid base time {base}. Must be positive.")
+        if increment < 0:
+            raise ValueError(f"Invalid increment {increment}. Must not be negative.")
+        if moves_to_go < 1:
+            raise ValueError(f"Invalid moves to go {moves_to_go}. Must be at least 1.")
+        return super().__new__(cls, float(base), float(increment), moves_to_go)
+
+    @classmethod
+    def parse(cls, text: str) -> 'TimeControl':
+        """Read 'base' or 'base+increment' in seconds, e.g. '60+0.5'"""
+        base, _, increment = text.partition("+")
+        try:
+            return cls(float(base), float(increment or 0))
+        except ValueError:
+            raise ValueError(f"Invalid time control '{text}'. Must be seconds or seconds+increment.") from None
+
+
+class Clock:
+    """One player's remaining time under a TimeControl"""
+    def __init__(self, control: TimeControl):
+        self.control = control
+        self.remaining = control.base
+        self.moves = 0
+
+    def budget(self) -> float:
+        """
+        Seconds to spend on the next move: an even share of the remaining time
+        over the moves to go plus most of the increment, never more than the
+        clock holds after the safety margin.
+        """
+        usable = max(0.0, self.remaining - min(SAFETY_MARGIN, self.remaining / 10))
+        share = usable / self.control.moves_to_go + 0.8 * self.control.increment
+        return min(share, usable)
+
+    def charge(self, seconds: float) -> bool:
+        """Deduct the time a move took and add the increment; False if the time ran out"""
+        self.remaining -= seconds
+        if self.remaining < 0:
+            self.remaining = 0.0
+            return False
+        self.remaining += self.control.increment
+        self.moves += 1
+        return True
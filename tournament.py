@@ -0,0 +1,232 @@
+"""
+Round-robin and gauntlet tournaments between player configurations.
+
+Entrants are written as type[:option=value,...], for example
+
+    python tournament.py random heuristic search:depth=1 search:depth=2 --pairs 20
+    python tournament.py --gauntlet search:depth=3 search:depth=2 heuristic --checkpoint run.json
+    python tournament.py search:depth=4 heuristic ntuple --time 10+0.1 --workers 4
+
+In a round robin every entrant meets every other; in a gauntlet the first
+entrant meets each of the others. Each meeting is a number of colour-swapped
+game pairs, scheduled across a process pool. Finished pairs are written to the
+checkpoint file, so an interrupted run started again with the same arguments
+resumes where it stopped; raising --pairs extends a finished run. Ratings are Bradley-Terry maximum likelihood Elo,
+anchored so the entrants average 0.
+
+With --time every game is played under that clock (see timecontrol) and a
+player whose time runs out loses; --move-time caps each move instead or as
+well. Timed games compete for the CPU, so run them with no more workers than
+there are cores to keep the clocks fair.
+"""
+import argparse
+import ast
+import json
+import math
+import os
+
+from rating import MatchResult
+from simulate import play_pair, DEFAULT_MAX_TURNS
+from timecontrol import TimeControl
+from workerpool import WorkerPool
+
+PLAYER_TYPES = ("random", "heuristic", "search", "ntuple")
+
+
+def parse_entrant(spec: str) -> tuple:
+    """Turn 'type:key=value,...' into (player type, options)"""
+    player_type, _, settings = spec.partition(":")
+    if player_type not in PLAYER_TYPES:
+        raise ValueError(f"Invalid player type '{player_type}'. Must be 'random', 'heuristic', 'search' or 'ntuple'.")
+    options = {}
+    for setting in filter(None, settings.split(",")):
+        key, separator, value = setting.partition("=")
+        if not separator:
+            raise ValueError(f"Invalid option '{setting}'. Must be key=value.")
+        try:
+            options[key] = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            options[key] = value
+    return player_type, options
+
+
+def schedule(count: int, gauntlet: bool) -> list:
+    """Index pairs (i, j) of the meetings"""
+    if gauntlet:
+        return [(0, j) for j in range(1, count)]
+    return [(i, j) for i in range(count) for j in range(i + 1, count)]
+
+
+class Tournament:
+    """Runs the meetings and keeps every finished game pair, optionally checkpointed to disk"""
+    def __init__(self, specs: list, pairs: int, gauntlet: bool = False, seed: int = 0,
+                 max_turns: int = DEFAULT_MAX_TURNS, checkpoint: str = None,
+                 time_control: TimeControl = None, move_time: float = None):
+        if len(specs) < 2:
+            raise ValueError("A tournament needs at least two entrants.")
+        self.specs = list(specs)
+        self.entrants = [parse_entrant(spec) for spec in specs]
+        self.pairs = pairs
+        self.gauntlet = gauntlet
+        self.seed = seed
+        self.max_turns = max_turns
+        self.time_control = time_control
+        self.move_time = move_time
+        self.checkpoint = checkpoint
+        self.done = {}  # "i-j-pair" -> (score of i as white, score of i as black)
+        if checkpoint and os.path.exists(checkpoint):
+            self._load()
+
+    def _settings(self) -> dict:
+        # The pair count is left out so a finished run can be extended with more pairs
+        settings = {"entrants": self.specs, "gauntlet": self.gauntlet,
+                    "seed": self.seed, "max_turns": self.max_turns}
+        # Untimed runs keep the settings of checkpoints written before time controls
+        if self.time_control is not None:
+            settings["time_control"] = list(self.time_control)
+        if self.move_time is not None:
+            settings["move_time"] = self.move_time
+        return settings
+
+    def _load(self):
+        with open(self.checkpoint) as checkpoint:
+            data = json.load(checkpoint)
+        if data["settings"] != self._settings():
+            raise ValueError(f"Checkpoint '{self.checkpoint}' was made with different settings.")
+        self.done = {key: tuple(scores) for key, scores in data["done"].items()}
+
+    def _save(self):
+        # Write a new file and swap it in, so an interruption never leaves a broken checkpoint
+        temporary = self.checkpoint + ".tmp"
+        with open(temporary, "w") as checkpoint:
+            json.dump({"settings": self._settings(), "done": self.done}, checkpoint)
+        os.replace(temporary, self.checkpoint)
+
+    def pending(self) -> list:
+        """(key, i, j, seed) of every game pair not played yet"""
+        return [(f"{i}-{j}-{pair}", i, j, self.seed + pair)
+                for i, j in schedule(len(self.entrants), self.gauntlet)
+                for pair in range(self.pairs)
+                if f"{i}-{j}-{pair}" not in self.done]
+
+    def run(self, workers: int = 1, save_every: int = 1, log=None):
+        """Play all pending pairs, checkpointing after every save_every finished pairs"""
+        pending = self.pending()
+        if workers > 1:
+            with WorkerPool(workers) as pool:
+                finished = pool.imap_unordered(play_pair, [self.entrants[i] for _, i, _, _ in pending],
+                                               [self.entrants[j] for _, _, j, _ in pending],
+                                               [seed for _, _, _, seed in pending],
+                                               [self.max_turns] * len(pending),
+                                               [self.time_control] * len(pending),
+                                               [self.move_time] * len(pending))
+                for count, (index, scores) in enumerate(finished, 1):
+                    self._finish(pending[index][0], scores, count, len(pending), save_every, log)
+        else:
+            for count, (key, i, j, seed) in enumerate(pending, 1):
+                scores = play_pair(self.entrants[i], self.entrants[j], seed, self.max_turns,
+                                   self.time_control, self.move_time)
+                self._finish(key, scores, count, len(pending), save_every, log)
+        if self.checkpoint:
+            self._save()
+
+    def _finish(self, key: str, scores: tuple, count: int, total: int, save_every: int, log):
+        self.done[key] = scores
+        if self.checkpoint and count % save_every == 0:
+            self._save()
+        if log:
+            log(f"{count}/{total} pairs played")
+
+    def results(self) -> dict:
+        """(i, j) -> MatchResult of entrant i against entrant j, for both orders"""
+        results = {}
+        for key, scores in self.done.items():
+            i, j, _ = (int(part) for part in key.split("-"))
+            for score in scores:
+                results.setdefault((i, j), MatchResult()).add(score)
+                results.setdefault((j, i), MatchResult()).add(1 - score)
+        return results
+
+    def ratings(self, iterations: int = 200) -> list:
+        """
+        Elo per entrant from the Bradley-Terry model, fitted with the
+        minorisation-maximisation updates and centred on 0. Draws count as
+        half a win for each side.
+        """
+        results = self.results()
+        count = len(self.entrants)
+        strength = [1.0] * count
+        for _ in range(iterations):
+            for i in range(count):
+                points = sum(result.wins + 0.5 * result.draws
+                             for (a, _), result in results.items() if a == i)
+                weight = sum(result.games / (strength[i] + strength[b])
+                             for (a, b), result in results.items() if a == i)
+                if weight:
+                    # Keep entrants that never scored (or never lost) at a finite rating
+                    strength[i] = min(max(points, 0.5) / weight, 1e6)
+        elos = [400 * math.log10(value) for value in strength]
+        mean = sum(elos) / count
+        return [elo - mean for elo in elos]
+
+    def standings(self) -> list:
+        """Rows of (spec, Elo, CI low, CI high, overall MatchResult), strongest first"""
+        results = self.results()
+        rows = []
+        for index, elo in enumerate(self.ratings()):
+            overall = MatchResult()
+            for (a, _), result in results.items():
+                if a == index:
+                    overall.merge(result)
+            # The interval is the uncertainty of the entrant's overall score, shifted onto its rating
+            centre, low, high = overall.elo()
+            rows.append((self.specs[index], elo, elo + low - centre, elo + high - centre, overall))
+        return sorted(rows, key=lambda row: row[1], reverse=True)
+
+    def report(self) -> list:
+        """Standings and cross table as text lines"""
+        lines = [f"{'entrant':<24} {'elo':>7} {'95% CI':>17} {'games':>6} {'score':>6}"]
+        for spec, elo, low, high, overall in self.standings():
+            lines.append(f"{spec:<24} {elo:>+7.1f} {low:>+8.1f} {high:>+8.1f} {overall.games:>6} "
+                         f"{overall.score:>6.3f}")
+
+        results = self.results()
+        lines.append("")
+        lines.append(" " * 24 + "".join(f"{index:>12}" for index in range(len(self.specs))))
+        for i, spec in enumerate(self.specs):
+            cells = []
+            for j in range(len(self.specs)):
+                result = results.get((i, j))
+                cells.append(f"{'-' if result is None else f'{result.wins}-{result.draws}-{result.losses}':>12}")
+            lines.append(f"{i} {spec:<22}" + "".join(cells))
+        return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play a rating tournament between player configurations")
+    parser.add_argument("entrants", nargs="+", help="type[:option=value,...], e.g. search:depth=2")
+    parser.add_argument("--gauntlet", action="store_true", help="only the first entrant meets the others")
+    parser.add_argument("--pairs", type=int, default=10, help="colour-swapped game pairs per meeting")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-turns", type=int, default=DEFAULT_MAX_TURNS)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--checkpoint", help="JSON file recording progress, resumed when it exists")
+    parser.add_argument("--time", help="clock per player in seconds, with an optional +increment, e.g. 60+0.5")
+    parser.add_argument("--move-time", type=float, help="seconds allowed per move")
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        raise ValueError(f"Invalid worker count {args.workers}. Must be a positive integer.")
+    time_control = TimeControl.parse(args.time) if args.time else None
+
+    tournament = Tournament(args.entrants, args.pairs, args.gauntlet, args.seed, args.max_turns,
+                            args.checkpoint, time_control, args.move_time)
+    try:
+        tournament.run(args.workers, log=lambda text: print(text, end="\r"))
+    finally:
+        print()
+        for line in tournament.report():
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
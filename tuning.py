@@ -0,0 +1,123 @@
+"""
+Self-play tuning of the HeuristicAIPlayer evaluation weights.
+
+Two methods are available:
+
+    spsa  Simultaneous perturbation: each iteration plays weights + c*delta
+          against weights - c*delta for a random sign vector delta and steps
+          towards the side that scored better.
+    grid  Local search: tries raising and lowering each weight by a step and
+          keeps a change once an SPRT accepts that it gains Elo.
+
+Either way the final weights are verified against the defaults with an SPRT
+and the Elo difference is reported. Games run headless across a process pool.
+
+    python tuning.py --method spsa --iterations 50 --pairs 64 --workers 8
+"""
+import argparse
+import os
+import random
+
+from player import EvaluationWeights
+from rating import SPRT
+from simulate import play_match, DEFAULT_MAX_TURNS
+from workerpool import WorkerPool
+
+
+def _entrant(weights) -> tuple:
+    return "heuristic", {"weights": tuple(weights)}
+
+
+def _format(weights) -> str:
+    return "(" + ", ".join(f"{weight:.2f}" for weight in weights) + ")"
+
+
+def spsa(start, iterations: int, pairs: int, executor=None, seed: int = 0, a: float = 1.0,
+         c: float = 0.5, max_turns: int = DEFAULT_MAX_TURNS, log=print) -> EvaluationWeights:
+    """Tune weights with SPSA, maximising the match score"""
+    rng = random.Random(seed)
+    theta = [float(weight) for weight in start]
+    # Standard SPSA gain sequences, with the stability constant at 10% of the iterations
+    stability = iterations / 10
+    for k in range(iterations):
+        a_k = a / (k + 1 + stability) ** 0.602
+        c_k = c / (k + 1) ** 0.101
+        delta = [rng.choice((-1, 1)) for _ in theta]
+        plus = [weight + c_k * sign for weight, sign in zip(theta, delta)]
+        minus = [weight - c_k * sign for weight, sign in zip(theta, delta)]
+        result = play_match(_entrant(plus), _entrant(minus), pairs, seed + k * pairs, executor,
+                            max_turns=max_turns)
+        # Score difference of the two sides, 2 * score - 1, over the perturbation width
+        gradient = (2 * result.score - 1) / (2 * c_k)
+        theta = [weight + a_k * gradient * sign for weight, sign in zip(theta, delta)]
+        log(f"iteration {k + 1}: {_format(theta)}, plus vs minus {result}")
+    return EvaluationWeights(*theta)
+
+
+def grid(start, step: float, pairs: int, sprt: SPRT, executor=None, seed: int = 0,
+         max_rounds: int = 10, max_turns: int = DEFAULT_MAX_TURNS, log=print) -> EvaluationWeights:
+    """Hill-climb one weight at a time until no single step is accepted"""
+    current = [float(weight) for weight in start]
+    for round_number in range(max_rounds):
+        improved = False
+        for index, name in enumerate(EvaluationWeights._fields):
+            for change in (step, -step):
+                candidate = list(current)
+                candidate[index] += change
+                result = play_match(_entrant(candidate), _entrant(current), pairs, seed, executor,
+                                    sprt=sprt, max_turns=max_turns)
+                seed += pairs
+                verdict = sprt.status(result)
+                log(f"round {round_number + 1}: {name} {change:+.2f} -> {_format(candidate)}, "
+                    f"{result}, {verdict or 'inconclusive'}")
+                if verdict == "H1":
+                    current = candidate
+                    improved = True
+                    break
+        if not improved:
+            break
+    return EvaluationWeights(*current)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tune the heuristic evaluation weights by self-play")
+    parser.add_argument("--method", choices=("spsa", "grid"), default="spsa")
+    parser.add_argument("--start", type=float, nargs=5, default=list(EvaluationWeights()),
+                        metavar=("ERAS", "ADVANTAGE", "SUPPLY", "CENTRALITY", "FOCUS"))
+    parser.add_argument("--iterations", type=int, default=20, help="SPSA iterations")
+    parser.add_argument("--pairs", type=int, default=32, help="game pairs per match")
+    parser.add_argument("--step", type=float, default=0.5, help="grid step size")
+    parser.add_argument("--elo0", type=float, default=0, help="SPRT null hypothesis")
+    parser.add_argument("--elo1", type=float, default=20, help="SPRT alternative hypothesis")
+    parser.add_argument("--verify-pairs", type=int, default=500, help="game pair limit of the final SPRT")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-turns", type=int, default=DEFAULT_MAX_TURNS)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        raise ValueError(f"Invalid worker count {args.workers}. Must be a positive integer.")
+
+    sprt = SPRT(args.elo0, args.elo1)
+    executor = WorkerPool(args.workers) if args.workers > 1 else None
+    try:
+        if args.method == "spsa":
+            tuned = spsa(args.start, args.iterations, args.pairs, executor, args.seed,
+                         max_turns=args.max_turns)
+        else:
+            tuned = grid(args.start, args.step, args.pairs, sprt, executor, args.seed,
+                         max_turns=args.max_turns)
+
+        # Fresh seeds for the verification match
+        result = play_match(_entrant(tuned), _entrant(EvaluationWeights()), args.verify_pairs,
+                            args.seed + 1_000_000, executor, sprt=sprt, max_turns=args.max_turns)
+    finally:
+        if executor is not None:
+            executor.close()
+
+    print(f"tuned weights: {_format(tuned)}")
+    print(f"vs defaults {_format(EvaluationWeights())}: {result}, "
+          f"SPRT [{args.elo0}, {args.elo1}] {sprt.status(result) or 'inconclusive'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Warm process pools for parallel simulation and search.
+
+Each worker is initialized once: the engine modules and their lookup tables
+are loaded and a board is built, so tasks start with nothing left to set up.
+Large read-only data such as an opening book or tablebase is passed as a
+SharedTable, which lives in multiprocessing.shared_memory; workers attach to
+it by name instead of receiving a copy.
+
+If a worker dies, the pool is restarted and the unfinished tasks are
+submitted again, up to max_restarts times.
+
+    with WorkerPool(workers=8, tables={"book": SharedTable.create(book, 29, 4)}) as pool:
+        results = pool.map(play_pair, firsts, seconds, seeds)
+
+Inside a task, shared_table("book") returns the worker's view of the table.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+
+_HEADER = 12  # record count, key size and value size, 4 bytes each
+
+# Tables attached in this worker process, by name
+_tables = {}
+
+
+class SharedTable:
+    """
+    Read-only mapping of fixed-size byte keys to fixed-size byte values, stored
+    as sorted records in a shared memory block and searched with bisection.
+    """
+    def __init__(self, memory: 'shared_memory.SharedMemory', owner: bool):
+        self._memory = memory
+        self._owner = owner
+        header = bytes(memory.buf[:_HEADER])
+        self._count = int.from_bytes(header[0:4], "little")
+        self._key_size = int.from_bytes(header[4:8], "little")
+        self._value_size = int.from_bytes(header[8:12], "little")
+
+    @classmethod
+    def create(cls, entries: dict, key_size: int, value_size: int) -> 'SharedTable':
+        """Copy entries (bytes -> bytes) into a new shared block owned by this process"""
+        for key, value in entries.items():
+            if len(key) != key_size or len(value) != value_size:
+                raise ValueError(f"Invalid entry. Keys must be {key_size} bytes and values {value_size} bytes.")
+        record = key_size + value_size
+        memory = shared_memory.SharedMemory(create=True, size=_HEADER + max(1, len(entries) * record))
+        memory.buf[:_HEADER] = (len(entries).to_bytes(4, "little") + key_size.to_bytes(4, "little")
+                                + value_size.to_bytes(4, "little"))
+        offset = _HEADER
+        for key in sorted(entries):
+            memory.buf[offset:offset + record] = key + entries[key]
+            offset += record
+        return cls(memory, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> 'SharedTable':
+        """Open a table created by another process"""
+        # Pool workers share the creator's resource tracker, so the block is
+        # still freed exactly once, by the creator's close()
+        return cls(shared_memory.SharedMemory(name=name), owner=False)
+
+    @property
+    def name(self) -> str:
+        return self._memory.name
+
+    def __len__(self):
+        return self._count
+
+    def get(self, key: bytes, default=None):
+        """Binary search for key, returning its value or default"""
+        if len(key) != self._key_size:
+            return default
+        buf = self._memory.buf
+        record = self._key_size + self._value_size
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            start = _HEADER + middle * record
+            probe = bytes(buf[start:start + self._key_size])
+            if probe < key:
+                low = middle + 1
+            elif probe > key:
+                high = middle
+            else:
+                return bytes(buf[start + self._key_size:start + record])
+        return default
+
+    def __contains__(self, key: bytes) -> bool:
+        return self.get(key) is not None
+
+    def close(self):
+        """Detach; the creating process also frees the block"""
+        memory, self._memory = self._memory, None
+        if memory is None:
+            return
+        memory.close()
+        if self._owner:
+            memory.unlink()
+
+    def __reduce__(self):
+        # Other processes attach to the same block instead of receiving a copy
+        return SharedTable.attach, (self.name,)
+
+
+def shared_table(name: str) -> SharedTable:
+    """A table passed to the WorkerPool, from inside a task"""
+    return _tables[name]
+
+
+def _initialize_worker(table_names: dict):
+    """Load the engine and attach the shared tables once per worker process"""
+    import board
+    import player  # noqa: F401  Loads the player types and their tables
+    import symmetry  # noqa: F401
+
+    for name, block_name in table_names.items():
+        _tables[name] = SharedTable.attach(block_name)
+    # Building a board touches every engine table once
+    board.Board()
+
+
+class WorkerPool:
+    """A process pool with warm workers, shared tables and crash recovery"""
+    def __init__(self, workers: int = None, tables: dict = None, max_restarts: int = 3):
+        self.workers = workers or os.cpu_count() or 1
+        if self.workers < 1:
+            raise ValueError(f"Invalid worker count {self.workers}. Must be a positive integer.")
+        self.tables = dict(tables or {})
+        self.max_restarts = max_restarts
+        self.restarts = 0
+        self._executor = None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_initialize_worker,
+                initargs=({name: table.name for name, table in self.tables.items()},))
+        return self._executor
+
+    def _restart(self, error: Exception):
+        if self.restarts >= self.max_restarts:
+            raise error
+        self.restarts += 1
+        executor, self._executor = self._executor, None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def imap_unordered(self, fn, *iterables):
+        """Yield (index, result) for fn over the zipped arguments, as tasks finish"""
+        pending = dict(enumerate(zip(*iterables)))
+        while pending:
+            futures = {self._pool().submit(fn, *arguments): index for index, arguments in pending.items()}
+            try:
+                for future in as_completed(futures):
+                    index = futures[future]
+                    result = future.result()
+                    del pending[index]
+                    yield index, result
+            except BrokenProcessPool as error:
+                self._restart(error)
+
+    def map(self, fn, *iterables) -> list:
+        """Results of fn over the zipped arguments, in order"""
+        results = {}
+        for index, result in self.imap_unordered(fn, *iterables):
+            results[index] = result
+        return [results[index] for index in range(len(results))]
+
+    def close(self):
+        """Stop the workers and free the shared tables"""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        for table in self.tables.values():
+            table.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()